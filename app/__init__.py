@@ -1 +1,4 @@
+import time
 
+# Taken before any app module loads so the startup report can include import time.
+IMPORT_STARTED_AT = time.perf_counter()
@@ -1,7 +1,9 @@
 import os
+import sqlite3
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 
 def _default_database_url() -> str:
@@ -27,9 +29,18 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expi
 Base = declarative_base()
 
 
+def ensure_indexes():
+    """Create declared indexes missing from tables that predate them."""
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
 def ensure_schema_compat():
     """Best-effort SQLite schema compatibility for additive columns."""
     if not DATABASE_URL.startswith("sqlite"):
+        ensure_indexes()
         return
     with engine.begin() as conn:
         cols = {
@@ -44,6 +55,64 @@ def ensure_schema_compat():
             conn.exec_driver_sql(
                 "ALTER TABLE attendees ADD COLUMN linkedin_url VARCHAR(280) NOT NULL DEFAULT ''"
             )
+        if "signal_tags" not in cols:
+            conn.exec_driver_sql("ALTER TABLE attendees ADD COLUMN signal_tags TEXT NOT NULL DEFAULT ''")
+        signal_cols = {
+            row[1]
+            for row in conn.exec_driver_sql("PRAGMA table_info(external_signals)").fetchall()
+        }
+        if signal_cols and "tags" not in signal_cols:
+            conn.exec_driver_sql("ALTER TABLE external_signals ADD COLUMN tags TEXT NOT NULL DEFAULT ''")
+        job_cols = {
+            row[1]
+            for row in conn.exec_driver_sql("PRAGMA table_info(import_jobs)").fetchall()
+        }
+        if job_cols and "worker_pid" not in job_cols:
+            conn.exec_driver_sql("ALTER TABLE import_jobs ADD COLUMN worker_pid INTEGER NOT NULL DEFAULT 0")
+        if job_cols and "spool_path" not in job_cols:
+            conn.exec_driver_sql("ALTER TABLE import_jobs ADD COLUMN spool_path VARCHAR(400) NOT NULL DEFAULT ''")
+        feedback_cols = {
+            row[1]: row[3]
+            for row in conn.exec_driver_sql("PRAGMA table_info(feedback)").fetchall()
+        }
+        enrichment_cols = {
+            row[1]
+            for row in conn.exec_driver_sql("PRAGMA table_info(enrichment_jobs)").fetchall()
+        }
+        if enrichment_cols and "worker_pid" not in enrichment_cols:
+            conn.exec_driver_sql("ALTER TABLE enrichment_jobs ADD COLUMN worker_pid INTEGER NOT NULL DEFAULT 0")
+    if feedback_cols.get("match_id"):
+        _rebuild_feedback_table(list(feedback_cols))
+    ensure_indexes()
+
+
+def _rebuild_feedback_table(columns: list[str]):
+    # SQLite cannot drop NOT NULL in place, so copy the rows into a table built from the model.
+    feedback = Base.metadata.tables["feedback"]
+    names = [column for column in columns if column in feedback.columns]
+    # Links to matches that no longer exist are cleared rather than failing the copy.
+    values = [
+        "(SELECT id FROM matches WHERE id = feedback_old.match_id)" if column == "match_id" else column
+        for column in names
+    ]
+    statements = [
+        "ALTER TABLE feedback RENAME TO feedback_old",
+        *(f"DROP INDEX IF EXISTS {index.name}" for index in feedback.indexes),
+        str(CreateTable(feedback).compile(dialect=engine.dialect)),
+        *(str(CreateIndex(index).compile(dialect=engine.dialect)) for index in feedback.indexes),
+        f"INSERT INTO feedback ({', '.join(names)}) SELECT {', '.join(values)} FROM feedback_old",
+        "DROP TABLE feedback_old",
+    ]
+    raw = engine.raw_connection()
+    try:
+        # pysqlite commits DDL as it goes; one explicit transaction keeps a failed copy from half-applying.
+        raw.driver_connection.executescript("BEGIN;\n" + ";\n".join(statements) + ";\nCOMMIT;")
+    except sqlite3.Error:
+        if raw.driver_connection.in_transaction:
+            raw.driver_connection.execute("ROLLBACK")
+        raise
+    finally:
+        raw.close()
 
 
 def get_db():
@@ -1,35 +1,80 @@
+import asyncio
 import csv
+import functools
+import hashlib
+import hmac
 import io
 import json
+import logging
 import os
 import re
+import threading
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlencode
 
-from fastapi import Depends, FastAPI, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import RedirectResponse, StreamingResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from fastapi import Depends, FastAPI, File, Form, HTTPException, Request, Response, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
 from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
-from app.database import Base, SessionLocal, engine, ensure_schema_compat, get_db
-from app.models import AppUser, Attendee, AuditLog, ExternalSignal, Feedback, IntroRequest, MatchResult
+from app import IMPORT_STARTED_AT
+from app.database import DATABASE_URL, Base, SessionLocal, engine, ensure_schema_compat, get_db
+from app.models import (
+    AppUser,
+    Attendee,
+    EnrichmentJob,
+    ExternalSignal,
+    Feedback,
+    ImportJob,
+    IntroRequest,
+    MatchResult,
+)
 from app.schemas import (
     AttendeeCreate,
+    EnrichmentBatchRequest,
     FeedbackCreate,
     IntroRequestCreate,
     IntroRequestUpdate,
+    MatchesView,
     MatchView,
+    MetricsView,
+    ScenariosView,
+    ScenarioView,
+)
+from app.services.assets import STATIC_DIR, AssetStaticFiles, asset_url
+from app.services.audit import (
+    AUDIT_PAGE_SIZE,
+    AuditFilters,
+    audit_log_ndjson_line,
+    audit_log_page,
+    iter_audit_logs,
+    parse_audit_timestamp,
+    write_audit_log,
 )
-from app.services.audit import write_audit_log
 from app.services.bootstrap import seed_demo_data_if_empty
-from app.services.external_enrichment import extract_company_summary, extract_linkedin_summary
+from app.services.directory import adjust_attendee_total, attendee_directory_page, attendee_total
+from app.services.events import (
+    EVENT_STREAM_HEARTBEAT_SECONDS,
+    EVENT_STREAM_RETRY_MS,
+    StreamLimitReached,
+    event_broker,
+    format_sse,
+)
+from app.services.import_jobs import (
+    create_import_job,
+    import_job_to_dict,
+    recover_import_jobs,
+    spool_upload,
+    submit_import_job,
+)
 from app.services.intro import create_intro_request, update_intro_request
 from app.services.matching import (
     MAX_MATCHES,
@@ -38,29 +83,89 @@ from app.services.matching import (
     build_matches_for_attendee,
     organizer_metrics,
 )
-from app.services.scenarios import scenarios_for_attendee, strategic_scenarios
+from app.services.metrics import MetricsMiddleware, instrument_engine, metrics, render_prometheus, timed
+from app.services.profiling import ProfiledRoute, profiler
+from app.services.rate_limit import build_rate_limiter
+from app.services.scenarios import scenario_cache, scenarios_involving, strategic_scenarios
+from app.services.snapshot import SEED_SNAPSHOT_PATH, restore_snapshot
 from app.services.security import (
     AUTH_SECRET,
     AUTH_COOKIE,
     CSRF_COOKIE,
-    InMemoryRateLimiter,
+    PasswordPoolBusy,
     build_csrf_token,
+    build_invite_token,
     build_session_payload,
-    decode_payload,
+    decode_invite_token,
     hash_password,
+    invite_matches_credential,
+    is_invite_placeholder,
+    password_pool,
+    provision_password_hashes,
+    session_token_cache,
     sign_payload,
     validate_password_policy,
     verify_csrf_token,
     verify_password,
 )
+from app.services.signals import record_signal
+from app.services.versions import bump_event_version, ensure_event_counter, event_version, feedback_version, match_version
+
+# Shares uvicorn's handler so startup lines land in the server log.
+logger = logging.getLogger("uvicorn.error")
+
+
+class _LazyTemplates:
+    """Builds the Jinja environment on first render so importing the app stays cheap."""
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._templates = None
+
+    def TemplateResponse(self, *args, **kwargs):
+        if self._templates is None:
+            from fastapi.templating import Jinja2Templates
+
+            self._templates = Jinja2Templates(directory=self._directory)
+            self._templates.env.globals["asset_url"] = asset_url
+        with timed("render"):
+            return self._templates.TemplateResponse(*args, **kwargs)
+
+
+class ModelJSONResponse(Response):
+    """Serialises a Pydantic model straight to JSON bytes with model_dump_json.
+
+    Skips FastAPI's jsonable_encoder pass and the json module for hot /v1 routes.
+    Build the model with ``model_construct`` from trusted rows; the declared
+    ``response_model`` still documents the shape in OpenAPI.
+    """
+
+    media_type = "application/json"
 
-app = FastAPI(title="Proof of Talk Matchmaking Prototype", version="0.5.0")
-Base.metadata.create_all(bind=engine)
-ensure_schema_compat()
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json().encode("utf-8")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    await run_in_threadpool(run_startup)
+    enrichment_client()
+    try:
+        yield
+    finally:
+        from app.services.enrichment_jobs import cancel_enrichment_jobs
+
+        await cancel_enrichment_jobs()
+        await close_enrichment_client()
+
+
+app = FastAPI(title="Proof of Talk Matchmaking Prototype", version="0.5.0", lifespan=lifespan)
+# Set before any route is declared so every endpoint can be profiled.
+app.router.route_class = ProfiledRoute
 app.add_middleware(GZipMiddleware, minimum_size=1024)
 
-templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
-app.mount("/static", StaticFiles(directory=str(Path(__file__).parent / "static")), name="static")
+templates = _LazyTemplates(directory=str(Path(__file__).parent / "templates"))
+app.mount("/static", AssetStaticFiles(directory=str(STATIC_DIR)), name="static")
 
 ORGANIZER_EMAIL = os.getenv("ORGANIZER_EMAIL", "organizer@pot.local")
 ORGANIZER_PASSWORD = os.getenv("ORGANIZER_PASSWORD", "organizer123")
@@ -77,8 +182,10 @@ SEED_ON_STARTUP = os.getenv(
 ).lower() == "true"
 HOME_PAGE_SIZE = int(os.getenv("HOME_PAGE_SIZE", "80"))
 ORGANIZER_PAGE_SIZE = int(os.getenv("ORGANIZER_PAGE_SIZE", "100"))
-IMPORT_MAX_FILE_BYTES = int(os.getenv("IMPORT_MAX_FILE_BYTES", str(4 * 1024 * 1024)))
-IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", "3000"))
+IMPORT_MAX_FILE_BYTES = int(os.getenv("IMPORT_MAX_FILE_BYTES", str(64 * 1024 * 1024)))
+# Lets a Prometheus scraper authenticate with a bearer token instead of an organizer session.
+METRICS_SCRAPE_TOKEN = os.getenv("METRICS_SCRAPE_TOKEN", "")
+PROFILE_REQUESTS_PER_MINUTE = int(os.getenv("PROFILE_REQUESTS_PER_MINUTE", "6"))
 
 if ALLOWED_HOSTS != ["*"]:
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=ALLOWED_HOSTS)
@@ -110,7 +217,7 @@ RBAC = {
     },
 }
 
-rate_limiter = InMemoryRateLimiter()
+rate_limiter = build_rate_limiter()
 
 
 def enforce_production_security():
@@ -131,17 +238,199 @@ def enforce_production_security():
         raise RuntimeError("Production security configuration error: " + "; ".join(insecure))
 
 
-enforce_production_security()
+def _recover_import_jobs():
+    db = SessionLocal()
+    try:
+        recovered = recover_import_jobs(db)
+    finally:
+        db.close()
+    if any(recovered.values()):
+        logger.warning(
+            "Marked %d interrupted import jobs failed and removed %d orphaned spool files",
+            recovered["failed_jobs"],
+            recovered["removed_spools"],
+        )
+
+
+def _recover_enrichment_jobs():
+    db = SessionLocal()
+    try:
+        unfinished = EnrichmentJob.status.in_(("queued", "running"))
+        if db.query(EnrichmentJob.id).filter(unfinished).first() is None:
+            return
+        # Imported only when there is something to recover; it pulls in the HTTP client stack.
+        from app.services.enrichment_jobs import recover_enrichment_jobs
+
+        failed = recover_enrichment_jobs(db)
+    finally:
+        db.close()
+    if failed:
+        logger.warning("Marked %d interrupted enrichment jobs failed", failed)
 
 
-if SEED_ON_STARTUP:
+def _ensure_event_counter():
     db = SessionLocal()
     try:
-        seed_demo_data_if_empty(db, ORGANIZER_EMAIL, ORGANIZER_PASSWORD, ATTENDEE_BOOTSTRAP_PASSWORD)
+        ensure_event_counter(db)
+        db.commit()
+    except IntegrityError:
+        # Another worker created the counter first.
+        db.rollback()
     finally:
         db.close()
 
 
+def _seed_on_startup():
+    db = SessionLocal()
+    try:
+        seed_timings: dict[str, float] = {}
+        seeded = seed_demo_data_if_empty(
+            db, ORGANIZER_EMAIL, ORGANIZER_PASSWORD, ATTENDEE_BOOTSTRAP_PASSWORD, timings=seed_timings
+        )
+        write_audit_log(
+            db,
+            {"role": "system", "label": "startup"},
+            "startup_seed",
+            "bootstrap",
+            "",
+            "success",
+            {"seeded": seeded, "timings_ms": seed_timings},
+        )
+    finally:
+        db.close()
+
+
+_startup_lock = threading.Lock()
+_startup_report: dict | None = None
+
+
+def run_startup() -> dict:
+    """Check config, create and upgrade the schema, and seed if enabled; runs once per process."""
+    global _startup_report
+    with _startup_lock:
+        if _startup_report is not None:
+            return _startup_report
+        snapshot_status = "disabled"
+
+        def _restore_snapshot():
+            nonlocal snapshot_status
+            snapshot_status = restore_snapshot(
+                DATABASE_URL, SEED_SNAPSHOT_PATH, ORGANIZER_EMAIL, ORGANIZER_PASSWORD, ATTENDEE_BOOTSTRAP_PASSWORD
+            )
+
+        phases = [("security_check", enforce_production_security)]
+        if SEED_ON_STARTUP:
+            phases.append(("restore_snapshot", _restore_snapshot))
+        phases += [
+            ("create_tables", lambda: Base.metadata.create_all(bind=engine)),
+            ("schema_compat", ensure_schema_compat),
+            ("recover_import_jobs", _recover_import_jobs),
+            ("recover_enrichment_jobs", _recover_enrichment_jobs),
+            ("event_counter", _ensure_event_counter),
+        ]
+        if SEED_ON_STARTUP:
+            phases.append(("seed", _seed_on_startup))
+        phases_ms: dict[str, float] = {}
+        for name, phase in phases:
+            start = time.perf_counter()
+            phase()
+            phases_ms[name] = round((time.perf_counter() - start) * 1000, 2)
+        report = {
+            "import_ms": IMPORT_MS,
+            "phases_ms": phases_ms,
+            "total_ms": round(sum(phases_ms.values()), 2),
+            "snapshot": snapshot_status,
+        }
+        logger.info(
+            "Startup finished in %.1f ms after %.1f ms of imports (%s); snapshot %s",
+            report["total_ms"],
+            IMPORT_MS,
+            ", ".join(f"{name}={ms}" for name, ms in phases_ms.items()),
+            snapshot_status,
+        )
+        app.state.startup_report = report
+        _startup_report = report
+        return report
+
+
+_enrichment_client = None
+
+
+def enrichment_client():
+    """Return the shared enrichment HTTP client for the running event loop.
+
+    The lifespan creates it up front; servers that skip lifespan events get one on
+    first use. httpx itself is only imported here, not at app import.
+    """
+    global _enrichment_client
+    if _enrichment_client is None or _enrichment_client.loop is not asyncio.get_running_loop():
+        from app.services.external_enrichment import EnrichmentClient
+
+        _enrichment_client = EnrichmentClient()
+    return _enrichment_client
+
+
+async def close_enrichment_client():
+    global _enrichment_client
+    client, _enrichment_client = _enrichment_client, None
+    if client is not None:
+        await client.aclose()
+
+
+async def extract_company_summary(url: str, cache=None) -> str:
+    """Company summaries go through the URL cache; pass one cache to share its hit/miss stats."""
+    from app.services.enrichment_cache import EnrichmentCache
+    from app.services.external_enrichment import fetch_company_summary
+
+    cache = cache or EnrichmentCache()
+
+    async def fetch(target: str, etag: str, last_modified: str):
+        return await fetch_company_summary(enrichment_client(), target, etag, last_modified)
+
+    return await cache.summary(url, fetch)
+
+
+async def extract_linkedin_summary(url: str) -> str:
+    from app.services.external_enrichment import extract_linkedin_summary as _extract
+
+    return await _extract(enrichment_client(), url)
+
+
+# The async handlers below await network fetches on the loop; their database work goes
+# through these helpers on the threadpool.
+def _load_attendee(db: Session, attendee_id: int) -> Attendee | None:
+    return db.query(Attendee).filter(Attendee.id == attendee_id).first()
+
+
+def _insert_attendee(
+    db: Session, fields: dict, email: str | None = None, raw_password: str | None = None
+) -> tuple[Attendee, AppUser]:
+    row = Attendee(**fields)
+    db.add(row)
+    adjust_attendee_total(db, 1)
+    bump_event_version(db)
+    db.commit()
+    db.refresh(row)
+    event_broker.publish_all("matches_updated", {"reason": "attendee_added"})
+    return row, ensure_attendee_user(db, row, email=email, raw_password=raw_password)
+
+
+def _save_enrichment(
+    db: Session,
+    user: dict | None,
+    action: str,
+    attendee: Attendee,
+    source: str,
+    source_url: str,
+    summary: str,
+    details: dict,
+):
+    record_signal(db, attendee, source, source_url, summary)
+    db.commit()
+    event_broker.publish_all("matches_updated", {"reason": "signals"})
+    write_audit_log(db, user, action, "attendee", str(attendee.id), "success", details)
+
+
 def _client_ip(request: Request) -> str:
     xff = request.headers.get("x-forwarded-for", "")
     if TRUST_PROXY_HEADERS and xff:
@@ -173,10 +462,13 @@ def _set_csrf_cookie(response: RedirectResponse, session_id: str):
 
 
 def current_user(request: Request) -> dict | None:
+    """Resolve the session principal once per request; later calls reuse request.state."""
+    if hasattr(request.state, "principal"):
+        return request.state.principal
     token = request.cookies.get(AUTH_COOKIE)
-    if not token:
-        return None
-    return decode_payload(token)
+    principal = session_token_cache.decode(token) if token else None
+    request.state.principal = principal
+    return principal
 
 
 def has_permission(user: dict | None, permission: str) -> bool:
@@ -214,6 +506,30 @@ def api_user_or_401(request: Request) -> dict:
     return user
 
 
+def private_etag(user: dict, *versions) -> str:
+    """Weak ETag over data versions, keyed to the caller so a tag never validates for another user."""
+    material = json.dumps([user.get("role"), user.get("attendee_id"), user.get("label"), *versions], default=str)
+    digest = hmac.new(AUTH_SECRET.encode(), material.encode(), hashlib.sha256).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def set_private_validators(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    # Browsers and shared caches may store the body but must revalidate, and never across sessions.
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["Vary"] = "Cookie, Authorization"
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    header = request.headers.get("if-none-match", "")
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+    if etag.removeprefix("W/") not in tags:
+        return None
+    response = Response(status_code=304)
+    set_private_validators(response, etag)
+    return response
+
+
 def require_csrf_form(request: Request, submitted_token: str):
     user = current_user(request)
     sid = user.get("sid", "guest-session") if user else "guest-session"
@@ -238,7 +554,7 @@ def check_rate_limit(request: Request, bucket: str, limit: int, period_seconds:
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
 
 
-def ensure_default_organizer_user(db: Session):
+def ensure_default_organizer_user(db: Session, password_hash: str):
     existing = db.query(AppUser).filter(AppUser.email == ORGANIZER_EMAIL).first()
     if existing:
         return existing
@@ -246,7 +562,7 @@ def ensure_default_organizer_user(db: Session):
         AppUser(
             email=ORGANIZER_EMAIL,
             role="organizer",
-            password_hash=hash_password(ORGANIZER_PASSWORD),
+            password_hash=password_hash,
             failed_attempts=0,
             locked_until=0,
         )
@@ -267,11 +583,12 @@ def ensure_attendee_user(
         return existing
     user_email = email or f"attendee-{attendee.id}@pot.local"
     password = raw_password or f"{ATTENDEE_BOOTSTRAP_PASSWORD}-{attendee.id}"
+    (password_hash,) = provision_password_hashes([(password, not raw_password)])
     created = AppUser(
         email=user_email,
         role="attendee",
         attendee_id=attendee.id,
-        password_hash=hash_password(password),
+        password_hash=password_hash,
         failed_attempts=0,
         locked_until=0,
     )
@@ -283,6 +600,64 @@ def ensure_attendee_user(
     return created
 
 
+async def run_password_work(fn, *args):
+    """Run PBKDF2 work on the dedicated password pool; shed load with 503 when it is full."""
+    try:
+        return await password_pool.run(fn, *args)
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=503, detail="Sign-in is busy, please retry shortly", headers={"Retry-After": "1"}
+        ) from None
+
+
+async def verify_attendee_passcode(attendee_user: AppUser, passcode: str) -> bool:
+    """Check a passcode, hashing the bootstrap default on first use for invite-provisioned logins.
+
+    A newly computed hash is only set on ``attendee_user``; the caller's commit stores it.
+    """
+    if not is_invite_placeholder(attendee_user.password_hash):
+        return await run_password_work(verify_password, passcode, attendee_user.password_hash)
+    default_passcode = f"{ATTENDEE_BOOTSTRAP_PASSWORD}-{attendee_user.attendee_id}"
+    if not hmac.compare_digest(passcode.encode("utf-8"), default_passcode.encode("utf-8")):
+        return False
+    attendee_user.password_hash = await run_password_work(hash_password, passcode)
+    return True
+
+
+def _organizer_login_row(db: Session, email: str) -> tuple[bool, AppUser | None]:
+    """Whether the default organizer exists, and the organizer row for ``email``."""
+    has_default = db.query(AppUser.id).filter(AppUser.email == ORGANIZER_EMAIL).first() is not None
+    user_row = db.query(AppUser).filter(AppUser.email == email, AppUser.role == "organizer").first()
+    return has_default, user_row
+
+
+def _attendee_login_rows(db: Session, attendee_id: int) -> tuple[Attendee | None, AppUser | None]:
+    attendee = db.query(Attendee).filter(Attendee.id == attendee_id).first()
+    attendee_user = (
+        db.query(AppUser).filter(AppUser.attendee_id == attendee_id, AppUser.role == "attendee").first()
+        if attendee
+        else None
+    )
+    return attendee, attendee_user
+
+
+def _record_login_attempt(
+    db: Session, user_row: AppUser | None, verified: bool, actor: dict | None, target: str, details: dict
+):
+    """Reset or advance the lockout counters, commit, and audit the attempt."""
+    if user_row is not None:
+        if verified:
+            user_row.failed_attempts = 0
+            user_row.locked_until = 0
+        else:
+            user_row.failed_attempts += 1
+            if user_row.failed_attempts >= 5:
+                user_row.locked_until = int(time.time()) + LOCKOUT_SECONDS
+                user_row.failed_attempts = 0
+        db.commit()
+    write_audit_log(db, actor, "login", "auth", target, "success" if verified else "denied", details)
+
+
 def validate_text(value: str, field: str, max_len: int) -> str:
     cleaned = (value or "").strip()
     if "\x00" in cleaned:
@@ -318,20 +693,40 @@ def parse_opt_in(value: str | bool | None) -> bool:
     return cleaned in {"1", "true", "yes", "on"}
 
 
-def parse_page(value: str | None, default: int = 1) -> int:
+def parse_page_size(value: str | None, default: int, min_size: int = 10, max_size: int = 200) -> int:
     try:
         parsed = int(value or default)
     except (TypeError, ValueError):
         return default
-    return max(1, parsed)
+    return min(max(parsed, min_size), max_size)
 
 
-def parse_page_size(value: str | None, default: int, min_size: int = 10, max_size: int = 200) -> int:
+def parse_cursor(value: str | None) -> int:
+    cleaned = (value or "").strip()
+    return int(cleaned) if cleaned.isdigit() else 0
+
+
+def organizer_page_query(start_cursor: str | None, page_size: int) -> str:
+    params = {"page_size": page_size}
+    if start_cursor:
+        params["start"] = start_cursor
+    return urlencode(params)
+
+
+def parse_audit_filters(request: Request) -> AuditFilters:
+    params = request.query_params
     try:
-        parsed = int(value or default)
-    except (TypeError, ValueError):
-        return default
-    return min(max(parsed, min_size), max_size)
+        return AuditFilters(
+            action=validate_text(params.get("action", ""), "action", 120),
+            actor_role=validate_text(params.get("actor_role", ""), "actor_role", 40),
+            status=validate_text(params.get("status", ""), "status", 40),
+            target_type=validate_text(params.get("target_type", ""), "target_type", 80),
+            target_id=validate_text(params.get("target_id", ""), "target_id", 80),
+            since=parse_audit_timestamp(params.get("since")),
+            until=parse_audit_timestamp(params.get("until")),
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 def required_text(value: str, field: str, max_len: int) -> str:
@@ -354,39 +749,6 @@ def parse_seed_confidence(raw_value: str) -> float:
     return parsed
 
 
-def load_bulk_import_rows(filename: str, raw_content: bytes) -> list[dict]:
-    if len(raw_content) > IMPORT_MAX_FILE_BYTES:
-        raise ValueError(f"import file exceeds {IMPORT_MAX_FILE_BYTES} bytes")
-    try:
-        content = raw_content.decode("utf-8")
-    except UnicodeDecodeError as exc:
-        raise ValueError("file must be utf-8 encoded") from exc
-
-    ext = Path(filename or "").suffix.lower()
-    rows: list[dict] = []
-    if ext == ".json":
-        payload = json.loads(content)
-        if isinstance(payload, dict):
-            rows = payload.get("attendees", [])
-        elif isinstance(payload, list):
-            rows = payload
-        else:
-            raise ValueError("json payload must be a list or an object with attendees[]")
-        if not isinstance(rows, list):
-            raise ValueError("json attendees must be a list")
-    else:
-        reader = csv.DictReader(io.StringIO(content))
-        if not reader.fieldnames:
-            raise ValueError("csv header is required")
-        rows = list(reader)
-
-    if not rows:
-        raise ValueError("import payload contains no attendee rows")
-    if len(rows) > IMPORT_MAX_ROWS:
-        raise ValueError(f"import exceeds max rows ({IMPORT_MAX_ROWS})")
-    return rows
-
-
 def parse_import_row(row_data: dict) -> dict:
     row = {str(k).strip().lower(): "" if v is None else str(v).strip() for k, v in row_data.items()}
     linkedin_opt_in = parse_opt_in(row.get("linkedin_opt_in", ""))
@@ -426,6 +788,13 @@ def parse_import_row(row_data: dict) -> dict:
     }
 
 
+def validate_import_row(row_data: dict) -> dict:
+    try:
+        return parse_import_row(row_data)
+    except HTTPException as exc:
+        raise ValueError(str(exc.detail)) from exc
+
+
 def delete_attendee_relations(db: Session, attendee_id: int) -> dict[str, int]:
     feedback_deleted = (
         db.query(Feedback)
@@ -467,8 +836,61 @@ def delete_attendee_relations(db: Session, attendee_id: int) -> dict[str, int]:
     }
 
 
+class ProfileRequestsMiddleware:
+    """Sample the endpoint on ``?_profile=1`` or ``X-Profile: 1`` from an organizer, or when slow mode is on.
+
+    A plain ASGI middleware, so unprofiled requests and streamed bodies pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        requested = request.query_params.get("_profile") == "1" or request.headers.get("x-profile") == "1"
+        if not requested and profiler.slow_ms == 0:
+            await self.app(scope, receive, send)
+            return
+        trigger = None
+        if requested and has_permission(current_user(request), "view_metrics"):
+            if not rate_limiter.allow(f"profile_request:{_client_ip(request)}", PROFILE_REQUESTS_PER_MINUTE, 60):
+                await JSONResponse({"detail": "Rate limit exceeded"}, status_code=429)(scope, receive, send)
+                return
+            trigger = "on_demand"
+        elif profiler.slow_ms > 0:
+            trigger = "slow"
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        session, token = profiler.start(trigger, request.method, request.url.path)
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start":
+                # The profile covers the endpoint up to its headers, not a streamed body.
+                profiler.finish(session)
+                if await run_in_threadpool(profiler.save, session) and trigger == "on_demand":
+                    headers = [*message.get("headers", []), (b"x-profile-id", session.id.encode())]
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            profiler.stop(session, token)
+
+
+app.add_middleware(ProfileRequestsMiddleware)
+
+
 @app.middleware("http")
 async def security_headers(request: Request, call_next):
+    if _startup_report is None:
+        # Serverless runtimes may skip ASGI lifespan events; finish startup on the first request.
+        await run_in_threadpool(run_startup)
     response = await call_next(request)
     response.headers["X-Content-Type-Options"] = "nosniff"
     response.headers["X-Frame-Options"] = "DENY"
@@ -478,20 +900,25 @@ async def security_headers(request: Request, call_next):
         "default-src 'self'; script-src 'self'; style-src 'self' 'unsafe-inline'; img-src 'self' data:; "
         "connect-src 'self'; frame-ancestors 'none'; base-uri 'self'; form-action 'self'"
     )
-    response.headers["Cache-Control"] = "no-store"
+    # Static files set their own caching; everything else (HTML, API) stays uncached.
+    if "cache-control" not in response.headers:
+        response.headers["Cache-Control"] = "no-store"
     if COOKIE_SECURE:
         response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
     return response
 
 
+# Added last so it wraps every other middleware and sees the bytes actually sent.
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+
+
 @app.get("/login")
 def login_page(request: Request):
     if current_user(request):
         return RedirectResponse(url="/", status_code=303)
 
-    csrf = request.cookies.get(CSRF_COOKIE, "")
-    if not csrf or not verify_csrf_token("guest-session", csrf, csrf):
-        csrf = build_csrf_token("guest-session")
+    csrf = _guest_csrf_token(request)
     response = templates.TemplateResponse(request=request, name="login.html", context={"error": "", "csrf_token": csrf})
     response.set_cookie(
         CSRF_COOKIE,
@@ -504,8 +931,10 @@ def login_page(request: Request):
     return response
 
 
+# Async so waiting on the password pool does not hold a shared threadpool worker; the
+# database work runs on the threadpool, and the pool only receives plain values.
 @app.post("/login")
-def login_submit(
+async def login_submit(
     request: Request,
     role: str = Form(...),
     csrf_token: str = Form(""),
@@ -522,76 +951,63 @@ def login_submit(
     password = validate_text(password, "password", 240)
     passcode = validate_text(passcode, "passcode", 240)
     require_csrf_form(request, csrf_token)
-    ensure_default_organizer_user(db)
 
     if role == "organizer":
-        user_row = db.query(AppUser).filter(AppUser.email == email, AppUser.role == "organizer").first()
+        has_default, user_row = await run_in_threadpool(_organizer_login_row, db, email)
+        if not has_default:
+            organizer_hash = await run_password_work(hash_password, ORGANIZER_PASSWORD)
+            await run_in_threadpool(ensure_default_organizer_user, db, organizer_hash)
+            _has_default, user_row = await run_in_threadpool(_organizer_login_row, db, email)
         now = int(time.time())
         if not user_row:
-            write_audit_log(db, None, "login", "auth", "organizer", "denied", {"email": email})
+            await run_in_threadpool(write_audit_log, db, None, "login", "auth", "organizer", "denied", {"email": email})
             return templates.TemplateResponse(request=request, name="login.html", context={"error": "Invalid organizer credentials", "csrf_token": csrf_token})
         if user_row.locked_until and user_row.locked_until > now:
-            write_audit_log(db, None, "login", "auth", user_row.email, "denied", {"reason": "locked"})
+            await run_in_threadpool(
+                write_audit_log, db, None, "login", "auth", user_row.email, "denied", {"reason": "locked"}
+            )
             return templates.TemplateResponse(request=request, name="login.html", context={"error": "Account temporarily locked", "csrf_token": csrf_token})
 
-        if verify_password(password, user_row.password_hash):
-            user_row.failed_attempts = 0
-            user_row.locked_until = 0
-            db.commit()
+        if await run_password_work(verify_password, password, user_row.password_hash):
             user = {"role": "organizer", "label": "Organizer"}
             session_payload = build_session_payload(user)
-            write_audit_log(db, session_payload, "login", "auth", user_row.email, "success", {})
+            await run_in_threadpool(_record_login_attempt, db, user_row, True, session_payload, user_row.email, {})
             response = RedirectResponse(url="/organizer", status_code=303)
             _set_auth_cookie(response, session_payload)
             _set_csrf_cookie(response, session_payload["sid"])
             return response
 
-        user_row.failed_attempts += 1
-        if user_row.failed_attempts >= 5:
-            user_row.locked_until = now + LOCKOUT_SECONDS
-            user_row.failed_attempts = 0
-        db.commit()
-        write_audit_log(db, None, "login", "auth", user_row.email, "denied", {"reason": "bad_password"})
+        await run_in_threadpool(
+            _record_login_attempt, db, user_row, False, None, user_row.email, {"reason": "bad_password"}
+        )
         return templates.TemplateResponse(request=request, name="login.html", context={"error": "Invalid organizer credentials", "csrf_token": csrf_token})
 
     if role == "attendee":
-        attendee = db.query(Attendee).filter(Attendee.id == attendee_id).first()
-        attendee_user = (
-            db.query(AppUser).filter(AppUser.attendee_id == attendee_id, AppUser.role == "attendee").first()
-            if attendee
-            else None
-        )
+        attendee, attendee_user = await run_in_threadpool(_attendee_login_rows, db, attendee_id)
         now = int(time.time())
         if attendee and attendee_user and attendee_user.locked_until and attendee_user.locked_until > now:
-            write_audit_log(db, None, "login", "auth", str(attendee_id), "denied", {"reason": "locked"})
+            await run_in_threadpool(
+                write_audit_log, db, None, "login", "auth", str(attendee_id), "denied", {"reason": "locked"}
+            )
             return templates.TemplateResponse(
                 request=request,
                 name="login.html",
                 context={"error": "Account temporarily locked", "csrf_token": csrf_token},
             )
 
-        if attendee and attendee_user and verify_password(passcode, attendee_user.password_hash):
-            attendee_user.failed_attempts = 0
-            attendee_user.locked_until = 0
-            db.commit()
+        if attendee and attendee_user and await verify_attendee_passcode(attendee_user, passcode):
             user = {
                 "role": "attendee",
                 "attendee_id": attendee.id,
                 "label": attendee.name,
             }
             session_payload = build_session_payload(user)
-            write_audit_log(db, session_payload, "login", "auth", str(attendee.id), "success", {})
+            await run_in_threadpool(_record_login_attempt, db, attendee_user, True, session_payload, str(attendee.id), {})
             response = RedirectResponse(url=f"/attendees/{attendee.id}", status_code=303)
             _set_auth_cookie(response, session_payload)
             _set_csrf_cookie(response, session_payload["sid"])
             return response
-        if attendee_user:
-            attendee_user.failed_attempts += 1
-            if attendee_user.failed_attempts >= 5:
-                attendee_user.locked_until = now + LOCKOUT_SECONDS
-                attendee_user.failed_attempts = 0
-            db.commit()
-        write_audit_log(db, None, "login", "auth", str(attendee_id), "denied", {})
+        await run_in_threadpool(_record_login_attempt, db, attendee_user, False, None, str(attendee_id), {})
         return templates.TemplateResponse(
             request=request,
             name="login.html",
@@ -604,6 +1020,100 @@ def login_submit(
     return templates.TemplateResponse(request=request, name="login.html", context={"error": "Invalid role", "csrf_token": csrf_token})
 
 
+def _guest_csrf_token(request: Request) -> str:
+    csrf = request.cookies.get(CSRF_COOKIE, "")
+    if not csrf or not verify_csrf_token("guest-session", csrf, csrf):
+        csrf = build_csrf_token("guest-session")
+    return csrf
+
+
+def _invite_response(request: Request, token: str, csrf: str, error: str = "", status_code: int = 200):
+    response = templates.TemplateResponse(
+        request=request,
+        name="invite.html",
+        context={"error": error, "csrf_token": csrf, "token": token},
+        status_code=status_code,
+    )
+    response.set_cookie(
+        CSRF_COOKIE,
+        csrf,
+        httponly=False,
+        samesite="strict",
+        secure=COOKIE_SECURE,
+        max_age=60 * 30,
+    )
+    return response
+
+
+def _invited_user(db: Session, token: str) -> AppUser | None:
+    payload = decode_invite_token(token)
+    if not payload:
+        return None
+    attendee_user = (
+        db.query(AppUser)
+        .filter(AppUser.attendee_id == payload["attendee_id"], AppUser.role == "attendee")
+        .first()
+    )
+    if not attendee_user or not invite_matches_credential(payload, attendee_user.password_hash):
+        return None
+    return attendee_user
+
+
+def _redeem_invite(db: Session, attendee_user: AppUser, password_hash: str) -> Attendee:
+    attendee_user.password_hash = password_hash
+    attendee_user.failed_attempts = 0
+    attendee_user.locked_until = 0
+    db.commit()
+    return db.query(Attendee).filter(Attendee.id == attendee_user.attendee_id).first()
+
+
+@app.get("/invite/{token}")
+def invite_page(token: str, request: Request, db: Session = Depends(get_db)):
+    check_rate_limit(request, "invite", limit=20, period_seconds=60)
+    csrf = _guest_csrf_token(request)
+    if not _invited_user(db, token):
+        return _invite_response(request, "", csrf, "This invite link is invalid, expired, or already used.", 410)
+    return _invite_response(request, token, csrf)
+
+
+@app.post("/invite/{token}")
+async def invite_submit(
+    token: str,
+    request: Request,
+    csrf_token: str = Form(""),
+    password: str = Form(""),
+    confirm_password: str = Form(""),
+    db: Session = Depends(get_db),
+):
+    check_rate_limit(request, "invite", limit=20, period_seconds=60)
+    if len(password) > 240 or len(confirm_password) > 240:
+        raise HTTPException(status_code=400, detail="Invalid credential payload length")
+    require_csrf_form(request, csrf_token)
+    attendee_user = await run_in_threadpool(_invited_user, db, token)
+    if not attendee_user:
+        await run_in_threadpool(
+            write_audit_log, db, None, "redeem_invite", "auth", "", "denied", {"reason": "invalid_invite"}
+        )
+        return _invite_response(request, "", csrf_token, "This invite link is invalid, expired, or already used.", 410)
+    if password != confirm_password:
+        return _invite_response(request, token, csrf_token, "Passwords do not match.")
+    ok, message = validate_password_policy(password)
+    if not ok:
+        return _invite_response(request, token, csrf_token, message)
+
+    password_hash = await run_password_work(hash_password, password)
+    attendee = await run_in_threadpool(_redeem_invite, db, attendee_user, password_hash)
+    user = {"role": "attendee", "attendee_id": attendee.id, "label": attendee.name}
+    session_payload = build_session_payload(user)
+    await run_in_threadpool(
+        write_audit_log, db, session_payload, "redeem_invite", "auth", str(attendee.id), "success", {}
+    )
+    response = RedirectResponse(url=f"/attendees/{attendee.id}", status_code=303)
+    _set_auth_cookie(response, session_payload)
+    _set_csrf_cookie(response, session_payload["sid"])
+    return response
+
+
 @app.get("/logout")
 def logout(request: Request, db: Session = Depends(get_db)):
     user = current_user(request)
@@ -624,19 +1134,15 @@ def home(request: Request, db: Session = Depends(get_db)):
     if user and user.get("role") == "attendee":
         return RedirectResponse(url=f"/attendees/{user['attendee_id']}", status_code=303)
 
-    page = parse_page(request.query_params.get("page"), default=1)
     page_size = parse_page_size(request.query_params.get("page_size"), default=HOME_PAGE_SIZE)
-    total_attendees = db.query(Attendee).count()
-    total_pages = max(1, (total_attendees + page_size - 1) // page_size)
-    page = min(page, total_pages)
-    offset = (page - 1) * page_size
-    attendees = (
-        db.query(Attendee)
-        .order_by(Attendee.name.asc())
-        .offset(offset)
-        .limit(page_size)
-        .all()
+    attendees, cursors = attendee_directory_page(
+        db,
+        after=request.query_params.get("after"),
+        before=request.query_params.get("before"),
+        start=request.query_params.get("start"),
+        limit=page_size,
     )
+    total_attendees = attendee_total(db)
     metrics = organizer_metrics(db)
     scenarios = strategic_scenarios(db.query(Attendee).all(), max_results=24)[:8]
     return templates.TemplateResponse(
@@ -647,9 +1153,8 @@ def home(request: Request, db: Session = Depends(get_db)):
             "metrics": metrics,
             "scenarios": scenarios,
             "user": user,
-            "page": page,
             "page_size": page_size,
-            "total_pages": total_pages,
+            "cursors": cursors,
             "total_attendees": total_attendees,
         },
     )
@@ -661,23 +1166,20 @@ def organizer_view(request: Request, db: Session = Depends(get_db)):
     if auth:
         return auth
 
-    page = parse_page(request.query_params.get("page"), default=1)
     page_size = parse_page_size(request.query_params.get("page_size"), default=ORGANIZER_PAGE_SIZE)
     confirm_delete_id_raw = request.query_params.get("confirm_delete")
     confirm_delete_id = int(confirm_delete_id_raw) if (confirm_delete_id_raw and confirm_delete_id_raw.isdigit()) else 0
-    total_attendees = db.query(Attendee).count()
-    total_pages = max(1, (total_attendees + page_size - 1) // page_size)
-    page = min(page, total_pages)
-    offset = (page - 1) * page_size
-    attendees = (
-        db.query(Attendee)
-        .order_by(Attendee.name.asc())
-        .offset(offset)
-        .limit(page_size)
-        .all()
+    attendees, cursors = attendee_directory_page(
+        db,
+        after=request.query_params.get("after"),
+        before=request.query_params.get("before"),
+        start=request.query_params.get("start"),
+        limit=page_size,
     )
+    total_attendees = attendee_total(db)
     metrics = organizer_metrics(db)
     message = request.query_params.get("message", "")
+    import_job_id = parse_cursor(request.query_params.get("import_job"))
     confirm_attendee = None
     if confirm_delete_id > 0:
         confirm_attendee = db.query(Attendee).filter(Attendee.id == confirm_delete_id).first()
@@ -688,12 +1190,13 @@ def organizer_view(request: Request, db: Session = Depends(get_db)):
             "attendees": attendees,
             "metrics": metrics,
             "message": message,
+            "import_job_id": import_job_id,
             "confirm_attendee": confirm_attendee,
             "user": current_user(request),
             "csrf_token": request.cookies.get(CSRF_COOKIE, ""),
-            "page": page,
             "page_size": page_size,
-            "total_pages": total_pages,
+            "cursors": cursors,
+            "page_query": organizer_page_query(cursors["current"], page_size),
             "total_attendees": total_attendees,
         },
     )
@@ -708,46 +1211,80 @@ def organizer_audit(request: Request, db: Session = Depends(get_db)):
     if not has_permission(user, "view_audit"):
         return RedirectResponse(url="/", status_code=303)
 
-    logs = db.query(AuditLog).order_by(AuditLog.id.desc()).limit(200).all()
+    filters = parse_audit_filters(request)
+    page_size = parse_page_size(request.query_params.get("page_size"), default=AUDIT_PAGE_SIZE)
+    logs, cursors = audit_log_page(
+        db,
+        filters,
+        before_id=parse_cursor(request.query_params.get("before")),
+        after_id=parse_cursor(request.query_params.get("after")),
+        limit=page_size,
+    )
+    filter_params = filters.as_query_params()
     return templates.TemplateResponse(
         request=request,
         name="organizer_audit.html",
-        context={"logs": logs, "user": user},
+        context={
+            "logs": logs,
+            "user": user,
+            "filters": filters,
+            "filter_query": urlencode({**filter_params, "page_size": page_size}),
+            "export_query": urlencode(filter_params),
+            "older_cursor": cursors["older"],
+            "newer_cursor": cursors["newer"],
+        },
     )
 
 
-@app.get("/attendees/{attendee_id}")
-def attendee_view(attendee_id: int, request: Request, db: Session = Depends(get_db)):
-    auth = require_auth(request)
+@app.get("/organizer/audit/export.ndjson")
+def export_audit_ndjson(request: Request, db: Session = Depends(get_db)):
+    auth = require_organizer(request)
     if auth:
         return auth
-
     user = current_user(request)
-    if not can_access_attendee(user, attendee_id):
+    if not has_permission(user, "view_audit"):
         return RedirectResponse(url="/", status_code=303)
 
-    attendee = db.query(Attendee).filter(Attendee.id == attendee_id).first()
-    if not attendee:
-        raise HTTPException(status_code=404, detail="Attendee not found")
+    filters = parse_audit_filters(request)
+    write_audit_log(db, user, "export_audit_log", "audit_log", "", "success", filters.as_query_params())
 
-    matches = build_matches_for_attendee(db, attendee_id, top_n=5)
-    all_attendees = db.query(Attendee).all()
-    attendee_scenarios = scenarios_for_attendee(attendee, all_attendees)
-    incoming_requests = (
-        db.query(IntroRequest).filter(IntroRequest.candidate_id == attendee.id).order_by(IntroRequest.id.desc()).all()
+    def stream_rows():
+        # The request session is closed once the handler returns, so the stream owns its own.
+        export_db = SessionLocal()
+        try:
+            for row in iter_audit_logs(export_db, filters):
+                yield audit_log_ndjson_line(row)
+        finally:
+            export_db.close()
+
+    return StreamingResponse(
+        stream_rows(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=audit_log_export.ndjson"},
     )
-    cards = []
+
+
+ATTENDEE_FRAGMENTS = {
+    "matches": "fragments/attendee_matches.html",
+    "intros": "fragments/attendee_intros.html",
+    "scenarios": "fragments/attendee_scenarios.html",
+}
+
+
+def match_views(db: Session, attendee_id: int) -> list[MatchView]:
+    matches = build_matches_for_attendee(db, attendee_id, top_n=5)
     candidate_ids = [m.candidate_id for m in matches]
     candidate_map = {
         row.id: row
         for row in db.query(Attendee).filter(Attendee.id.in_(candidate_ids)).all()
     } if candidate_ids else {}
+    output = []
     for m in matches:
         candidate = candidate_map.get(m.candidate_id)
         if not candidate:
             continue
-        cards.append(
-            MatchView(
+        output.append(
+            MatchView.model_construct(
                 match_id=m.id,
                 candidate_id=candidate.id,
                 candidate_name=candidate.name,
@@ -758,22 +1295,93 @@ def attendee_view(attendee_id: int, request: Request, db: Session = Depends(get_
                 reasons=[m.reason_1, m.reason_2, m.reason_3],
             )
         )
+    return output
 
-    return templates.TemplateResponse(
-        request=request,
-        name="attendee.html",
-        context={
-            "attendee": attendee,
-            "cards": cards,
-            "quality_threshold": QUALITY_THRESHOLD,
-            "min_matches": MIN_MATCHES,
-            "max_matches": MAX_MATCHES,
-            "scenarios": attendee_scenarios,
-            "incoming_requests": incoming_requests,
-            "user": user,
-            "csrf_token": request.cookies.get(CSRF_COOKIE, ""),
-        },
-    )
+
+def event_scenarios(db: Session) -> list[dict]:
+    return scenario_cache.get(event_version(db), lambda: db.query(Attendee).all())
+
+
+def attendee_section(db: Session, attendee: Attendee, section: str) -> dict:
+    if section == "matches":
+        return {"cards": match_views(db, attendee.id)}
+    if section == "intros":
+        incoming_requests = (
+            db.query(IntroRequest)
+            .filter(IntroRequest.candidate_id == attendee.id)
+            .order_by(IntroRequest.id.desc())
+            .all()
+        )
+        return {"incoming_requests": incoming_requests}
+    return {"scenarios": scenarios_involving(attendee.name, event_scenarios(db))}
+
+
+def attendee_section_version(db: Session, attendee_id: int, section: str):
+    if section == "matches":
+        return match_version(db, attendee_id)
+    if section == "scenarios":
+        return event_version(db)
+    # Intro status changes move no id or counter, and the indexed query is cheap.
+    return None
+
+
+@app.get("/attendees/{attendee_id}")
+def attendee_view(attendee_id: int, request: Request, inline: bool = False, db: Session = Depends(get_db)):
+    """Page shell; ui.js fills each section from its fragment, or ``?inline=1`` renders them in place."""
+    auth = require_auth(request)
+    if auth:
+        return auth
+
+    user = current_user(request)
+    if not can_access_attendee(user, attendee_id):
+        return RedirectResponse(url="/", status_code=303)
+
+    attendee = db.query(Attendee).filter(Attendee.id == attendee_id).first()
+    if not attendee:
+        raise HTTPException(status_code=404, detail="Attendee not found")
+
+    context = {
+        "attendee": attendee,
+        "inline": inline,
+        "quality_threshold": QUALITY_THRESHOLD,
+        "min_matches": MIN_MATCHES,
+        "max_matches": MAX_MATCHES,
+        "user": user,
+        "csrf_token": request.cookies.get(CSRF_COOKIE, ""),
+    }
+    if inline:
+        for section in ATTENDEE_FRAGMENTS:
+            context.update(attendee_section(db, attendee, section))
+    return templates.TemplateResponse(request=request, name="attendee.html", context=context)
+
+
+@app.get("/attendees/{attendee_id}/fragments/{section}")
+def attendee_fragment(attendee_id: int, section: str, request: Request, db: Session = Depends(get_db)):
+    """One attendee page section as HTML, computed on its own so each renders as soon as it is ready."""
+    user = api_user_or_401(request)
+    if not can_access_attendee(user, attendee_id):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    if section not in ATTENDEE_FRAGMENTS:
+        raise HTTPException(status_code=404, detail="Unknown section")
+    attendee = db.query(Attendee).filter(Attendee.id == attendee_id).first()
+    if not attendee:
+        raise HTTPException(status_code=404, detail="Attendee not found")
+
+    # The forms embed the CSRF token, so a rotated token must not revalidate an old fragment.
+    csrf_token = request.cookies.get(CSRF_COOKIE, "")
+    version = attendee_section_version(db, attendee_id, section)
+    if version is not None:
+        cached = not_modified(request, private_etag(user, "fragment", section, attendee_id, version, csrf_token))
+        if cached:
+            return cached
+    context = {"attendee": attendee, "user": user, "csrf_token": csrf_token}
+    context.update(attendee_section(db, attendee, section))
+    response = templates.TemplateResponse(request=request, name=ATTENDEE_FRAGMENTS[section], context=context)
+    if version is not None:
+        # Matches were just rebuilt, so tag the response with the post-rebuild version.
+        version = attendee_section_version(db, attendee_id, section)
+        set_private_validators(response, private_etag(user, "fragment", section, attendee_id, version, csrf_token))
+    return response
 
 
 @app.post("/feedback")
@@ -815,12 +1423,13 @@ def submit_feedback(
     )
     db.add(row)
     db.commit()
+    event_broker.publish(payload.attendee_id, "matches_updated", {"reason": "feedback"})
     write_audit_log(db, user, "submit_feedback", "match", str(match.id), "success", {"rating": rating})
     return RedirectResponse(url=f"/attendees/{attendee_id}", status_code=303)
 
 
 @app.post("/organizer/attendees")
-def create_attendee_form(
+async def create_attendee_form(
     request: Request,
     csrf_token: str = Form(""),
     name: str = Form(...),
@@ -859,58 +1468,52 @@ def create_attendee_form(
     if APP_ENV in {"prod", "production"} and not safe_password:
         raise HTTPException(status_code=400, detail="temp_password is required in production")
 
-    row = Attendee(
-        name=validate_text(name, "name", 120),
-        role=validate_text(role, "role", 120),
-        company=validate_text(company, "company", 120),
-        primary_goal=validate_text(primary_goal, "primary_goal", 120),
-        availability=validate_text(availability, "availability", 240),
-        language=validate_text(language or "English", "language", 32) or "English",
-        secondary_goals=validate_text(secondary_goals, "secondary_goals", 240),
-        seek_text=validate_text(seek_text, "seek_text", 800),
-        offer_text=validate_text(offer_text, "offer_text", 800),
-        focus_text=validate_text(focus_text, "focus_text", 800),
-        linkedin_opt_in=safe_linkedin_opt_in,
-        linkedin_url=safe_linkedin_url,
+    fields = {
+        "name": validate_text(name, "name", 120),
+        "role": validate_text(role, "role", 120),
+        "company": validate_text(company, "company", 120),
+        "primary_goal": validate_text(primary_goal, "primary_goal", 120),
+        "availability": validate_text(availability, "availability", 240),
+        "language": validate_text(language or "English", "language", 32) or "English",
+        "secondary_goals": validate_text(secondary_goals, "secondary_goals", 240),
+        "seek_text": validate_text(seek_text, "seek_text", 800),
+        "offer_text": validate_text(offer_text, "offer_text", 800),
+        "focus_text": validate_text(focus_text, "focus_text", 800),
+        "linkedin_opt_in": safe_linkedin_opt_in,
+        "linkedin_url": safe_linkedin_url,
+    }
+    row, attendee_user = await run_in_threadpool(
+        _insert_attendee, db, fields, email=safe_email or None, raw_password=safe_password or None
     )
-    db.add(row)
-    db.commit()
-    db.refresh(row)
-    attendee_user = ensure_attendee_user(
+    await run_in_threadpool(
+        write_audit_log,
         db,
-        row,
-        email=safe_email or None,
-        raw_password=safe_password or None,
+        user,
+        "create_attendee",
+        "attendee",
+        str(row.id),
+        "success",
+        {"linkedin_opt_in": safe_linkedin_opt_in},
     )
-    write_audit_log(db, user, "create_attendee", "attendee", str(row.id), "success", {
-        "linkedin_opt_in": safe_linkedin_opt_in
-    })
     message = f"Attendee created (id={row.id}, login={attendee_user.email})"
     if safe_linkedin_opt_in and safe_linkedin_url:
         try:
-            linkedin_summary = extract_linkedin_summary(safe_linkedin_url)
-            db.add(
-                ExternalSignal(
-                    attendee_id=row.id,
-                    source="linkedin_profile",
-                    source_url=safe_linkedin_url,
-                    extracted_summary=linkedin_summary,
-                )
-            )
-            row.focus_text = f"{row.focus_text} {linkedin_summary[:500]}".strip()
-            db.commit()
-            write_audit_log(
+            linkedin_summary = await extract_linkedin_summary(safe_linkedin_url)
+            await run_in_threadpool(
+                _save_enrichment,
                 db,
                 user,
                 "run_linkedin_enrichment",
-                "attendee",
-                str(row.id),
-                "success",
+                row,
+                "linkedin_profile",
+                safe_linkedin_url,
+                linkedin_summary,
                 {"source_url": safe_linkedin_url},
             )
             message += ", LinkedIn enrichment completed"
         except Exception as exc:
-            write_audit_log(
+            await run_in_threadpool(
+                write_audit_log,
                 db,
                 user,
                 "run_linkedin_enrichment",
@@ -1005,10 +1608,9 @@ async def bulk_import_attendees_form(
     if Path(filename).suffix.lower() not in {".csv", ".json"}:
         raise HTTPException(status_code=400, detail="upload file must be .csv or .json")
 
-    raw = await upload_file.read(IMPORT_MAX_FILE_BYTES + 1)
     try:
-        rows = load_bulk_import_rows(filename, raw)
-    except (ValueError, json.JSONDecodeError) as exc:
+        spool_path, spool_bytes = await spool_upload(upload_file, IMPORT_MAX_FILE_BYTES)
+    except ValueError as exc:
         write_audit_log(
             db,
             user,
@@ -1021,62 +1623,46 @@ async def bulk_import_attendees_form(
         msg = f"Bulk import failed: {str(exc)[:180]}"
         return RedirectResponse(url=f"/organizer?message={quote_plus(msg)}", status_code=303)
 
-    created = 0
-    failed = 0
-    sample_errors: list[str] = []
-    for index, raw_row in enumerate(rows, start=1):
-        row_number = index + 1 if Path(filename).suffix.lower() == ".csv" else index
-        try:
-            parsed = parse_import_row(raw_row if isinstance(raw_row, dict) else {})
-            with db.begin_nested():
-                attendee = Attendee(
-                    name=parsed["name"],
-                    role=parsed["role"],
-                    company=parsed["company"],
-                    primary_goal=parsed["primary_goal"],
-                    availability=parsed["availability"],
-                    language=parsed["language"],
-                    timezone=parsed["timezone"],
-                    secondary_goals=parsed["secondary_goals"],
-                    exclusions=parsed["exclusions"],
-                    seek_text=parsed["seek_text"],
-                    offer_text=parsed["offer_text"],
-                    focus_text=parsed["focus_text"],
-                    linkedin_opt_in=parsed["linkedin_opt_in"],
-                    linkedin_url=parsed["linkedin_url"],
-                    seed_confidence=parsed["seed_confidence"],
-                )
-                db.add(attendee)
-                db.flush()
-                ensure_attendee_user(
-                    db,
-                    attendee,
-                    email=parsed["login_email"] or None,
-                    raw_password=parsed["temp_password"] or None,
-                    commit=False,
-                )
-            created += 1
-        except (ValueError, IntegrityError) as exc:
-            failed += 1
-            if len(sample_errors) < 5:
-                sample_errors.append(f"row {row_number}: {str(exc).replace(chr(10), ' ')[:140]}")
-        except HTTPException as exc:
-            failed += 1
-            if len(sample_errors) < 5:
-                detail = str(exc.detail) if hasattr(exc, "detail") else str(exc)
-                sample_errors.append(f"row {row_number}: {detail.replace(chr(10), ' ')[:140]}")
+    job = create_import_job(db, filename, spool_bytes, (user or {}).get("label", ""), spool_path)
+    submit_import_job(job.id, spool_path, validate_import_row, ATTENDEE_BOOTSTRAP_PASSWORD, user)
+    message = f"Bulk import job #{job.id} queued for {filename}"
+    return RedirectResponse(
+        url=f"/organizer?import_job={job.id}&message={quote_plus(message)}",
+        status_code=303,
+    )
 
-    db.commit()
-    details = {"filename": filename, "created": created, "failed": failed, "total": len(rows), "errors": sample_errors}
-    write_audit_log(db, user, "bulk_import_attendees", "attendee_import", "", "success", details)
-    message = f"Bulk import complete: created={created}, failed={failed}, total={len(rows)}"
-    if sample_errors:
-        message += f" | sample errors: {'; '.join(sample_errors)}"
-    return RedirectResponse(url=f"/organizer?message={quote_plus(message)}", status_code=303)
+
+@app.get("/organizer/imports/{job_id}")
+def import_job_status(job_id: int, request: Request, db: Session = Depends(get_db)):
+    user = api_user_or_401(request)
+    if not has_permission(user, "manage_attendees"):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    job = db.get(ImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return import_job_to_dict(job)
+
+
+@app.post("/organizer/attendees/{attendee_id}/invite")
+def issue_attendee_invite(attendee_id: int, request: Request, db: Session = Depends(get_db)):
+    user = api_user_or_401(request)
+    check_rate_limit(request, "invite_issue_api", limit=20, period_seconds=60)
+    require_csrf_api(request)
+    if not has_permission(user, "manage_attendees"):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    attendee = db.query(Attendee).filter(Attendee.id == attendee_id).first()
+    if not attendee:
+        raise HTTPException(status_code=404, detail="Attendee not found")
+    attendee_user = ensure_attendee_user(db, attendee)
+    if not is_invite_placeholder(attendee_user.password_hash):
+        raise HTTPException(status_code=409, detail="Attendee has already set a password")
+    token, expires_at = build_invite_token(attendee.id, attendee_user.password_hash)
+    write_audit_log(db, user, "issue_invite", "attendee", str(attendee.id), "success", {"expires_at": expires_at})
+    return {"attendee_id": attendee.id, "invite_url": f"/invite/{token}", "expires_at": expires_at}
 
 
 @app.post("/organizer/enrich")
-def enrich_attendee_form(
+async def enrich_attendee_form(
     request: Request,
     csrf_token: str = Form(""),
     attendee_id: int = Form(...),
@@ -1090,31 +1676,43 @@ def enrich_attendee_form(
     check_rate_limit(request, "enrich", limit=10, period_seconds=60)
 
     user = current_user(request)
-    attendee = db.query(Attendee).filter(Attendee.id == attendee_id).first()
+    attendee = await run_in_threadpool(_load_attendee, db, attendee_id)
     if not attendee:
-        write_audit_log(db, user, "run_enrichment", "attendee", str(attendee_id), "denied", {"reason": "not_found"})
+        await run_in_threadpool(
+            write_audit_log, db, user, "run_enrichment", "attendee", str(attendee_id), "denied", {"reason": "not_found"}
+        )
         return RedirectResponse(url="/organizer?message=Attendee+not+found", status_code=303)
 
+    from app.services.enrichment_cache import EnrichmentCache
+
+    cache = EnrichmentCache()
     try:
         safe_source_url = validate_text(source_url, "source_url", 280)
-        summary = extract_company_summary(safe_source_url)
+        summary = await extract_company_summary(safe_source_url, cache=cache)
     except Exception as exc:
-        write_audit_log(db, user, "run_enrichment", "attendee", str(attendee_id), "failed", {"error": str(exc)[:120]})
+        await run_in_threadpool(
+            write_audit_log,
+            db,
+            user,
+            "run_enrichment",
+            "attendee",
+            str(attendee_id),
+            "failed",
+            {"error": str(exc)[:120], "cache": cache.stats},
+        )
         msg = f"Enrichment failed: {str(exc)[:120]}"
         return RedirectResponse(url=f"/organizer?message={msg}", status_code=303)
 
-    db.add(
-        ExternalSignal(
-            attendee_id=attendee.id,
-            source="company_website",
-            source_url=safe_source_url,
-            extracted_summary=summary,
-        )
-    )
-    attendee.focus_text = f"{attendee.focus_text} {summary[:500]}".strip()
-    db.commit()
-    write_audit_log(
-        db, user, "run_enrichment", "attendee", str(attendee.id), "success", {"source_url": safe_source_url}
+    await run_in_threadpool(
+        _save_enrichment,
+        db,
+        user,
+        "run_enrichment",
+        attendee,
+        "company_website",
+        safe_source_url,
+        summary,
+        {"source_url": safe_source_url, "cache": cache.stats},
     )
     return RedirectResponse(url="/organizer?message=Enrichment+completed", status_code=303)
 
@@ -1125,7 +1723,7 @@ def delete_attendee_form(
     request: Request,
     csrf_token: str = Form(""),
     confirm_name: str = Form(""),
-    page: int = Form(1),
+    start: str = Form(""),
     page_size: int = Form(ORGANIZER_PAGE_SIZE),
     db: Session = Depends(get_db),
 ):
@@ -1143,7 +1741,7 @@ def delete_attendee_form(
         )
         msg = "Delete failed: attendee not found"
         return RedirectResponse(
-            url=f"/organizer?page={max(1, page)}&page_size={page_size}&message={quote_plus(msg)}",
+            url=f"/organizer?{organizer_page_query(start, page_size)}&message={quote_plus(msg)}",
             status_code=303,
         )
 
@@ -1161,7 +1759,7 @@ def delete_attendee_form(
         msg = "Delete blocked: confirmation name mismatch"
         return RedirectResponse(
             url=(
-                f"/organizer?confirm_delete={attendee_id}&page={max(1, page)}&page_size={page_size}"
+                f"/organizer?confirm_delete={attendee_id}&{organizer_page_query(start, page_size)}"
                 f"&message={quote_plus(msg)}"
             ),
             status_code=303,
@@ -1169,7 +1767,10 @@ def delete_attendee_form(
 
     attendee_name = attendee.name
     counts = delete_attendee_relations(db, attendee_id)
+    adjust_attendee_total(db, -counts["attendees"])
+    bump_event_version(db)
     db.commit()
+    event_broker.publish_all("matches_updated", {"reason": "attendee_removed"})
     write_audit_log(
         db,
         user,
@@ -1181,7 +1782,7 @@ def delete_attendee_form(
     )
     msg = f"Attendee deleted: {attendee_name} (id={attendee_id})"
     return RedirectResponse(
-        url=f"/organizer?page={max(1, page)}&page_size={page_size}&message={quote_plus(msg)}",
+        url=f"/organizer?{organizer_page_query(start, page_size)}&message={quote_plus(msg)}",
         status_code=303,
     )
 
@@ -1245,12 +1846,12 @@ def intro_respond_form(
 
 # API routes with RBAC and CSRF checks.
 @app.post("/v1/attendees")
-def create_attendee(payload: AttendeeCreate, request: Request, db: Session = Depends(get_db)):
+async def create_attendee(payload: AttendeeCreate, request: Request, db: Session = Depends(get_db)):
     user = api_user_or_401(request)
     check_rate_limit(request, "attendee_create_api", limit=20, period_seconds=60)
     require_csrf_api(request)
     if not has_permission(user, "manage_attendees"):
-        write_audit_log(db, user, "api_create_attendee", "attendee", "", "denied", {})
+        await run_in_threadpool(write_audit_log, db, user, "api_create_attendee", "attendee", "", "denied", {})
         raise HTTPException(status_code=403, detail="Forbidden")
 
     linkedin_opt_in = parse_opt_in(payload.linkedin_opt_in)
@@ -1263,36 +1864,46 @@ def create_attendee(payload: AttendeeCreate, request: Request, db: Session = Dep
     data = payload.model_dump()
     data["linkedin_opt_in"] = linkedin_opt_in
     data["linkedin_url"] = linkedin_url
-    row = Attendee(**data)
-    db.add(row)
-    db.commit()
-    db.refresh(row)
-    ensure_attendee_user(db, row)
-    write_audit_log(db, user, "api_create_attendee", "attendee", str(row.id), "success", {"linkedin_opt_in": linkedin_opt_in})
+    row, _attendee_user = await run_in_threadpool(_insert_attendee, db, data)
+    await run_in_threadpool(
+        write_audit_log,
+        db,
+        user,
+        "api_create_attendee",
+        "attendee",
+        str(row.id),
+        "success",
+        {"linkedin_opt_in": linkedin_opt_in},
+    )
     if linkedin_opt_in and linkedin_url:
         try:
-            linkedin_summary = extract_linkedin_summary(linkedin_url)
-            db.add(
-                ExternalSignal(
-                    attendee_id=row.id,
-                    source="linkedin_profile",
-                    source_url=linkedin_url,
-                    extracted_summary=linkedin_summary,
-                )
-            )
-            row.focus_text = f"{row.focus_text} {linkedin_summary[:500]}".strip()
-            db.commit()
-            write_audit_log(
-                db, user, "api_linkedin_enrich", "attendee", str(row.id), "success", {"source_url": linkedin_url}
+            linkedin_summary = await extract_linkedin_summary(linkedin_url)
+            await run_in_threadpool(
+                _save_enrichment,
+                db,
+                user,
+                "api_linkedin_enrich",
+                row,
+                "linkedin_profile",
+                linkedin_url,
+                linkedin_summary,
+                {"source_url": linkedin_url},
             )
         except Exception as exc:
-            write_audit_log(
-                db, user, "api_linkedin_enrich", "attendee", str(row.id), "failed", {"error": str(exc)[:120]}
+            await run_in_threadpool(
+                write_audit_log,
+                db,
+                user,
+                "api_linkedin_enrich",
+                "attendee",
+                str(row.id),
+                "failed",
+                {"error": str(exc)[:120]},
             )
     return {"id": row.id, "login_email": f"attendee-{row.id}@pot.local"}
 
 
-@app.get("/v1/matches/{attendee_id}")
+@app.get("/v1/matches/{attendee_id}", response_model=MatchesView)
 def api_matches(attendee_id: int, request: Request, db: Session = Depends(get_db)):
     user = api_user_or_401(request)
     attendee = db.query(Attendee).filter(Attendee.id == attendee_id).first()
@@ -1302,30 +1913,14 @@ def api_matches(attendee_id: int, request: Request, db: Session = Depends(get_db
         write_audit_log(db, user, "api_view_matches", "attendee", str(attendee_id), "denied", {})
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    matches = build_matches_for_attendee(db, attendee_id, top_n=5)
-    candidate_ids = [m.candidate_id for m in matches]
-    candidate_map = {
-        row.id: row
-        for row in db.query(Attendee).filter(Attendee.id.in_(candidate_ids)).all()
-    } if candidate_ids else {}
-    output = []
-    for m in matches:
-        candidate = candidate_map.get(m.candidate_id)
-        if not candidate:
-            continue
-        output.append(
-            {
-                "match_id": m.id,
-                "candidate_id": candidate.id,
-                "candidate_name": candidate.name,
-                "candidate_role": candidate.role,
-                "candidate_company": candidate.company,
-                "score": m.score,
-                "exploration_flag": m.exploration_flag,
-                "reasons": [m.reason_1, m.reason_2, m.reason_3],
-            }
-        )
-    return {"attendee_id": attendee_id, "matches": output}
+    # Unchanged versions mean a rebuild would reproduce the stored matches the client already has.
+    cached = not_modified(request, private_etag(user, "matches", attendee_id, match_version(db, attendee_id)))
+    if cached:
+        return cached
+    output = match_views(db, attendee_id)
+    response = ModelJSONResponse(MatchesView.model_construct(attendee_id=attendee_id, matches=output))
+    set_private_validators(response, private_etag(user, "matches", attendee_id, match_version(db, attendee_id)))
+    return response
 
 
 @app.post("/v1/feedback")
@@ -1344,6 +1939,7 @@ def api_feedback(payload: FeedbackCreate, request: Request, db: Session = Depend
         raise HTTPException(status_code=403, detail="Feedback target mismatch")
     db.add(Feedback(**payload.model_dump(), candidate_id=match.candidate_id))
     db.commit()
+    event_broker.publish(payload.attendee_id, "matches_updated", {"reason": "feedback"})
     write_audit_log(db, user, "api_submit_feedback", "match", str(payload.match_id), "success", {})
     return {"ok": True}
 
@@ -1385,113 +1981,237 @@ def api_intro_update(intro_id: int, payload: IntroRequestUpdate, request: Reques
     return {"id": row.id, "status": row.status}
 
 
+@app.get("/v1/attendees/{attendee_id}/events")
+async def api_attendee_events(attendee_id: int, request: Request, db: Session = Depends(get_db)):
+    """Server-sent events for one attendee: intro_created, intro_accepted/declined, matches_updated."""
+    user = api_user_or_401(request)
+    if not can_access_attendee(user, attendee_id):
+        await run_in_threadpool(
+            write_audit_log, db, user, "api_attendee_events", "attendee", str(attendee_id), "denied", {}
+        )
+        raise HTTPException(status_code=403, detail="Forbidden")
+    if await run_in_threadpool(_load_attendee, db, attendee_id) is None:
+        raise HTTPException(status_code=404, detail="Attendee not found")
+    try:
+        subscription = event_broker.subscribe(attendee_id)
+    except StreamLimitReached as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "30"}) from exc
+
+    async def stream():
+        try:
+            yield f"retry: {EVENT_STREAM_RETRY_MS}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=EVENT_STREAM_HEARTBEAT_SECONDS)
+                except TimeoutError:
+                    # Comment lines keep proxies from timing out idle streams and surface dead clients.
+                    yield ": heartbeat\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/v1/enrich/company")
-def api_company_enrichment(attendee_id: int, source_url: str, request: Request, db: Session = Depends(get_db)):
+async def api_company_enrichment(attendee_id: int, source_url: str, request: Request, db: Session = Depends(get_db)):
     user = api_user_or_401(request)
     require_csrf_api(request)
     check_rate_limit(request, "api_enrich", limit=10, period_seconds=60)
     if not has_permission(user, "run_enrichment"):
-        write_audit_log(db, user, "api_enrich", "attendee", str(attendee_id), "denied", {})
+        await run_in_threadpool(write_audit_log, db, user, "api_enrich", "attendee", str(attendee_id), "denied", {})
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    attendee = db.query(Attendee).filter(Attendee.id == attendee_id).first()
+    attendee = await run_in_threadpool(_load_attendee, db, attendee_id)
     if not attendee:
         raise HTTPException(status_code=404, detail="Attendee not found")
 
+    from app.services.enrichment_cache import EnrichmentCache
+
+    cache = EnrichmentCache()
     try:
         safe_source_url = validate_text(source_url, "source_url", 280)
-        summary = extract_company_summary(safe_source_url)
+        summary = await extract_company_summary(safe_source_url, cache=cache)
     except Exception as exc:
-        write_audit_log(db, user, "api_enrich", "attendee", str(attendee_id), "failed", {"error": str(exc)[:120]})
+        await run_in_threadpool(
+            write_audit_log,
+            db,
+            user,
+            "api_enrich",
+            "attendee",
+            str(attendee_id),
+            "failed",
+            {"error": str(exc)[:120], "cache": cache.stats},
+        )
         raise HTTPException(status_code=400, detail=f"Enrichment failed: {exc}") from exc
 
-    db.add(
-        ExternalSignal(
-            attendee_id=attendee.id,
-            source="company_website",
-            source_url=safe_source_url,
-            extracted_summary=summary,
-        )
-    )
-    attendee.focus_text = f"{attendee.focus_text} {summary[:500]}".strip()
-    db.commit()
-    write_audit_log(
-        db, user, "api_enrich", "attendee", str(attendee.id), "success", {"source_url": safe_source_url}
+    await run_in_threadpool(
+        _save_enrichment,
+        db,
+        user,
+        "api_enrich",
+        attendee,
+        "company_website",
+        safe_source_url,
+        summary,
+        {"source_url": safe_source_url, "cache": cache.stats},
     )
     return {"attendee_id": attendee.id, "source_url": safe_source_url, "summary": summary[:500]}
 
 
 @app.post("/v1/enrich/linkedin")
-def api_linkedin_enrichment(attendee_id: int, source_url: str, request: Request, db: Session = Depends(get_db)):
+async def api_linkedin_enrichment(attendee_id: int, source_url: str, request: Request, db: Session = Depends(get_db)):
     user = api_user_or_401(request)
     require_csrf_api(request)
     check_rate_limit(request, "api_enrich_linkedin", limit=10, period_seconds=60)
     if not has_permission(user, "run_enrichment"):
-        write_audit_log(db, user, "api_enrich_linkedin", "attendee", str(attendee_id), "denied", {})
+        await run_in_threadpool(
+            write_audit_log, db, user, "api_enrich_linkedin", "attendee", str(attendee_id), "denied", {}
+        )
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    attendee = db.query(Attendee).filter(Attendee.id == attendee_id).first()
+    attendee = await run_in_threadpool(_load_attendee, db, attendee_id)
     if not attendee:
         raise HTTPException(status_code=404, detail="Attendee not found")
     if not attendee.linkedin_opt_in:
-        write_audit_log(
-            db, user, "api_enrich_linkedin", "attendee", str(attendee_id), "denied", {"reason": "opt_in_required"}
+        await run_in_threadpool(
+            write_audit_log,
+            db,
+            user,
+            "api_enrich_linkedin",
+            "attendee",
+            str(attendee_id),
+            "denied",
+            {"reason": "opt_in_required"},
         )
         raise HTTPException(status_code=400, detail="Attendee has not opted in to LinkedIn enrichment")
 
     try:
         safe_source_url = validate_text(source_url, "source_url", 280)
-        summary = extract_linkedin_summary(safe_source_url)
+        summary = await extract_linkedin_summary(safe_source_url)
     except Exception as exc:
-        write_audit_log(db, user, "api_enrich_linkedin", "attendee", str(attendee_id), "failed", {"error": str(exc)[:120]})
+        await run_in_threadpool(
+            write_audit_log,
+            db,
+            user,
+            "api_enrich_linkedin",
+            "attendee",
+            str(attendee_id),
+            "failed",
+            {"error": str(exc)[:120]},
+        )
         raise HTTPException(status_code=400, detail=f"LinkedIn enrichment failed: {exc}") from exc
 
     attendee.linkedin_url = safe_source_url
-    db.add(
-        ExternalSignal(
-            attendee_id=attendee.id,
-            source="linkedin_profile",
-            source_url=safe_source_url,
-            extracted_summary=summary,
-        )
-    )
-    attendee.focus_text = f"{attendee.focus_text} {summary[:500]}".strip()
-    db.commit()
-    write_audit_log(
-        db, user, "api_enrich_linkedin", "attendee", str(attendee.id), "success", {"source_url": safe_source_url}
+    await run_in_threadpool(
+        _save_enrichment,
+        db,
+        user,
+        "api_enrich_linkedin",
+        attendee,
+        "linkedin_profile",
+        safe_source_url,
+        summary,
+        {"source_url": safe_source_url},
     )
     return {"attendee_id": attendee.id, "source_url": safe_source_url, "summary": summary[:500]}
 
 
-@app.get("/v1/organizer/metrics")
+@app.post("/v1/enrich/batch")
+async def api_batch_enrichment(payload: EnrichmentBatchRequest, request: Request, db: Session = Depends(get_db)):
+    user = api_user_or_401(request)
+    require_csrf_api(request)
+    check_rate_limit(request, "api_enrich_batch", limit=5, period_seconds=60)
+    if not has_permission(user, "run_enrichment"):
+        await run_in_threadpool(write_audit_log, db, user, "api_enrich_batch", "enrichment_job", "", "denied", {})
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    from app.services.enrichment_cache import EnrichmentCache
+    from app.services.enrichment_jobs import create_enrichment_job, start_enrichment_job, validate_batch_items
+
+    try:
+        items = await run_in_threadpool(validate_batch_items, db, payload.items)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    job = await run_in_threadpool(create_enrichment_job, db, len(items), user.get("label", ""))
+    cache = EnrichmentCache()
+    start_enrichment_job(
+        job.id, items, functools.partial(extract_company_summary, cache=cache), user, {"cache": cache.stats}
+    )
+    await run_in_threadpool(
+        write_audit_log, db, user, "api_enrich_batch", "enrichment_job", str(job.id), "success", {"items": len(items)}
+    )
+    return {"job_id": job.id, "total": len(items), "status_url": f"/v1/enrich/jobs/{job.id}"}
+
+
+@app.get("/v1/enrich/jobs/{job_id}")
+def api_enrichment_job(job_id: int, request: Request, db: Session = Depends(get_db)):
+    user = api_user_or_401(request)
+    if not has_permission(user, "run_enrichment"):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    job = db.get(EnrichmentJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Enrichment job not found")
+    from app.services.enrichment_jobs import enrichment_job_to_dict
+
+    return enrichment_job_to_dict(job)
+
+
+@app.get("/v1/organizer/metrics", response_model=MetricsView)
 def api_metrics(request: Request, db: Session = Depends(get_db)):
     user = api_user_or_401(request)
     if not has_permission(user, "view_metrics"):
         write_audit_log(db, user, "api_view_metrics", "metrics", "", "denied", {})
         raise HTTPException(status_code=403, detail="Forbidden")
-    return organizer_metrics(db)
+    etag = private_etag(user, "metrics", feedback_version(db))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response = ModelJSONResponse(MetricsView.model_construct(**organizer_metrics(db)))
+    set_private_validators(response, etag)
+    return response
 
 
-@app.get("/v1/scenarios")
+@app.get("/v1/organizer/password-pool")
+def api_password_pool(request: Request, db: Session = Depends(get_db)):
+    user = api_user_or_401(request)
+    if not has_permission(user, "view_metrics"):
+        write_audit_log(db, user, "api_view_password_pool", "metrics", "", "denied", {})
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return password_pool.stats()
+
+
+@app.get("/v1/scenarios", response_model=ScenariosView)
 def api_scenarios(request: Request, attendee_id: int | None = None, db: Session = Depends(get_db)):
     user = api_user_or_401(request)
-    attendees = db.query(Attendee).all()
-    if user.get("role") == "organizer":
-        if attendee_id is None:
-            return {"scenarios": strategic_scenarios(attendees)}
+    if user.get("role") != "organizer":
+        own_id = user.get("attendee_id")
+        if attendee_id is not None and attendee_id != own_id:
+            write_audit_log(db, user, "api_view_scenarios", "attendee", str(attendee_id), "denied", {})
+            raise HTTPException(status_code=403, detail="Forbidden")
+        attendee_id = own_id
+
+    # Scenarios read every attendee, so the event-wide version covers them.
+    etag = private_etag(user, "scenarios", attendee_id, event_version(db))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    scenarios = event_scenarios(db)
+    if attendee_id is not None:
         attendee = db.query(Attendee).filter(Attendee.id == attendee_id).first()
         if not attendee:
             raise HTTPException(status_code=404, detail="Attendee not found")
-        return {"scenarios": scenarios_for_attendee(attendee, attendees)}
-
-    own_id = user.get("attendee_id")
-    if attendee_id is not None and attendee_id != own_id:
-        write_audit_log(db, user, "api_view_scenarios", "attendee", str(attendee_id), "denied", {})
-        raise HTTPException(status_code=403, detail="Forbidden")
-    attendee = db.query(Attendee).filter(Attendee.id == own_id).first()
-    if not attendee:
-        raise HTTPException(status_code=404, detail="Attendee not found")
-    return {"scenarios": scenarios_for_attendee(attendee, attendees)}
+        scenarios = scenarios_involving(attendee.name, scenarios)
+    response = ModelJSONResponse(
+        ScenariosView.model_construct(scenarios=[ScenarioView.model_construct(**row) for row in scenarios])
+    )
+    set_private_validators(response, etag)
+    return response
 
 
 @app.get("/health")
@@ -1499,9 +2219,42 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/organizer/profiles")
+def list_request_profiles(request: Request):
+    user = api_user_or_401(request)
+    if not has_permission(user, "view_metrics"):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return {"profiles": profiler.list_profiles()}
+
+
+@app.get("/organizer/profiles/{profile_id}")
+def download_request_profile(profile_id: str, request: Request):
+    user = api_user_or_401(request)
+    if not has_permission(user, "view_metrics"):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    path = profiler.profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=f"profile-{profile_id}.folded")
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics(request: Request):
+    """Prometheus text format merged across this host's workers, for organizers or the scrape token."""
+    authorization = request.headers.get("authorization", "")
+    scraper = bool(METRICS_SCRAPE_TOKEN) and hmac.compare_digest(
+        authorization.encode(), f"Bearer {METRICS_SCRAPE_TOKEN}".encode()
+    )
+    if not scraper:
+        user = api_user_or_401(request)
+        if not has_permission(user, "view_metrics"):
+            raise HTTPException(status_code=403, detail="Forbidden")
+    return Response(render_prometheus(metrics.collect()), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/favicon.ico", include_in_schema=False)
 def favicon():
-    return RedirectResponse(url="/static/brand/favicon.svg", status_code=307)
+    return RedirectResponse(url=asset_url("brand/favicon.svg"), status_code=307)
 
 
 @app.get("/organizer/export/matches.csv")
@@ -1533,3 +2286,6 @@ def export_matches_csv(request: Request, db: Session = Depends(get_db)):
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=matches_export.csv"},
     )
+
+
+IMPORT_MS = round((time.perf_counter() - IMPORT_STARTED_AT) * 1000, 2)
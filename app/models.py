@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -6,6 +6,7 @@ from app.database import Base
 
 class Attendee(Base):
     __tablename__ = "attendees"
+    __table_args__ = (Index("ix_attendees_name_id", "name", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(120), nullable=False)
@@ -22,8 +23,11 @@ class Attendee(Base):
     offer_text: Mapped[str] = mapped_column(Text, default="")
     linkedin_opt_in: Mapped[bool] = mapped_column(Boolean, default=False)
     linkedin_url: Mapped[str] = mapped_column(String(280), default="")
+    # Space-separated keywords merged from this attendee's external signals.
+    signal_tags: Mapped[str] = mapped_column(Text, default="")
     seed_confidence: Mapped[float] = mapped_column(Float, default=0.7)
 
+
 class MatchResult(Base):
     __tablename__ = "matches"
     __table_args__ = {"sqlite_autoincrement": True}
@@ -42,7 +46,8 @@ class Feedback(Base):
     __tablename__ = "feedback"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    match_id: Mapped[int] = mapped_column(ForeignKey("matches.id"), index=True)
+    # The match the rating was given on; cleared when a rebuild drops that candidate.
+    match_id: Mapped[int | None] = mapped_column(ForeignKey("matches.id"), index=True, nullable=True)
     attendee_id: Mapped[int] = mapped_column(ForeignKey("attendees.id"), index=True)
     candidate_id: Mapped[int] = mapped_column(ForeignKey("attendees.id"), index=True)
     rating: Mapped[int] = mapped_column(Integer)  # 1-5
@@ -68,10 +73,19 @@ class ExternalSignal(Base):
     source: Mapped[str] = mapped_column(String(80), default="company_website")
     source_url: Mapped[str] = mapped_column(String(280), default="")
     extracted_summary: Mapped[str] = mapped_column(Text, default="")
+    tags: Mapped[str] = mapped_column(Text, default="")
 
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    # Composite (filter, id) indexes keep keyset pages on a filtered view index-ordered.
+    __table_args__ = (
+        Index("ix_audit_logs_action_id", "action", "id"),
+        Index("ix_audit_logs_actor_role_id", "actor_role", "id"),
+        Index("ix_audit_logs_status_id", "status", "id"),
+        Index("ix_audit_logs_target_lookup", "target_type", "target_id", "id"),
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     actor_role: Mapped[str] = mapped_column(String(40), default="anonymous")
@@ -96,3 +110,62 @@ class AppUser(Base):
     password_hash: Mapped[str] = mapped_column(String(280), nullable=False)
     failed_attempts: Mapped[int] = mapped_column(Integer, default=0)
     locked_until: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class AppCounter(Base):
+    __tablename__ = "app_counters"
+
+    name: Mapped[str] = mapped_column(String(80), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    filename: Mapped[str] = mapped_column(String(180), default="")
+    status: Mapped[str] = mapped_column(String(40), default="queued")
+    actor_label: Mapped[str] = mapped_column(String(120), default="")
+    bytes_total: Mapped[int] = mapped_column(Integer, default=0)
+    bytes_processed: Mapped[int] = mapped_column(Integer, default=0)
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0)
+    created_count: Mapped[int] = mapped_column(Integer, default=0)
+    failed_count: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[str] = mapped_column(Text, default="[]")
+    timings: Mapped[str] = mapped_column(Text, default="{}")
+    error: Mapped[str] = mapped_column(String(280), default="")
+    started_at: Mapped[float] = mapped_column(Float, default=0.0)
+    finished_at: Mapped[float] = mapped_column(Float, default=0.0)
+    # The process whose in-memory executor holds the job, and the upload it reads.
+    worker_pid: Mapped[int] = mapped_column(Integer, default=0)
+    spool_path: Mapped[str] = mapped_column(String(400), default="")
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class EnrichmentJob(Base):
+    __tablename__ = "enrichment_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    status: Mapped[str] = mapped_column(String(40), default="queued")
+    actor_label: Mapped[str] = mapped_column(String(120), default="")
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    succeeded: Mapped[int] = mapped_column(Integer, default=0)
+    failed: Mapped[int] = mapped_column(Integer, default=0)
+    retries: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[str] = mapped_column(Text, default="[]")
+    error: Mapped[str] = mapped_column(String(280), default="")
+    started_at: Mapped[float] = mapped_column(Float, default=0.0)
+    finished_at: Mapped[float] = mapped_column(Float, default=0.0)
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    worker_pid: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class EnrichmentCacheEntry(Base):
+    __tablename__ = "enrichment_cache"
+
+    url: Mapped[str] = mapped_column(String(280), primary_key=True)
+    summary: Mapped[str] = mapped_column(Text, default="")
+    etag: Mapped[str] = mapped_column(String(280), default="")
+    last_modified: Mapped[str] = mapped_column(String(80), default="")
+    fetched_at: Mapped[float] = mapped_column(Float, default=0.0)
+    expires_at: Mapped[float] = mapped_column(Float, default=0.0, index=True)
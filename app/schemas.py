@@ -38,6 +38,29 @@ class MatchView(BaseModel):
     reasons: list[str]
 
 
+class MatchesView(BaseModel):
+    attendee_id: int
+    matches: list[MatchView]
+
+
+class ScenarioView(BaseModel):
+    type: str
+    title: str
+    participants: list[str]
+    explanation: str
+
+
+class ScenariosView(BaseModel):
+    scenarios: list[ScenarioView]
+
+
+class MetricsView(BaseModel):
+    feedback_count: int
+    avg_rating: float
+    positive_rate: float
+    meeting_rate: float
+
+
 class IntroRequestCreate(BaseModel):
     requester_id: int
     candidate_id: int
@@ -47,3 +70,12 @@ class IntroRequestCreate(BaseModel):
 class IntroRequestUpdate(BaseModel):
     actor_id: int
     action: str = Field(min_length=1, max_length=24)  # accept | decline
+
+
+class EnrichmentBatchItem(BaseModel):
+    attendee_id: int
+    url: str = Field(min_length=1, max_length=280)
+
+
+class EnrichmentBatchRequest(BaseModel):
+    items: list[EnrichmentBatchItem] = Field(min_length=1)
@@ -0,0 +1,163 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
+
+from starlette.responses import FileResponse
+from starlette.staticfiles import StaticFiles
+
+STATIC_DIR = Path(__file__).resolve().parents[1] / "static"
+DIST_DIRNAME = "dist"
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 12
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".svg", ".json", ".txt"}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Unhashed files may change under the same URL, so browsers revalidate them.
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+# Precompressed variants in order of preference.
+ENCODING_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    """Parse Accept-Encoding into coding -> q-value; ``q=0`` marks a coding as refused."""
+    accepted: dict[str, float] = {}
+    for item in header.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = min(1.0, max(0.0, float(value)))
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.lower()] = quality
+    return accepted
+
+
+def _source_files(static_dir: Path) -> list[Path]:
+    files = []
+    for path in static_dir.rglob("*"):
+        parts = path.relative_to(static_dir).parts
+        # Skip build output and hidden entries such as an interrupted build's staging dir.
+        if path.is_file() and parts[0] != DIST_DIRNAME and not any(part.startswith(".") for part in parts):
+            files.append(path)
+    return sorted(files)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _compressors() -> dict[str, Callable[[bytes], bytes]]:
+    compressors = {".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:  # brotli ships in requirements.txt; without it gzip still covers every browser.
+        return compressors
+    compressors[".br"] = lambda data: brotli.compress(data, quality=11)
+    return compressors
+
+
+def build_assets(static_dir: Path = STATIC_DIR) -> dict:
+    """Write content-hashed copies (plus .gz/.br for text assets) under static/dist.
+
+    The manifest maps each source path to its hashed path and records the source
+    digest, so a process can tell when a file changed after the build.
+    """
+    dist = static_dir / DIST_DIRNAME
+    staging = Path(tempfile.mkdtemp(prefix=".dist-", dir=static_dir))
+    compressors = _compressors()
+    manifest: dict[str, dict[str, str]] = {}
+    try:
+        for source in _source_files(static_dir):
+            name = source.relative_to(static_dir).as_posix()
+            data = source.read_bytes()
+            digest = _digest(data)
+            hashed = source.relative_to(static_dir).with_name(f"{source.stem}.{digest[:HASH_LENGTH]}{source.suffix}")
+            target = staging / hashed
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+            if source.suffix in COMPRESSIBLE_SUFFIXES:
+                for suffix, compress in compressors.items():
+                    compressed = compress(data)
+                    if len(compressed) < len(data):
+                        target.with_name(target.name + suffix).write_bytes(compressed)
+            manifest[name] = {"path": f"{DIST_DIRNAME}/{hashed.as_posix()}", "sha256": digest}
+        (staging / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        if dist.exists():
+            shutil.rmtree(dist)
+        os.replace(staging, dist)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return manifest
+
+
+@lru_cache(maxsize=1)
+def _asset_paths() -> dict[str, str]:
+    """Source name -> hashed path for entries whose source still matches the build."""
+    try:
+        manifest = json.loads((STATIC_DIR / DIST_DIRNAME / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    paths = {}
+    for name, entry in manifest.items():
+        source = STATIC_DIR / name
+        # A stale entry would pin an old file forever, so it falls back to the plain URL.
+        if source.is_file() and _digest(source.read_bytes()) == entry.get("sha256"):
+            paths[name] = entry["path"]
+    return paths
+
+
+def asset_url(name: str) -> str:
+    return f"/static/{_asset_paths().get(name, name)}"
+
+
+class AssetStaticFiles(StaticFiles):
+    """StaticFiles that serves precompressed variants and long-lived caching for hashed assets."""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        hashed = Path(path).parts[:1] == (DIST_DIRNAME,)
+        if response.status_code not in {200, 304}:
+            return response
+        if not hashed:
+            response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+            return response
+        if response.status_code == 200:
+            response = self._precompressed(path, scope, response)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    def _precompressed(self, path: str, scope, response):
+        header = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                header = value.decode("latin-1")
+        accepted = accepted_encodings(header)
+        wildcard = accepted.get("*", 0.0)
+        variants = [(accepted.get(encoding, wildcard), encoding, suffix) for encoding, suffix in ENCODING_SUFFIXES]
+        # Highest q-value first; the stable sort keeps brotli ahead of gzip on a tie.
+        for quality, encoding, suffix in sorted(variants, key=lambda variant: -variant[0]):
+            if quality <= 0:
+                break
+            full_path, stat_result = self.lookup_path(path + suffix)
+            if stat_result is not None:
+                return FileResponse(
+                    full_path,
+                    stat_result=stat_result,
+                    media_type=response.media_type,
+                    headers={"Content-Encoding": encoding},
+                )
+        return response
@@ -0,0 +1,289 @@
+import os
+import re
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import AppUser, Attendee
+from app.services.directory import adjust_attendee_total
+from app.services.security import provision_password_hashes
+from app.services.versions import bump_event_version
+
+IMPORT_INSERT_BATCH_SIZE = int(os.getenv("IMPORT_INSERT_BATCH_SIZE", "500"))
+MAX_SAMPLE_ERRORS = 5
+# Ids tried per row when a conflicting chunk is retried row by row.
+MAX_SKIPPED_IDS = 20
+FALLBACK_LOGIN_EMAIL = re.compile(r"^attendee-\d+@pot\.local$", re.IGNORECASE)
+
+ATTENDEE_IMPORT_FIELDS = (
+    "name",
+    "role",
+    "company",
+    "primary_goal",
+    "availability",
+    "language",
+    "timezone",
+    "secondary_goals",
+    "exclusions",
+    "seek_text",
+    "offer_text",
+    "focus_text",
+    "linkedin_opt_in",
+    "linkedin_url",
+    "seed_confidence",
+)
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    created: int = 0
+    failed: int = 0
+    sample_errors: list[str] = field(default_factory=list)
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+    def record_error(self, row_number: int, message: str):
+        self.failed += 1
+        if len(self.sample_errors) < MAX_SAMPLE_ERRORS:
+            self.sample_errors.append(f"row {row_number}: {message.replace(chr(10), ' ')[:140]}")
+
+    @contextmanager
+    def timed(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings_ms[stage] = round(self.timings_ms.get(stage, 0.0) + elapsed, 2)
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def validate_import_rows(
+    numbered_rows: Iterable[tuple[int, object]],
+    parse_row: Callable[[dict], dict],
+    report: ImportReport,
+) -> list[tuple[int, dict]]:
+    valid: list[tuple[int, dict]] = []
+    for row_number, raw_row in numbered_rows:
+        report.total += 1
+        try:
+            valid.append((row_number, parse_row(raw_row if isinstance(raw_row, dict) else {})))
+        except ValueError as exc:
+            report.record_error(row_number, str(exc))
+    return valid
+
+
+def fallback_login_email(attendee_id: int) -> str:
+    return f"attendee-{attendee_id}@pot.local"
+
+
+def reject_duplicate_logins(
+    db: Session, valid: list[tuple[int, dict]], report: ImportReport
+) -> list[tuple[int, dict]]:
+    """Drop rows whose login_email is already taken, in the DB or earlier in the same file.
+
+    Addresses of the ``attendee-<id>@pot.local`` form are reserved for generated logins,
+    since a row claiming one would collide with the fallback of the attendee given that id.
+    """
+    emails = sorted({parsed["login_email"] for _, parsed in valid if parsed["login_email"]})
+    taken: set[str] = set()
+    for chunk in _chunks(emails, IMPORT_INSERT_BATCH_SIZE):
+        taken.update(email for (email,) in db.query(AppUser.email).filter(AppUser.email.in_(chunk)))
+
+    kept: list[tuple[int, dict]] = []
+    for row_number, parsed in valid:
+        email = parsed["login_email"]
+        if email and FALLBACK_LOGIN_EMAIL.match(email):
+            report.record_error(row_number, f"login_email {email} is reserved for generated logins")
+            continue
+        if email and email in taken:
+            report.record_error(row_number, f"login_email {email} is already in use")
+            continue
+        if email:
+            taken.add(email)
+        kept.append((row_number, parsed))
+    return kept
+
+
+def _user_rows(
+    chunk: list[tuple[int, dict]],
+    attendee_ids: list[int],
+    explicit_hashes: dict[int, str],
+    default_hashes: dict[int, str],
+) -> list[dict]:
+    return [
+        {
+            "email": parsed["login_email"] or fallback_login_email(attendee_id),
+            "role": "attendee",
+            "attendee_id": attendee_id,
+            "password_hash": explicit_hashes[index] if parsed["temp_password"] else default_hashes[attendee_id],
+            "failed_attempts": 0,
+            "locked_until": 0,
+        }
+        for index, ((_, parsed), attendee_id) in enumerate(zip(chunk, attendee_ids))
+    ]
+
+
+def _hash_chosen_passwords(chunk: list[tuple[int, dict]]) -> dict[int, str]:
+    chosen = [(index, parsed["temp_password"]) for index, (_, parsed) in enumerate(chunk) if parsed["temp_password"]]
+    hashed = provision_password_hashes([(password, False) for _, password in chosen])
+    return {index: password_hash for (index, _), password_hash in zip(chosen, hashed)}
+
+
+def _hash_defaults(attendee_ids: Iterable[int], bootstrap_password: str) -> dict[int, str]:
+    # Bootstrap defaults embed the attendee id, so ids are planned before anything is inserted.
+    attendee_ids = list(attendee_ids)
+    hashed = provision_password_hashes([(f"{bootstrap_password}-{attendee_id}", True) for attendee_id in attendee_ids])
+    return dict(zip(attendee_ids, hashed))
+
+
+def _next_attendee_id(db: Session) -> int:
+    next_id = (db.scalar(select(func.max(Attendee.id))) or 0) + 1
+    # End the read so no transaction stays open while the planned ids are hashed.
+    db.commit()
+    return next_id
+
+
+def _insert_chunk(
+    db: Session,
+    chunk: list[tuple[int, dict]],
+    first_id: int,
+    explicit_hashes: dict[int, str],
+    default_hashes: dict[int, str],
+    report: ImportReport,
+) -> int:
+    attendee_ids = list(range(first_id, first_id + len(chunk)))
+    with report.timed("insert_attendees"):
+        params = [
+            {"id": attendee_id, **{key: parsed[key] for key in ATTENDEE_IMPORT_FIELDS}}
+            for (_, parsed), attendee_id in zip(chunk, attendee_ids)
+        ]
+        db.execute(insert(Attendee), params)
+    with report.timed("insert_users"):
+        db.execute(insert(AppUser), _user_rows(chunk, attendee_ids, explicit_hashes, default_hashes))
+        adjust_attendee_total(db, len(attendee_ids))
+        bump_event_version(db)
+        db.commit()
+    return len(attendee_ids)
+
+
+def _insert_row(
+    db: Session, attendee_id: int, row: tuple[int, dict], password_hash: str | None, default_hashes: dict[int, str]
+) -> bool:
+    _, parsed = row
+    explicit_hashes = {0: password_hash} if password_hash else {}
+    try:
+        with db.begin_nested():
+            db.execute(insert(Attendee), {"id": attendee_id, **{key: parsed[key] for key in ATTENDEE_IMPORT_FIELDS}})
+            db.execute(insert(AppUser), _user_rows([row], [attendee_id], explicit_hashes, default_hashes))
+    except IntegrityError:
+        return False
+    return True
+
+
+def _insert_chunk_rowwise(
+    db: Session,
+    chunk: list[tuple[int, dict]],
+    explicit_hashes: dict[int, str],
+    bootstrap_password: str,
+    report: ImportReport,
+) -> int:
+    """Retry a conflicting chunk with a savepoint per row, so only rows whose login is taken fail.
+
+    Ids are assigned here because SQLite hands a rolled-back id straight to the next insert:
+    an id whose generated address is already taken would otherwise fail every later row.
+    Such ids are skipped instead, since the conflict is not the row's. Default passwords are
+    hashed for a planned id range before each round's transaction; rows left over once the
+    range runs out go to the next round.
+    """
+    created = 0
+    pending = list(enumerate(chunk))
+    while pending:
+        first_id = _next_attendee_id(db)
+        planned = range(first_id, first_id + len(pending) + MAX_SKIPPED_IDS)
+        with report.timed("hash_passwords"):
+            needs_defaults = any(not parsed["temp_password"] for _, (_, parsed) in pending)
+            default_hashes = _hash_defaults(planned, bootstrap_password) if needs_defaults else {}
+        with report.timed("insert_conflict_retry"):
+            # Writing first opens the transaction, so the savepoints nest in it and the max id holds.
+            bump_event_version(db)
+            next_id = max(first_id, (db.scalar(select(func.max(Attendee.id))) or 0) + 1)
+            handled = round_created = 0
+            for index, row in pending:
+                row_number, parsed = row
+                outcome = None
+                for _attempt in range(MAX_SKIPPED_IDS):
+                    if next_id not in planned:
+                        break
+                    attendee_id, next_id = next_id, next_id + 1
+                    if _insert_row(db, attendee_id, row, explicit_hashes.get(index), default_hashes):
+                        outcome = "created"
+                        break
+                    email = parsed["login_email"]
+                    if email and db.query(AppUser.id).filter(AppUser.email == email).first():
+                        report.record_error(row_number, f"login_email {email} is already in use, row not imported")
+                        outcome = "failed"
+                        break
+                else:
+                    report.record_error(row_number, "no attendee id with a free generated login, row not imported")
+                    outcome = "failed"
+                if outcome is None:
+                    break
+                handled += 1
+                round_created += outcome == "created"
+            adjust_attendee_total(db, round_created)
+            db.commit()
+        created += round_created
+        pending = pending[handled:]
+    return created
+
+
+def insert_import_rows(
+    db: Session, valid: list[tuple[int, dict]], bootstrap_password: str, report: ImportReport
+):
+    """Insert attendees and their logins with executemany batches, one transaction per chunk.
+
+    Every password, chosen or bootstrap default, is hashed before a chunk's transaction
+    opens so the write lock is not held across them; defaults use ids planned from the
+    current maximum. A conflict (a concurrent create taking a planned id or login, or a
+    generated address already taken) rolls back only its chunk, which is then retried
+    row by row.
+    """
+    for chunk in _chunks(valid, IMPORT_INSERT_BATCH_SIZE):
+        first_id = _next_attendee_id(db)
+        with report.timed("hash_passwords"):
+            explicit_hashes = _hash_chosen_passwords(chunk)
+            default_hashes = _hash_defaults(
+                (first_id + index for index, (_, parsed) in enumerate(chunk) if not parsed["temp_password"]),
+                bootstrap_password,
+            )
+        try:
+            report.created += _insert_chunk(db, chunk, first_id, explicit_hashes, default_hashes, report)
+        except IntegrityError:
+            db.rollback()
+            report.created += _insert_chunk_rowwise(db, chunk, explicit_hashes, bootstrap_password, report)
+
+
+def run_attendee_import(
+    db: Session,
+    numbered_rows: Iterable[tuple[int, object]],
+    parse_row: Callable[[dict], dict],
+    bootstrap_password: str,
+    report: ImportReport | None = None,
+) -> ImportReport:
+    """Validate every row first, then bulk-insert the valid ones; errors are reported per row."""
+    report = report or ImportReport()
+    with report.timed("validate"):
+        valid = validate_import_rows(numbered_rows, parse_row, report)
+        valid = reject_duplicate_logins(db, valid, report)
+    insert_import_rows(db, valid, bootstrap_password, report)
+    return report
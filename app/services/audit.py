@@ -1,9 +1,21 @@
+import gzip
 import json
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
 from app.models import AuditLog
 
+AUDIT_PAGE_SIZE = int(os.getenv("AUDIT_PAGE_SIZE", "50"))
+AUDIT_EXPORT_BATCH_SIZE = int(os.getenv("AUDIT_EXPORT_BATCH_SIZE", "500"))
+AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "90"))
+AUDIT_ARCHIVE_BATCH_SIZE = int(os.getenv("AUDIT_ARCHIVE_BATCH_SIZE", "5000"))
+AUDIT_ARCHIVE_DIR = Path(os.getenv("AUDIT_ARCHIVE_DIR", "./audit_archive"))
+
 
 def write_audit_log(
     db: Session,
@@ -30,3 +42,176 @@ def write_audit_log(
         db.commit()
     except Exception:
         db.rollback()
+
+
+@dataclass
+class AuditFilters:
+    action: str = ""
+    actor_role: str = ""
+    status: str = ""
+    target_type: str = ""
+    target_id: str = ""
+    since: datetime | None = None
+    until: datetime | None = None
+
+    def as_query_params(self) -> dict[str, str]:
+        params = {
+            "action": self.action,
+            "actor_role": self.actor_role,
+            "status": self.status,
+            "target_type": self.target_type,
+            "target_id": self.target_id,
+            "since": self.since.isoformat() if self.since else "",
+            "until": self.until.isoformat() if self.until else "",
+        }
+        return {key: value for key, value in params.items() if value}
+
+
+def parse_audit_timestamp(value: str | None) -> datetime | None:
+    """Parse a date or ISO datetime into the naive UTC form audit rows are stored in."""
+    cleaned = (value or "").strip()
+    if not cleaned:
+        return None
+    try:
+        parsed = datetime.fromisoformat(cleaned)
+    except ValueError as exc:
+        raise ValueError("timestamps must be ISO formatted (YYYY-MM-DD or YYYY-MM-DDTHH:MM)") from exc
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def filtered_audit_query(db: Session, filters: AuditFilters) -> Query:
+    query = db.query(AuditLog)
+    if filters.action:
+        query = query.filter(AuditLog.action == filters.action)
+    if filters.actor_role:
+        query = query.filter(AuditLog.actor_role == filters.actor_role)
+    if filters.status:
+        query = query.filter(AuditLog.status == filters.status)
+    if filters.target_type:
+        query = query.filter(AuditLog.target_type == filters.target_type)
+    if filters.target_id:
+        query = query.filter(AuditLog.target_id == filters.target_id)
+    if filters.since:
+        query = query.filter(AuditLog.created_at >= filters.since)
+    if filters.until:
+        query = query.filter(AuditLog.created_at < filters.until)
+    return query
+
+
+def audit_log_page(
+    db: Session,
+    filters: AuditFilters,
+    before_id: int = 0,
+    after_id: int = 0,
+    limit: int = AUDIT_PAGE_SIZE,
+) -> tuple[list[AuditLog], dict[str, int | None]]:
+    """Return one newest-first page plus the keyset cursors for older/newer pages."""
+    query = filtered_audit_query(db, filters)
+    if after_id:
+        rows = query.filter(AuditLog.id > after_id).order_by(AuditLog.id.asc()).limit(limit + 1).all()
+        has_newer = len(rows) > limit
+        rows = list(reversed(rows[:limit]))
+        cursors = {
+            "older": rows[-1].id if rows else after_id + 1,
+            "newer": rows[0].id if has_newer else None,
+        }
+        return rows, cursors
+
+    if before_id:
+        query = query.filter(AuditLog.id < before_id)
+    rows = query.order_by(AuditLog.id.desc()).limit(limit + 1).all()
+    has_older = len(rows) > limit
+    rows = rows[:limit]
+    cursors = {
+        "older": rows[-1].id if has_older else None,
+        "newer": rows[0].id if before_id and rows else None,
+    }
+    return rows, cursors
+
+
+def iter_audit_logs(
+    db: Session, filters: AuditFilters, batch_size: int = AUDIT_EXPORT_BATCH_SIZE
+) -> Iterator[AuditLog]:
+    """Yield matching rows oldest-first, walking the table in keyset batches."""
+    last_id = 0
+    while True:
+        rows = (
+            filtered_audit_query(db, filters)
+            .filter(AuditLog.id > last_id)
+            .order_by(AuditLog.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1].id
+        db.expunge_all()
+
+
+def audit_log_to_dict(row: AuditLog) -> dict:
+    try:
+        details = json.loads(row.details) if row.details else {}
+    except ValueError:
+        details = {"raw": row.details}
+    created_at = row.created_at
+    return {
+        "id": row.id,
+        "created_at": created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+        "actor_role": row.actor_role,
+        "actor_label": row.actor_label,
+        "action": row.action,
+        "target_type": row.target_type,
+        "target_id": row.target_id,
+        "status": row.status,
+        "details": details,
+    }
+
+
+def audit_log_ndjson_line(row: AuditLog) -> str:
+    return json.dumps(audit_log_to_dict(row), separators=(",", ":"), sort_keys=True) + "\n"
+
+
+def archive_audit_logs(
+    db: Session,
+    retention_days: int = AUDIT_RETENTION_DAYS,
+    archive_dir: Path = AUDIT_ARCHIVE_DIR,
+    batch_size: int = AUDIT_ARCHIVE_BATCH_SIZE,
+    now: datetime | None = None,
+) -> dict:
+    """Move rows older than the retention window into gzip NDJSON files, then delete them."""
+    cutoff = (now or datetime.now(timezone.utc).replace(tzinfo=None)) - timedelta(days=retention_days)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    archived = 0
+    files: list[str] = []
+    while True:
+        rows = (
+            db.query(AuditLog)
+            .filter(AuditLog.created_at < cutoff)
+            .order_by(AuditLog.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        first_id, last_id = rows[0].id, rows[-1].id
+        path = archive_dir / f"audit-{first_id:012d}-{last_id:012d}.ndjson.gz"
+        tmp_path = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as fh:
+            for row in rows:
+                fh.write(audit_log_ndjson_line(row))
+        os.replace(tmp_path, path)
+
+        # The batch is every pre-cutoff row in [first_id, last_id], so a range delete removes exactly it.
+        db.query(AuditLog).filter(
+            AuditLog.id >= first_id,
+            AuditLog.id <= last_id,
+            AuditLog.created_at < cutoff,
+        ).delete(synchronize_session=False)
+        db.commit()
+        db.expunge_all()
+        archived += len(rows)
+        files.append(path.name)
+    return {"archived": archived, "files": files, "cutoff": cutoff.isoformat()}
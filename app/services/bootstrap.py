@@ -1,68 +1,115 @@
 import json
+import time
 from pathlib import Path
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models import AppUser, Attendee
-from app.services.security import hash_password
+from app.services.directory import reset_attendee_total
+from app.services.security import provision_password_hashes
+from app.services.versions import bump_event_version, ensure_event_counter
 
 
-def _seed_file_path() -> Path:
+def seed_file_path() -> Path:
     return Path(__file__).resolve().parents[2] / "data" / "seed" / "attendees.json"
 
 
-def _ensure_organizer_user(db: Session, organizer_email: str, organizer_password: str):
-    existing = db.query(AppUser).filter(AppUser.email == organizer_email, AppUser.role == "organizer").first()
-    if existing:
-        return
-    db.add(
-        AppUser(
-            email=organizer_email,
-            role="organizer",
-            password_hash=hash_password(organizer_password),
-            failed_attempts=0,
-            locked_until=0,
-        )
+def _record(timings: dict[str, float], stage: str, start: float) -> float:
+    now = time.perf_counter()
+    timings[stage] = round(timings.get(stage, 0.0) + (now - start) * 1000, 2)
+    return now
+
+
+def _ensure_users(
+    db: Session,
+    organizer_email: str,
+    organizer_password: str,
+    attendee_bootstrap_password: str,
+    timings: dict[str, float],
+) -> int:
+    """Provision the organizer and every attendee missing a login in one hashing batch.
+
+    Missing attendee logins come from a single anti-join instead of a SELECT per attendee;
+    hashes run in a process pool and the rows go in with one executemany INSERT. With
+    invite provisioning, attendee passcodes are left unhashed until first use.
+    """
+    start = time.perf_counter()
+    organizer_missing = (
+        db.query(AppUser.id).filter(AppUser.email == organizer_email, AppUser.role == "organizer").first() is None
     )
-    db.commit()
+    missing_ids = [
+        attendee_id
+        for (attendee_id,) in db.query(Attendee.id)
+        .outerjoin(AppUser, AppUser.attendee_id == Attendee.id)
+        .filter(AppUser.id.is_(None))
+        .order_by(Attendee.id.asc())
+    ]
+    start = _record(timings, "find_missing_users", start)
+    if not organizer_missing and not missing_ids:
+        return 0
 
+    entries = [(f"{attendee_bootstrap_password}-{attendee_id}", True) for attendee_id in missing_ids]
+    if organizer_missing:
+        entries.append((organizer_password, False))
+    password_hashes = provision_password_hashes(entries, processes=True)
+    start = _record(timings, "hash_passwords", start)
 
-def _ensure_attendee_users(db: Session, attendee_bootstrap_password: str):
-    attendees = db.query(Attendee).order_by(Attendee.id.asc()).all()
-    for attendee in attendees:
-        existing = (
-            db.query(AppUser).filter(AppUser.attendee_id == attendee.id, AppUser.role == "attendee").first()
-        )
-        if existing:
-            continue
-        db.add(
-            AppUser(
-                email=f"attendee-{attendee.id}@pot.local",
-                role="attendee",
-                attendee_id=attendee.id,
-                password_hash=hash_password(f"{attendee_bootstrap_password}-{attendee.id}"),
-                failed_attempts=0,
-                locked_until=0,
-            )
+    rows = [
+        {
+            "email": f"attendee-{attendee_id}@pot.local",
+            "role": "attendee",
+            "attendee_id": attendee_id,
+            "password_hash": password_hash,
+            "failed_attempts": 0,
+            "locked_until": 0,
+        }
+        for attendee_id, password_hash in zip(missing_ids, password_hashes)
+    ]
+    if organizer_missing:
+        rows.append(
+            {
+                "email": organizer_email,
+                "role": "organizer",
+                "attendee_id": None,
+                "password_hash": password_hashes[-1],
+                "failed_attempts": 0,
+                "locked_until": 0,
+            }
         )
+    db.execute(insert(AppUser), rows)
     db.commit()
+    _record(timings, "insert_users", start)
+    return len(rows)
 
 
 def seed_demo_data_if_empty(
-    db: Session, organizer_email: str, organizer_password: str, attendee_bootstrap_password: str
+    db: Session,
+    organizer_email: str,
+    organizer_password: str,
+    attendee_bootstrap_password: str,
+    timings: dict[str, float] | None = None,
 ) -> bool:
+    """Seed demo attendees into an empty DB and backfill missing logins.
+
+    Per-stage durations in milliseconds are accumulated into ``timings`` when provided.
+    """
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
     attendee_count = db.query(Attendee).count()
+    start = _record(timings, "count_attendees", start)
     if attendee_count > 0:
-        _ensure_organizer_user(db, organizer_email, organizer_password)
-        _ensure_attendee_users(db, attendee_bootstrap_password)
+        _ensure_users(db, organizer_email, organizer_password, attendee_bootstrap_password, timings)
         return False
 
-    seed_path = _seed_file_path()
-    rows = json.loads(seed_path.read_text())
-    for row in rows:
-        db.add(Attendee(**row))
+    rows = json.loads(seed_file_path().read_text())
+    start = _record(timings, "load_seed_file", start)
+    db.execute(insert(Attendee), rows)
+    ensure_event_counter(db)
+    bump_event_version(db)
     db.commit()
+    reset_attendee_total(db)
+    _record(timings, "insert_attendees", start)
 
-    _ensure_organizer_user(db, organizer_email, organizer_password)
-    _ensure_attendee_users(db, attendee_bootstrap_password)
+    _ensure_users(db, organizer_email, organizer_password, attendee_bootstrap_password, timings)
     return True
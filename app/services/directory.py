@@ -0,0 +1,109 @@
+import base64
+import json
+
+from sqlalchemy import tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import AppCounter, Attendee
+
+ATTENDEE_COUNT_KEY = "attendees"
+
+# Only the columns the directory templates render; skips the Text profile fields.
+DIRECTORY_COLUMNS = (Attendee.id, Attendee.name, Attendee.role, Attendee.company, Attendee.primary_goal)
+
+
+def encode_cursor(name: str, attendee_id: int) -> str:
+    raw = json.dumps([name, attendee_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> tuple[str, int] | None:
+    if not cursor or len(cursor) > 512:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, attendee_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode("utf-8"))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(name, str) or not isinstance(attendee_id, int):
+        return None
+    return name, attendee_id
+
+
+def attendee_directory_page(
+    db: Session,
+    after: str | None = None,
+    before: str | None = None,
+    start: str | None = None,
+    limit: int = 100,
+) -> tuple[list, dict[str, str | None]]:
+    """Return one (name, id)-ordered page of directory rows plus keyset cursors.
+
+    ``after``/``before`` are exclusive cursors for the next/previous page; ``start`` is
+    inclusive and re-opens a page at its first row (the ``current`` cursor).
+    """
+    query = db.query(*DIRECTORY_COLUMNS)
+    sort_key = tuple_(Attendee.name, Attendee.id)
+    before_key = decode_cursor(before)
+    after_key = decode_cursor(after)
+    start_key = decode_cursor(start)
+
+    if before_key:
+        rows = (
+            query.filter(sort_key < before_key)
+            .order_by(Attendee.name.desc(), Attendee.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        has_prev = len(rows) > limit
+        rows = list(reversed(rows[:limit]))
+        has_next = True
+    else:
+        if after_key:
+            query = query.filter(sort_key > after_key)
+        elif start_key:
+            query = query.filter(sort_key >= start_key)
+        rows = query.order_by(Attendee.name.asc(), Attendee.id.asc()).limit(limit + 1).all()
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        has_prev = bool(after_key or start_key)
+
+    cursors = {
+        "prev": encode_cursor(rows[0].name, rows[0].id) if rows and has_prev else None,
+        "next": encode_cursor(rows[-1].name, rows[-1].id) if rows and has_next else None,
+        "current": encode_cursor(rows[0].name, rows[0].id) if rows and has_prev else None,
+    }
+    return rows, cursors
+
+
+def adjust_attendee_total(db: Session, delta: int):
+    """Shift the cached total inside the caller's transaction; commit with the write it tracks."""
+    if delta:
+        db.execute(
+            update(AppCounter)
+            .where(AppCounter.name == ATTENDEE_COUNT_KEY)
+            .values(value=AppCounter.value + delta)
+        )
+
+
+def reset_attendee_total(db: Session) -> int:
+    total = db.query(Attendee).count()
+    counter = db.get(AppCounter, ATTENDEE_COUNT_KEY)
+    if counter:
+        counter.value = total
+    else:
+        db.add(AppCounter(name=ATTENDEE_COUNT_KEY, value=total))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker created the counter first; its recount is equally fresh.
+        db.rollback()
+    return total
+
+
+def attendee_total(db: Session) -> int:
+    counter = db.get(AppCounter, ATTENDEE_COUNT_KEY)
+    if counter is None:
+        return reset_attendee_total(db)
+    return max(0, counter.value)
@@ -0,0 +1,87 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from app.database import SessionLocal
+from app.models import EnrichmentCacheEntry
+from app.services.external_enrichment import FetchedSummary
+
+ENRICH_CACHE_TTL_SECONDS = int(os.getenv("ENRICH_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+# Expired entries stay this long so their validators can still turn a refetch into a 304.
+ENRICH_CACHE_RETAIN_SECONDS = int(os.getenv("ENRICH_CACHE_RETAIN_SECONDS", str(7 * 24 * 60 * 60)))
+MAX_ETAG_LENGTH = 280
+MAX_LAST_MODIFIED_LENGTH = 80
+
+
+def _load(url: str) -> EnrichmentCacheEntry | None:
+    db = SessionLocal()
+    try:
+        return db.get(EnrichmentCacheEntry, url)
+    finally:
+        db.close()
+
+
+def _store(url: str, fetched: FetchedSummary, summary: str, now: float, ttl_seconds: int):
+    values = {
+        "summary": summary,
+        # A truncated validator would never match, so oversized ones are dropped instead.
+        "etag": fetched.etag if len(fetched.etag) <= MAX_ETAG_LENGTH else "",
+        "last_modified": fetched.last_modified if len(fetched.last_modified) <= MAX_LAST_MODIFIED_LENGTH else "",
+        "fetched_at": now,
+        "expires_at": now + ttl_seconds,
+    }
+    db = SessionLocal()
+    try:
+        db.query(EnrichmentCacheEntry).filter(
+            EnrichmentCacheEntry.expires_at < now - ENRICH_CACHE_RETAIN_SECONDS, EnrichmentCacheEntry.url != url
+        ).delete(synchronize_session=False)
+        entry = db.get(EnrichmentCacheEntry, url)
+        if entry is None:
+            db.add(EnrichmentCacheEntry(url=url, **values))
+        else:
+            for key, value in values.items():
+                setattr(entry, key, value)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker cached the same URL first; its copy is just as fresh.
+            db.rollback()
+    finally:
+        db.close()
+
+
+class EnrichmentCache:
+    """URL-keyed summary cache with a TTL and ETag/Last-Modified revalidation.
+
+    Fresh entries skip the network; expired ones are revalidated with a conditional
+    request so an unchanged page costs a 304. ``stats`` counts hits (fresh),
+    revalidated (304) and misses (full fetch) for audit details. Concurrent lookups
+    of the same URL wait for the first one instead of fetching it twice.
+    """
+
+    def __init__(self, ttl_seconds: int = ENRICH_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def summary(self, url: str, fetch: Callable[[str, str, str], Awaitable[FetchedSummary]]) -> str:
+        async with self._locks.setdefault(url, asyncio.Lock()):
+            entry = await run_in_threadpool(_load, url)
+            now = time.time()
+            if entry is not None and entry.expires_at > now:
+                self.stats["hits"] += 1
+                return entry.summary
+
+            fetched = await fetch(url, entry.etag if entry else "", entry.last_modified if entry else "")
+            if fetched.not_modified and entry is not None:
+                self.stats["revalidated"] += 1
+                summary = entry.summary
+            else:
+                self.stats["misses"] += 1
+                summary = fetched.summary
+            await run_in_threadpool(_store, url, fetched, summary, now, self.ttl_seconds)
+            return summary
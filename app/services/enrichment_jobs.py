@@ -0,0 +1,296 @@
+import asyncio
+import json
+import os
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+import httpx
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.database import SessionLocal
+from app.models import Attendee, EnrichmentJob
+from app.services.audit import write_audit_log
+from app.services.events import event_broker
+from app.services.external_enrichment import LINKEDIN_ALLOWED_HOSTS
+from app.services.metrics import pid_alive
+from app.services.signals import record_signals
+
+ENRICH_BATCH_CONCURRENCY = int(os.getenv("ENRICH_BATCH_CONCURRENCY", "16"))
+ENRICH_BATCH_MAX_ITEMS = int(os.getenv("ENRICH_BATCH_MAX_ITEMS", "5000"))
+ENRICH_MAX_RETRIES = int(os.getenv("ENRICH_MAX_RETRIES", "2"))
+ENRICH_RETRY_BASE_SECONDS = float(os.getenv("ENRICH_RETRY_BASE_SECONDS", "0.5"))
+ENRICH_WRITE_BATCH_SIZE = int(os.getenv("ENRICH_WRITE_BATCH_SIZE", "50"))
+MAX_SAMPLE_ERRORS = 10
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+ID_QUERY_CHUNK = 500
+
+_running_jobs: set[asyncio.Task] = set()
+_fetch_slots: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+
+
+def fetch_slots() -> asyncio.Semaphore:
+    """The process-wide cap on batch fetches in flight, shared by every running job.
+
+    Like the enrichment client it belongs to the running event loop, so a new loop gets a new one.
+    """
+    global _fetch_slots
+    loop = asyncio.get_running_loop()
+    if _fetch_slots is None or _fetch_slots[0] is not loop:
+        _fetch_slots = (loop, asyncio.Semaphore(max(1, ENRICH_BATCH_CONCURRENCY)))
+    return _fetch_slots[1]
+
+
+@dataclass
+class EnrichmentOutcome:
+    attendee_id: int
+    url: str
+    summary: str = ""
+    error: str = ""
+    retries: int = 0
+
+
+def validate_batch_items(db: Session, items) -> list[tuple[int, str]]:
+    """Normalise (attendee_id, url) pairs, dropping duplicates; raises ValueError on bad input.
+
+    Only the cheap checks happen here; the SSRF guard runs on every fetch and redirect hop.
+    """
+    if len(items) > ENRICH_BATCH_MAX_ITEMS:
+        raise ValueError(f"batch exceeds {ENRICH_BATCH_MAX_ITEMS} items")
+    pairs: list[tuple[int, str]] = []
+    seen: set[tuple[int, str]] = set()
+    for index, item in enumerate(items):
+        url = item.url.strip()
+        parsed = urlparse(url)
+        if parsed.scheme != "https" or not parsed.hostname:
+            raise ValueError(f"item {index}: url must be an https URL")
+        if parsed.hostname.lower() in LINKEDIN_ALLOWED_HOSTS:
+            raise ValueError(f"item {index}: LinkedIn profiles require opt-in; use /v1/enrich/linkedin")
+        if (item.attendee_id, url) not in seen:
+            seen.add((item.attendee_id, url))
+            pairs.append((item.attendee_id, url))
+
+    wanted = sorted({attendee_id for attendee_id, _ in pairs})
+    known: set[int] = set()
+    for start in range(0, len(wanted), ID_QUERY_CHUNK):
+        chunk = wanted[start : start + ID_QUERY_CHUNK]
+        known.update(attendee_id for (attendee_id,) in db.query(Attendee.id).filter(Attendee.id.in_(chunk)))
+    missing = [attendee_id for attendee_id in wanted if attendee_id not in known]
+    if missing:
+        raise ValueError(f"unknown attendee ids: {missing[:10]}")
+    return pairs
+
+
+def enrichment_job_to_dict(job: EnrichmentJob) -> dict:
+    end = job.finished_at or time.time()
+    elapsed = max(0.0, end - job.started_at) if job.started_at else 0.0
+    processed = job.succeeded + job.failed
+    return {
+        "id": job.id,
+        "status": job.status,
+        "total": job.total,
+        "processed": processed,
+        "succeeded": job.succeeded,
+        "failed": job.failed,
+        "retries": job.retries,
+        "progress": round(processed / job.total, 3) if job.total else 0.0,
+        "items_per_second": round(processed / elapsed, 1) if elapsed > 0 else 0.0,
+        "errors": json.loads(job.errors or "[]"),
+        "error": job.error,
+    }
+
+
+def create_enrichment_job(db: Session, total: int, actor_label: str) -> EnrichmentJob:
+    job = EnrichmentJob(status="queued", total=total, actor_label=actor_label, worker_pid=os.getpid())
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+async def _fetch_with_retry(
+    fetch_summary: Callable[[str], Awaitable[str]],
+    attendee_id: int,
+    url: str,
+    slots: asyncio.Semaphore,
+) -> EnrichmentOutcome:
+    outcome = EnrichmentOutcome(attendee_id=attendee_id, url=url)
+    for attempt in range(ENRICH_MAX_RETRIES + 1):
+        try:
+            async with slots:
+                outcome.summary = await fetch_summary(url)
+            return outcome
+        except Exception as exc:
+            if attempt == ENRICH_MAX_RETRIES or not _is_retryable(exc):
+                outcome.error = (str(exc) or exc.__class__.__name__)[:180]
+                return outcome
+        outcome.retries += 1
+        # Backoff happens outside the global slot so waiting retries do not block fresh work.
+        await asyncio.sleep(ENRICH_RETRY_BASE_SECONDS * (2**attempt) * (0.5 + random.random()))
+    return outcome
+
+
+def _write_batch(job_id: int, outcomes: list[EnrichmentOutcome]):
+    """Persist one batch of results and the job counters in a single transaction."""
+    db = SessionLocal()
+    try:
+        fetched = [outcome for outcome in outcomes if not outcome.error]
+        attendees = {}
+        if fetched:
+            ids = {outcome.attendee_id for outcome in fetched}
+            attendees = {row.id: row for row in db.query(Attendee).filter(Attendee.id.in_(ids))}
+        for outcome in fetched:
+            if outcome.attendee_id not in attendees:
+                outcome.error = "attendee no longer exists"
+        stored = [outcome for outcome in fetched if not outcome.error]
+        record_signals(
+            db,
+            attendees,
+            [(outcome.attendee_id, "company_website", outcome.url, outcome.summary) for outcome in stored],
+        )
+
+        job = db.get(EnrichmentJob, job_id)
+        job.succeeded += len(stored)
+        job.failed += len(outcomes) - len(stored)
+        job.retries += sum(outcome.retries for outcome in outcomes)
+        errors = json.loads(job.errors or "[]")
+        for outcome in outcomes:
+            if outcome.error and len(errors) < MAX_SAMPLE_ERRORS:
+                errors.append(f"attendee {outcome.attendee_id} {outcome.url}: {outcome.error}")
+        job.errors = json.dumps(errors)
+        db.commit()
+        if stored:
+            event_broker.publish_all("matches_updated", {"reason": "signals"})
+    finally:
+        db.close()
+
+
+def _set_status(
+    job_id: int, status: str, user: dict | None = None, error: str = "", extra_details: dict | None = None
+):
+    db = SessionLocal()
+    try:
+        job = db.get(EnrichmentJob, job_id)
+        job.status = status
+        if status == "running":
+            job.started_at = time.time()
+        else:
+            job.finished_at = time.time()
+            job.error = error[:280]
+        db.commit()
+        if status != "running":
+            details = {
+                "job_id": job_id,
+                "total": job.total,
+                "succeeded": job.succeeded,
+                "failed": job.failed,
+                "retries": job.retries,
+            }
+            details.update(extra_details or {})
+            if error:
+                details["error"] = error[:180]
+            audit_status = "success" if status == "completed" else "failed"
+            write_audit_log(db, user, "batch_enrichment", "enrichment_job", str(job_id), audit_status, details)
+    finally:
+        db.close()
+
+
+async def run_enrichment_job(
+    job_id: int,
+    items: list[tuple[int, str]],
+    fetch_summary: Callable[[str], Awaitable[str]],
+    user: dict | None = None,
+    audit_details: dict | None = None,
+):
+    """Fetch every item with a bounded set of workers and write results back in batches.
+
+    Workers pull items from a queue and share the process-wide ``fetch_slots``, so
+    concurrent jobs split ENRICH_BATCH_CONCURRENCY rather than each getting their own.
+    ``audit_details`` is read when the job finishes, so live counters (cache stats) can be passed in.
+    """
+    await run_in_threadpool(_set_status, job_id, "running")
+    todo: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+    for item in items:
+        todo.put_nowait(item)
+    done: asyncio.Queue[EnrichmentOutcome] = asyncio.Queue()
+    slots = fetch_slots()
+
+    async def worker():
+        while not todo.empty():
+            attendee_id, url = todo.get_nowait()
+            try:
+                outcome = await _fetch_with_retry(fetch_summary, attendee_id, url, slots)
+            except Exception as exc:
+                # Every item must post an outcome, or the loop below would wait for it forever.
+                error = (str(exc) or exc.__class__.__name__)[:180]
+                outcome = EnrichmentOutcome(attendee_id=attendee_id, url=url, error=error)
+            await done.put(outcome)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(max(1, ENRICH_BATCH_CONCURRENCY), len(items)))]
+    status, error = "completed", ""
+    try:
+        pending: list[EnrichmentOutcome] = []
+        for _ in range(len(items)):
+            pending.append(await done.get())
+            if len(pending) >= ENRICH_WRITE_BATCH_SIZE:
+                await run_in_threadpool(_write_batch, job_id, pending)
+                pending = []
+        if pending:
+            await run_in_threadpool(_write_batch, job_id, pending)
+    except asyncio.CancelledError:
+        status, error = "cancelled", "server shutting down"
+        raise
+    except Exception as exc:
+        status, error = "failed", str(exc)
+    finally:
+        for task in workers:
+            task.cancel()
+        await run_in_threadpool(_set_status, job_id, status, user, error, audit_details)
+
+
+def start_enrichment_job(
+    job_id: int,
+    items: list[tuple[int, str]],
+    fetch_summary: Callable[[str], Awaitable[str]],
+    user: dict | None = None,
+    audit_details: dict | None = None,
+) -> asyncio.Task:
+    task = asyncio.create_task(run_enrichment_job(job_id, items, fetch_summary, user, audit_details))
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+    return task
+
+
+def recover_enrichment_jobs(db: Session) -> int:
+    """Fail jobs whose worker is gone, so they stop reporting progress and can be started again.
+
+    Jobs run as tasks on their worker's event loop, so a restart or crash leaves them
+    queued or running for good. Run at startup; jobs held by other live workers are kept.
+    """
+    now = time.time()
+    failed = 0
+    for job in db.query(EnrichmentJob).filter(EnrichmentJob.status.in_(("queued", "running"))):
+        if job.worker_pid and job.worker_pid != os.getpid() and pid_alive(job.worker_pid):
+            continue
+        job.status = "failed"
+        job.error = "interrupted by a server restart; start the batch again"
+        job.finished_at = now
+        failed += 1
+    db.commit()
+    return failed
+
+
+async def cancel_enrichment_jobs():
+    tasks = list(_running_jobs)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,107 @@
+import asyncio
+import itertools
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+
+EVENT_STREAM_MAX_CONNECTIONS = int(os.getenv("EVENT_STREAM_MAX_CONNECTIONS", "200"))
+EVENT_STREAM_HEARTBEAT_SECONDS = float(os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "15"))
+EVENT_STREAM_QUEUE_SIZE = int(os.getenv("EVENT_STREAM_QUEUE_SIZE", "32"))
+EVENT_STREAM_RETRY_MS = 5000
+
+
+class StreamLimitReached(Exception):
+    pass
+
+
+@dataclass(eq=False)
+class Subscription:
+    attendee_id: int
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=EVENT_STREAM_QUEUE_SIZE))
+    dropped: int = 0
+
+    def deliver(self, event: dict):
+        # Runs on the subscriber's loop; a slow client loses its oldest events, not the newest.
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class EventBroker:
+    """In-process pub/sub keyed by attendee id, for this worker's SSE connections.
+
+    ``publish`` may be called from any thread (sync routes run in the threadpool);
+    delivery hops onto each subscriber's event loop. Events are not shared across
+    workers or replayed, so clients treat them as hints to refetch.
+    """
+
+    def __init__(self, max_connections: int = EVENT_STREAM_MAX_CONNECTIONS):
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._connections = 0
+        self._ids = itertools.count(1)
+        self.published = 0
+        self.rejected = 0
+
+    def subscribe(self, attendee_id: int) -> Subscription:
+        subscription = Subscription(attendee_id=attendee_id, loop=asyncio.get_running_loop())
+        with self._lock:
+            if self._connections >= self.max_connections:
+                self.rejected += 1
+                raise StreamLimitReached(f"event stream limit of {self.max_connections} reached")
+            self._connections += 1
+            self._subscribers.setdefault(attendee_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.attendee_id)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.attendee_id]
+            self._connections -= 1
+
+    def publish(self, attendee_id: int, event_type: str, data: dict | None = None):
+        with self._lock:
+            subscribers = list(self._subscribers.get(attendee_id, ()))
+        self._deliver(subscribers, event_type, data)
+
+    def publish_all(self, event_type: str, data: dict | None = None):
+        """Send to every connected attendee, for writes that can move anyone's matches."""
+        with self._lock:
+            subscribers = [subscription for group in self._subscribers.values() for subscription in group]
+        self._deliver(subscribers, event_type, data)
+
+    def _deliver(self, subscribers: list[Subscription], event_type: str, data: dict | None):
+        with self._lock:
+            self.published += 1
+            event = {"id": next(self._ids), "event": event_type, "data": data or {}}
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop already closed; its stream cleanup will unsubscribe it.
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "connections": self._connections,
+                "max_connections": self.max_connections,
+                "attendees": len(self._subscribers),
+                "published": self.published,
+                "rejected": self.rejected,
+            }
+
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'], separators=(',', ':'))}\n\n"
+
+
+event_broker = EventBroker()
@@ -1,13 +1,192 @@
-import re
+import asyncio
+import codecs
+import contextlib
+import os
 import ipaddress
 import socket
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from html.parser import HTMLParser
 from urllib.parse import urljoin, urlparse
 
 import httpx
+import httpcore
 
 MAX_HTML_BYTES = 1_500_000
+MAX_BODY_TEXT_CHARS = 800
+MAX_SUMMARY_CHARS = 1500
 MAX_REDIRECTS = 3
 LINKEDIN_ALLOWED_HOSTS = {"linkedin.com", "www.linkedin.com"}
+ENRICH_TIMEOUT_SECONDS = float(os.getenv("ENRICH_TIMEOUT_SECONDS", "6"))
+ENRICH_MAX_CONNECTIONS = int(os.getenv("ENRICH_MAX_CONNECTIONS", "20"))
+ENRICH_MAX_PER_HOST = int(os.getenv("ENRICH_MAX_PER_HOST", "4"))
+ENRICH_KEEPALIVE_SECONDS = float(os.getenv("ENRICH_KEEPALIVE_SECONDS", "30"))
+ENRICH_DNS_TTL_SECONDS = float(os.getenv("ENRICH_DNS_TTL_SECONDS", "60"))
+ENRICH_DNS_CACHE_SIZE = int(os.getenv("ENRICH_DNS_CACHE_SIZE", "1024"))
+
+
+class ResolutionCache:
+    """Bounded LRU of host:port -> public IPs, validated once when the entry is created.
+
+    getaddrinfo does not expose record TTLs, so entries live for a fixed TTL
+    (ENRICH_DNS_TTL_SECONDS). Resolutions that include a non-public address raise
+    and are never stored.
+    """
+
+    def __init__(self, ttl_seconds: float = ENRICH_DNS_TTL_SECONDS, max_entries: int = ENRICH_DNS_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.stats = {"hits": 0, "misses": 0}
+        self._entries: OrderedDict[tuple[str, int], tuple[float, tuple[str, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, host: str, port: int) -> tuple[str, ...] | None:
+        key = (host.lower(), port)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def resolve(self, host: str, port: int) -> tuple[str, ...]:
+        """Return validated public IPs for host, resolving (blocking) on a cache miss."""
+        cached = self.lookup(host, port)
+        if cached is not None:
+            return cached
+        try:
+            infos = socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)
+        except socket.gaierror as exc:
+            raise ValueError(f"Hostname resolution failed: {exc}") from exc
+        addresses: list[str] = []
+        for info in infos:
+            ip = ipaddress.ip_address(info[4][0])
+            if ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved or ip.is_multicast:
+                raise ValueError("Target resolves to non-public network")
+            if str(ip) not in addresses:
+                addresses.append(str(ip))
+        if not addresses:
+            raise ValueError("Hostname resolution failed: no addresses")
+        with self._lock:
+            self.stats["misses"] += 1
+            self._entries[(host.lower(), port)] = (time.monotonic() + self.ttl_seconds, tuple(addresses))
+            self._entries.move_to_end((host.lower(), port))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return tuple(addresses)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+dns_cache = ResolutionCache()
+
+
+class _PinnedNetworkBackend(httpcore.AsyncNetworkBackend):
+    """Connects only to addresses the SSRF guard validated for the request's host.
+
+    httpcore still passes the original hostname for TLS SNI and certificate checks,
+    so pinning the TCP connection changes where we connect, not who we verify.
+    """
+
+    def __init__(self, resolver: ResolutionCache):
+        self.resolver = resolver
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        addresses = self.resolver.lookup(host, port) or await asyncio.to_thread(self.resolver.resolve, host, port)
+        last_error: Exception | None = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                last_error = exc
+        raise last_error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise httpcore.ConnectError("Unix sockets are not allowed for enrichment")
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+class PinnedTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, limits: httpx.Limits, resolver: ResolutionCache | None = None):
+        super().__init__(limits=limits)
+        # AsyncHTTPTransport has no network_backend argument, so the pool is rebuilt with one.
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=_PinnedNetworkBackend(resolver or dns_cache),
+        )
+
+
+class EnrichmentClient:
+    """Shared AsyncClient with keep-alive pooling plus a per-host concurrency cap.
+
+    Create it inside the event loop that will use it (the app lifespan); asyncio
+    primitives and pooled connections are bound to that loop.
+    """
+
+    def __init__(
+        self,
+        timeout: float = ENRICH_TIMEOUT_SECONDS,
+        max_connections: int = ENRICH_MAX_CONNECTIONS,
+        max_per_host: int = ENRICH_MAX_PER_HOST,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.loop = asyncio.get_running_loop()
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=ENRICH_KEEPALIVE_SECONDS,
+        )
+        self.http = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=False,
+            # Environment proxies would resolve the host themselves and bypass the pinned transport.
+            trust_env=False,
+            transport=transport or PinnedTransport(limits),
+        )
+        self.max_per_host = max(1, max_per_host)
+        # host -> [semaphore, holders and waiters]; an entry is dropped once nobody uses it.
+        self._host_slots: dict[str, list] = {}
+
+    @contextlib.asynccontextmanager
+    async def host_slot(self, host: str):
+        entry = self._host_slots.get(host)
+        if entry is None:
+            entry = self._host_slots[host] = [asyncio.Semaphore(self.max_per_host), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._host_slots[host]
+
+    async def aclose(self):
+        await self.http.aclose()
+
+
+@dataclass
+class FetchedSummary:
+    summary: str
+    etag: str = ""
+    last_modified: str = ""
+    not_modified: bool = False
 
 
 def _collapse(text: str) -> str:
@@ -26,18 +205,22 @@ def _validate_public_https_url(url: str):
     if host in blocked_hosts:
         raise ValueError("Local addresses are blocked")
 
-    # SSRF guard: reject private/reserved destination IPs.
-    try:
-        infos = socket.getaddrinfo(host, parsed.port or 443, proto=socket.IPPROTO_TCP)
-    except socket.gaierror as exc:
-        raise ValueError(f"Hostname resolution failed: {exc}") from exc
-    for info in infos:
-        ip = ipaddress.ip_address(info[4][0])
-        if ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved or ip.is_multicast:
-            raise ValueError("Target resolves to non-public network")
+    # SSRF guard: reject private/reserved destination IPs. The validated addresses are
+    # cached and are the only ones the pinned transport will connect to.
+    dns_cache.resolve(host, parsed.port or 443)
     return parsed
 
 
+async def _validate_url(url: str, validate=None):
+    """Run an SSRF check, skipping the worker-thread hop when the host is already cached."""
+    validate = validate or _validate_public_https_url
+    parsed = urlparse(url)
+    if parsed.hostname and dns_cache.lookup(parsed.hostname, parsed.port or 443) is not None:
+        return validate(url)
+    # getaddrinfo blocks, so uncached resolutions run off the event loop.
+    return await asyncio.to_thread(validate, url)
+
+
 def _validate_linkedin_profile_url(url: str):
     parsed = _validate_public_https_url(url)
     host = (parsed.hostname or "").lower()
@@ -49,69 +232,167 @@ def _validate_linkedin_profile_url(url: str):
     return parsed
 
 
-def _fetch_limited_html(client: httpx.Client, url: str) -> str:
+class _SummaryParser(HTMLParser):
+    """Incremental extractor for title, meta/og descriptions and the first visible body text.
+
+    Chunks are fed as they arrive; ``done`` turns true once the body has yielded
+    enough text, so the caller can stop downloading the rest of the page.
+    """
+
+    SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title_parts: list[str] = []
+        self.meta_desc = ""
+        self.og_desc = ""
+        self.text_parts: list[str] = []
+        self.text_length = 0
+        self.in_body = False
+        self._in_title = False
+        self._skip_depth = 0
+
+    @property
+    def done(self) -> bool:
+        return self.in_body and self.text_length >= MAX_BODY_TEXT_CHARS
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "body":
+            self.in_body = True
+        elif tag == "meta":
+            self._handle_meta(dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == "meta":
+            self._handle_meta(dict(attrs))
+        elif tag == "body":
+            self.in_body = True
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "title":
+            self._in_title = False
+        elif tag == "head":
+            # Pages that omit <body> still count as in the body once the head closes.
+            self.in_body = True
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self.title_parts.append(data)
+            return
+        if self.text_length >= MAX_BODY_TEXT_CHARS:
+            return
+        text = _collapse(data)
+        if text:
+            self.text_parts.append(text)
+            self.text_length += len(text) + 1
+
+    def _handle_meta(self, attrs: dict):
+        content = _collapse(attrs.get("content") or "")
+        if (attrs.get("name") or "").lower() == "description" and not self.meta_desc:
+            self.meta_desc = content
+        elif (attrs.get("property") or "").lower() == "og:description" and not self.og_desc:
+            self.og_desc = content
+
+    def summary(self) -> str:
+        title = _collapse("".join(self.title_parts))
+        body_text = " ".join(self.text_parts)[:MAX_BODY_TEXT_CHARS]
+        parts = [part for part in [title, self.meta_desc, self.og_desc, body_text] if part]
+        return " | ".join(parts)[:MAX_SUMMARY_CHARS]
+
+
+async def _fetch_summary(
+    client: EnrichmentClient, url: str, headers: dict[str, str] | None = None
+) -> tuple[str | None, httpx.Headers]:
+    """Return (summary, response headers); summary is None when a conditional request got 304.
+
+    The body is parsed while it streams and the download stops as soon as the parser
+    has enough, so most pages are never read to the end.
+    """
     current_url = url
     for _ in range(MAX_REDIRECTS + 1):
-        _validate_public_https_url(current_url)
-        with client.stream("GET", current_url, follow_redirects=False) as resp:
-            status = resp.status_code
-            if status in {301, 302, 303, 307, 308}:
-                location = resp.headers.get("location")
-                if not location:
-                    raise ValueError("Redirect without location header")
-                current_url = urljoin(current_url, location)
-                continue
-            resp.raise_for_status()
-            content_type = (resp.headers.get("content-type") or "").lower()
-            if "text/html" not in content_type and "application/xhtml+xml" not in content_type:
-                raise ValueError("URL did not return HTML content")
-            chunks: list[bytes] = []
-            total = 0
-            for chunk in resp.iter_bytes():
-                total += len(chunk)
-                if total > MAX_HTML_BYTES:
-                    raise ValueError("HTML response exceeded size limit")
-                chunks.append(chunk)
-            return b"".join(chunks).decode(resp.encoding or "utf-8", errors="ignore")
+        parsed = await _validate_url(current_url)
+        async with client.host_slot(parsed.hostname.lower()):
+            async with client.http.stream("GET", current_url, headers=headers) as resp:
+                status = resp.status_code
+                if status == 304 and headers:
+                    return None, resp.headers
+                if status in {301, 302, 303, 307, 308}:
+                    location = resp.headers.get("location")
+                    if not location:
+                        raise ValueError("Redirect without location header")
+                    current_url = urljoin(current_url, location)
+                    continue
+                resp.raise_for_status()
+                content_type = (resp.headers.get("content-type") or "").lower()
+                if "text/html" not in content_type and "application/xhtml+xml" not in content_type:
+                    raise ValueError("URL did not return HTML content")
+                try:
+                    decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="ignore")
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+                parser = _SummaryParser()
+                total = 0
+                async for chunk in resp.aiter_bytes():
+                    total += len(chunk)
+                    if total > MAX_HTML_BYTES:
+                        raise ValueError("HTML response exceeded size limit")
+                    parser.feed(decoder.decode(chunk))
+                    if parser.done:
+                        break
+                else:
+                    parser.feed(decoder.decode(b"", final=True))
+                    parser.close()
+                return parser.summary(), resp.headers
     raise ValueError("Too many redirects")
 
 
 def _extract_summary_from_html(html: str) -> str:
-    title_match = re.search(r"<title[^>]*>(.*?)</title>", html, flags=re.IGNORECASE | re.DOTALL)
-    title = _collapse(title_match.group(1)) if title_match else ""
+    parser = _SummaryParser()
+    parser.feed(html)
+    parser.close()
+    return parser.summary()
 
-    meta_desc_match = re.search(
-        r'<meta[^>]+name=[\"\']description[\"\'][^>]+content=[\"\'](.*?)[\"\']',
-        html,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    meta_desc = _collapse(meta_desc_match.group(1)) if meta_desc_match else ""
 
-    og_desc_match = re.search(
-        r'<meta[^>]+property=[\"\']og:description[\"\'][^>]+content=[\"\'](.*?)[\"\']',
-        html,
-        flags=re.IGNORECASE | re.DOTALL,
+async def fetch_company_summary(
+    client: EnrichmentClient, url: str, etag: str = "", last_modified: str = ""
+) -> FetchedSummary:
+    """Fetch and summarise a company page, revalidating with the given validators when set."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    # _fetch_summary validates the URL and every redirect hop itself.
+    summary, response_headers = await _fetch_summary(client, url, headers or None)
+    if summary is not None:
+        # A new body is only described by the validators sent with it, blanks included.
+        return FetchedSummary(
+            summary=summary,
+            etag=response_headers.get("etag", ""),
+            last_modified=response_headers.get("last-modified", ""),
+        )
+    # A 304 may refresh the validators; otherwise the cached body keeps the ones it had.
+    return FetchedSummary(
+        summary="",
+        etag=response_headers.get("etag", "") or etag,
+        last_modified=response_headers.get("last-modified", "") or last_modified,
+        not_modified=True,
     )
-    og_desc = _collapse(og_desc_match.group(1)) if og_desc_match else ""
-
-    body_text = re.sub(r"<script.*?>.*?</script>", " ", html, flags=re.IGNORECASE | re.DOTALL)
-    body_text = re.sub(r"<style.*?>.*?</style>", " ", body_text, flags=re.IGNORECASE | re.DOTALL)
-    body_text = re.sub(r"<[^>]+>", " ", body_text)
-    body_text = _collapse(body_text)[:800]
-
-    parts = [part for part in [title, meta_desc, og_desc, body_text] if part]
-    return " | ".join(parts)[:1500]
 
 
-def extract_company_summary(url: str, timeout: float = 6.0) -> str:
-    _validate_public_https_url(url)
-    with httpx.Client(timeout=timeout, follow_redirects=False) as client:
-        html = _fetch_limited_html(client, url)
-    return _extract_summary_from_html(html)
+async def extract_company_summary(client: EnrichmentClient, url: str) -> str:
+    return (await fetch_company_summary(client, url)).summary
 
 
-def extract_linkedin_summary(url: str, timeout: float = 6.0) -> str:
-    _validate_linkedin_profile_url(url)
-    with httpx.Client(timeout=timeout, follow_redirects=False) as client:
-        html = _fetch_limited_html(client, url)
-    return _extract_summary_from_html(html)
+async def extract_linkedin_summary(client: EnrichmentClient, url: str) -> str:
+    await _validate_url(url, _validate_linkedin_profile_url)
+    summary, _headers = await _fetch_summary(client, url)
+    return summary or ""
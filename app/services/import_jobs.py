@@ -0,0 +1,345 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import ImportJob
+from app.services.attendee_import import ImportReport, run_attendee_import
+from app.services.audit import write_audit_log
+from app.services.events import event_broker
+from app.services.metrics import pid_alive
+
+IMPORT_SPOOL_DIR = Path(os.getenv("IMPORT_SPOOL_DIR", str(Path(tempfile.gettempdir()) / "pot-imports")))
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", "1"))
+IMPORT_JOB_CHUNK_ROWS = int(os.getenv("IMPORT_JOB_CHUNK_ROWS", "500"))
+IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", "50000"))
+IMPORT_MAX_ROW_BYTES = 64 * 1024
+SPOOL_CHUNK_BYTES = 1024 * 1024
+JSON_READ_CHUNK_CHARS = 64 * 1024
+# Spool files older than this that no queued or running job owns are deleted at startup.
+ORPHAN_SPOOL_SECONDS = 15 * 60
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+class _CountingReader(io.RawIOBase):
+    """Raw byte reader that records how far the parser has consumed the spooled file."""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._raw.readinto(buffer)
+        self.bytes_read += count or 0
+        return count
+
+    def close(self):
+        self._raw.close()
+        super().close()
+
+
+class _JsonStream:
+    """Incremental JSON reader that decodes one value at a time from a text stream."""
+
+    def __init__(self, fh):
+        self._fh = fh
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        data = self._fh.read(JSON_READ_CHUNK_CHARS)
+        if not data:
+            self._eof = True
+            return
+        self._buf = self._buf[self._pos :] + data
+        self._pos = 0
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if self._eof:
+                return ""
+            self._fill()
+
+    def expect(self, char: str, message: str):
+        if self.peek() != char:
+            raise ValueError(message)
+        self._pos += 1
+
+    def decode_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                if len(self._buf) - self._pos > IMPORT_MAX_ROW_BYTES:
+                    raise ValueError(f"json row exceeds {IMPORT_MAX_ROW_BYTES} bytes") from None
+                self._fill()
+                continue
+            # A number ending exactly at the buffer edge may continue in the next chunk.
+            if end == len(self._buf) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_json_array(stream: _JsonStream) -> Iterator[object]:
+    stream.expect("[", "json attendees must be a list")
+    if stream.peek() == "]":
+        return
+    while True:
+        yield stream.decode_value()
+        separator = stream.peek()
+        if separator == ",":
+            stream.expect(",", "malformed json array")
+            continue
+        stream.expect("]", "malformed json array")
+        return
+
+
+def iter_json_rows(fh) -> Iterator[object]:
+    """Yield attendee rows from a top-level list or an object with attendees[], one at a time."""
+    stream = _JsonStream(fh)
+    first = stream.peek()
+    if first == "[":
+        yield from _iter_json_array(stream)
+        return
+    if first != "{":
+        raise ValueError("json payload must be a list or an object with attendees[]")
+    stream.expect("{", "malformed json object")
+    while stream.peek() not in {"}", ""}:
+        key = stream.decode_value()
+        stream.expect(":", "malformed json object")
+        if key == "attendees":
+            yield from _iter_json_array(stream)
+            return
+        stream.decode_value()
+        if stream.peek() == ",":
+            stream.expect(",", "malformed json object")
+
+
+def iter_csv_rows(fh) -> Iterator[dict]:
+    reader = csv.DictReader(fh)
+    if not reader.fieldnames:
+        raise ValueError("csv header is required")
+    yield from reader
+
+
+async def spool_upload(upload_file, max_bytes: int) -> tuple[Path, int]:
+    """Copy an upload to the spool directory in fixed-size chunks, enforcing the size cap."""
+    IMPORT_SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+    suffix = Path(upload_file.filename or "").suffix.lower()
+    fd, raw_path = tempfile.mkstemp(prefix="import-", suffix=suffix, dir=IMPORT_SPOOL_DIR)
+    path = Path(raw_path)
+    total = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await upload_file.read(SPOOL_CHUNK_BYTES)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if total > max_bytes:
+                    raise ValueError(f"import file exceeds {max_bytes} bytes")
+                out.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path, total
+
+
+def import_job_to_dict(job: ImportJob) -> dict:
+    end = job.finished_at or time.time()
+    elapsed = max(0.0, end - job.started_at) if job.started_at else 0.0
+    return {
+        "id": job.id,
+        "filename": job.filename,
+        "status": job.status,
+        "rows_processed": job.rows_processed,
+        "created": job.created_count,
+        "failed": job.failed_count,
+        "rows_per_second": round(job.rows_processed / elapsed, 1) if elapsed > 0 else 0.0,
+        "bytes_processed": job.bytes_processed,
+        "bytes_total": job.bytes_total,
+        "progress": round(job.bytes_processed / job.bytes_total, 3) if job.bytes_total else 0.0,
+        "errors": json.loads(job.errors or "[]"),
+        "timings_ms": json.loads(job.timings or "{}"),
+        "error": job.error,
+    }
+
+
+def create_import_job(
+    db: Session, filename: str, bytes_total: int, actor_label: str, spool_path: Path | None = None
+) -> ImportJob:
+    job = ImportJob(
+        filename=filename,
+        status="queued",
+        bytes_total=bytes_total,
+        actor_label=actor_label,
+        worker_pid=os.getpid(),
+        spool_path=str(spool_path or ""),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _save_progress(db: Session, job: ImportJob, report: ImportReport, bytes_processed: int):
+    job.rows_processed = report.total
+    job.created_count = report.created
+    job.failed_count = report.failed
+    job.bytes_processed = min(bytes_processed, job.bytes_total)
+    job.errors = json.dumps(report.sample_errors)
+    job.timings = json.dumps(report.timings_ms, sort_keys=True)
+    db.commit()
+
+
+def _import_spooled_file(
+    db: Session,
+    job: ImportJob,
+    path: Path,
+    parse_row: Callable[[dict], dict],
+    bootstrap_password: str,
+    report: ImportReport,
+):
+    counting = _CountingReader(open(path, "rb"))
+    try:
+        with io.TextIOWrapper(io.BufferedReader(counting), encoding="utf-8", newline="") as fh:
+            if path.suffix.lower() == ".json":
+                numbered = enumerate(iter_json_rows(fh), start=1)
+            else:
+                numbered = enumerate(iter_csv_rows(fh), start=2)
+            while True:
+                with report.timed("parse"):
+                    chunk = list(islice(numbered, IMPORT_JOB_CHUNK_ROWS))
+                if not chunk:
+                    break
+                if report.total + len(chunk) > IMPORT_MAX_ROWS:
+                    raise ValueError(f"import exceeds max rows ({IMPORT_MAX_ROWS}); earlier rows were imported")
+                run_attendee_import(db, chunk, parse_row, bootstrap_password, report)
+                _save_progress(db, job, report, counting.bytes_read)
+    except UnicodeDecodeError as exc:
+        raise ValueError("file must be utf-8 encoded") from exc
+    if report.total == 0:
+        raise ValueError("import payload contains no attendee rows")
+
+
+def process_import_job(
+    job_id: int,
+    path: Path,
+    parse_row: Callable[[dict], dict],
+    bootstrap_password: str,
+    user: dict | None = None,
+):
+    """Parse the spooled file incrementally and import it chunk by chunk, saving progress as it goes."""
+    db = SessionLocal()
+    report = ImportReport()
+    try:
+        job = db.get(ImportJob, job_id)
+        if job is None or job.status != "queued":
+            return
+        job.status = "running"
+        job.started_at = time.time()
+        db.commit()
+
+        try:
+            _import_spooled_file(db, job, path, parse_row, bootstrap_password, report)
+            job.status = "completed"
+            status = "success"
+        except Exception as exc:
+            db.rollback()
+            job.status = "failed"
+            job.error = str(exc)[:280]
+            status = "failed"
+        job.finished_at = time.time()
+        _save_progress(db, job, report, job.bytes_total if status == "success" else job.bytes_processed)
+        if report.created:
+            event_broker.publish_all("matches_updated", {"reason": "attendees_imported"})
+
+        details = {
+            "job_id": job_id,
+            "filename": job.filename,
+            "created": report.created,
+            "failed": report.failed,
+            "total": report.total,
+            "errors": report.sample_errors,
+            "timings_ms": report.timings_ms,
+        }
+        if job.error:
+            details["error"] = job.error[:180]
+        write_audit_log(db, user, "bulk_import_attendees", "attendee_import", str(job_id), status, details)
+    finally:
+        path.unlink(missing_ok=True)
+        db.close()
+
+
+def submit_import_job(
+    job_id: int,
+    path: Path,
+    parse_row: Callable[[dict], dict],
+    bootstrap_password: str,
+    user: dict | None = None,
+):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=IMPORT_JOB_WORKERS, thread_name_prefix="import-job")
+    _executor.submit(process_import_job, job_id, path, parse_row, bootstrap_password, user)
+
+
+def recover_import_jobs(db: Session) -> dict[str, int]:
+    """Fail jobs whose worker is gone and delete spool files no live job reads.
+
+    Jobs only live in their worker's in-memory executor, so a restart or crash
+    leaves them queued or running for good. Run at startup, before this process
+    has queued anything of its own; jobs held by other running workers are kept.
+    """
+    now = time.time()
+    failed = 0
+    live_spools: set[str] = set()
+    for job in db.query(ImportJob).filter(ImportJob.status.in_(("queued", "running"))):
+        if job.worker_pid and job.worker_pid != os.getpid() and pid_alive(job.worker_pid):
+            live_spools.add(job.spool_path)
+            continue
+        job.status = "failed"
+        job.error = "interrupted by a server restart; upload the file again"
+        job.finished_at = now
+        failed += 1
+    db.commit()
+
+    removed = 0
+    if IMPORT_SPOOL_DIR.is_dir():
+        for path in IMPORT_SPOOL_DIR.glob("import-*"):
+            try:
+                # Uploads still being spooled have no job yet but were written to recently.
+                if str(path) in live_spools or now - path.stat().st_mtime < ORPHAN_SPOOL_SECONDS:
+                    continue
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+    return {"failed_jobs": failed, "removed_spools": removed}
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 
 from app.models import IntroRequest
+from app.services.events import event_broker
 
 
 def create_intro_request(db: Session, requester_id: int, candidate_id: int, note: str = "") -> IntroRequest:
@@ -24,6 +25,7 @@ def create_intro_request(db: Session, requester_id: int, candidate_id: int, note
     db.add(row)
     db.commit()
     db.refresh(row)
+    event_broker.publish(candidate_id, "intro_created", {"intro_id": row.id, "requester_id": requester_id})
     return row
 
 
@@ -44,4 +46,6 @@ def update_intro_request(db: Session, intro_id: int, actor_id: int, action: str)
         return None
     db.commit()
     db.refresh(row)
+    event_type = "intro_accepted" if row.status == "introduced" else "intro_declined"
+    event_broker.publish(row.requester_id, event_type, {"intro_id": row.id, "candidate_id": row.candidate_id})
     return row
@@ -1,8 +1,11 @@
+import time
+
 from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
 from app.models import Attendee, Feedback, MatchResult
 from app.services.explain import make_reasons
+from app.services.metrics import span, timed, tracer
 from app.services.profile import build_profile
 
 
@@ -79,17 +82,24 @@ MAX_MATCHES = 7
 QUALITY_THRESHOLD = 65.0
 
 
+@timed("matching")
 def build_matches_for_attendee(db: Session, attendee_id: int, top_n: int = 5) -> list[MatchResult]:
-    requester = db.query(Attendee).filter(Attendee.id == attendee_id).first()
-    if not requester:
-        return []
-
-    candidates = db.query(Attendee).all()
-    profile_map = {candidate.id: build_profile(candidate) for candidate in candidates}
-    requester_profile = profile_map[requester.id]
-    feedback_map = _feedback_prior_map(db, requester.id)
+    trace = tracer()
+    with span(trace, "matching.load"):
+        requester = db.query(Attendee).filter(Attendee.id == attendee_id).first()
+        if not requester:
+            return []
+        candidates = db.query(Attendee).all()
+
+    with span(trace, "matching.profiles"):
+        profile_map = {candidate.id: build_profile(candidate) for candidate in candidates}
+        requester_profile = profile_map[requester.id]
+    with span(trace, "matching.feedback"):
+        feedback_map = _feedback_prior_map(db, requester.id)
 
     scored = []
+    reasons_seconds = 0.0
+    loop_started = time.perf_counter() if trace is not None else 0.0
     for candidate in candidates:
         if not _passes_hard_constraints(requester, candidate):
             continue
@@ -102,8 +112,17 @@ def build_matches_for_attendee(db: Session, attendee_id: int, top_n: int = 5) ->
             "feedback": feedback_map.get(candidate.id, 5.0),
         }
         score = sum(parts.values())
-        reasons = make_reasons(requester, candidate, parts)
+        if trace is None:
+            reasons = make_reasons(requester, candidate, parts)
+        else:
+            reasons_started = time.perf_counter()
+            reasons = make_reasons(requester, candidate, parts)
+            reasons_seconds += time.perf_counter() - reasons_started
         scored.append((candidate, score, parts, reasons))
+    if trace is not None:
+        # make_reasons runs inside the loop, so its share is reported separately from scoring.
+        trace.add("matching.score", time.perf_counter() - loop_started - reasons_seconds)
+        trace.add("matching.reasons", reasons_seconds)
 
     scored.sort(key=lambda x: x[1], reverse=True)
     primary = scored[: top_n + 2]
@@ -111,6 +130,11 @@ def build_matches_for_attendee(db: Session, attendee_id: int, top_n: int = 5) ->
     qualified = [row for row in scored if row[1] > QUALITY_THRESHOLD]
     primary = qualified[: top_n + 2]
     final = primary[:top_n]
+    if trace is not None:
+        trace.count("matching.candidates_scanned", len(candidates))
+        trace.count("matching.candidates_passed", len(scored))
+        trace.count("matching.candidates_pruned", len(candidates) - len(scored))
+        trace.count("matching.candidates_qualified", len(qualified))
 
     # Diversity injection: replace last slot with first eligible outside top range.
     if len(final) >= MIN_MATCHES and len(primary) > top_n:
@@ -118,27 +142,40 @@ def build_matches_for_attendee(db: Session, attendee_id: int, top_n: int = 5) ->
         if exploration_candidate[1] > QUALITY_THRESHOLD:
             final[-1] = exploration_candidate
 
-    db.query(MatchResult).filter(MatchResult.attendee_id == attendee_id).delete(synchronize_session=False)
-
-    stored: list[MatchResult] = []
-    exploration_slot_candidate_id = primary[top_n][0].id if len(primary) > top_n else None
-    for candidate, score, _parts, reasons in final:
-        exploration = candidate.id == exploration_slot_candidate_id
-        rec = MatchResult(
-            attendee_id=attendee_id,
-            candidate_id=candidate.id,
-            score=round(score, 2),
-            exploration_flag=exploration,
-            reason_1=reasons[0] if len(reasons) > 0 else "",
-            reason_2=reasons[1] if len(reasons) > 1 else "",
-            reason_3=reasons[2] if len(reasons) > 2 else "",
-        )
-        db.add(rec)
-        stored.append(rec)
-
-    db.commit()
-    for rec in stored:
-        db.refresh(rec)
+    with span(trace, "matching.store"):
+        if feedback_map:
+            # Detach the attendee's feedback so the old rows can go; it is re-linked below.
+            db.query(Feedback).filter(Feedback.attendee_id == attendee_id, Feedback.match_id.is_not(None)).update(
+                {Feedback.match_id: None}, synchronize_session=False
+            )
+        db.query(MatchResult).filter(MatchResult.attendee_id == attendee_id).delete(synchronize_session=False)
+
+        stored: list[MatchResult] = []
+        exploration_slot_candidate_id = primary[top_n][0].id if len(primary) > top_n else None
+        for candidate, score, _parts, reasons in final:
+            exploration = candidate.id == exploration_slot_candidate_id
+            rec = MatchResult(
+                attendee_id=attendee_id,
+                candidate_id=candidate.id,
+                score=round(score, 2),
+                exploration_flag=exploration,
+                reason_1=reasons[0] if len(reasons) > 0 else "",
+                reason_2=reasons[1] if len(reasons) > 1 else "",
+                reason_3=reasons[2] if len(reasons) > 2 else "",
+            )
+            db.add(rec)
+            stored.append(rec)
+
+        rated = [rec for rec in stored if rec.candidate_id in feedback_map]
+        if rated:
+            db.flush()
+            for rec in rated:
+                db.query(Feedback).filter(
+                    Feedback.attendee_id == attendee_id, Feedback.candidate_id == rec.candidate_id
+                ).update({Feedback.match_id: rec.id}, synchronize_session=False)
+        db.commit()
+        for rec in stored:
+            db.refresh(rec)
     return stored
 
 
@@ -178,7 +215,3 @@ def organizer_metrics(db: Session) -> dict[str, float]:
         "meeting_rate": round(met, 2),
     }
 
-
-def ranking_snapshot(db: Session, attendee_id: int) -> dict[int, float]:
-    rows = db.query(MatchResult).filter(MatchResult.attendee_id == attendee_id).all()
-    return {r.candidate_id: r.score for r in rows}
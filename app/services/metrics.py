@@ -0,0 +1,377 @@
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+from sqlalchemy import event
+
+METRICS_DIR = Path(os.getenv("METRICS_DIR", str(Path(tempfile.gettempdir()) / "pot-metrics")))
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+# Snapshots from workers that exited this long ago are deleted rather than merged.
+METRICS_STALE_SECONDS = float(os.getenv("METRICS_STALE_SECONDS", str(24 * 60 * 60)))
+# Phase spans and work counters inside matching and scenarios; off leaves one None check per span.
+TRACE_SPANS = os.getenv("TRACE_SPANS", "true").lower() == "true"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRIC_HELP = {
+    "pot_http_requests_total": ("counter", "HTTP requests by route and status."),
+    "pot_http_requests_in_flight": ("gauge", "HTTP requests currently being served, including open event streams."),
+    "pot_http_request_duration_seconds": ("histogram", "Time from request start to the last response byte."),
+    "pot_http_response_size_bytes": ("histogram", "Response body bytes as sent, after compression."),
+    "pot_db_queries_total": ("counter", "Database queries issued while serving requests."),
+    "pot_db_query_seconds_total": ("counter", "Time spent in database queries while serving requests."),
+    "pot_request_phase_seconds_total": ("counter", "Time spent in request phases and hot-path spans."),
+    "pot_work_items_total": ("counter", "Items processed by hot-path spans (candidates scanned, pruned, qualified)."),
+}
+
+_current_timing: ContextVar["RequestTiming | None"] = ContextVar("request_timing", default=None)
+
+
+class RequestTiming:
+    """Per-request phase durations, shared by the event loop and threadpool via the context."""
+
+    __slots__ = ("started", "phases", "db_queries", "counts")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.db_queries = 0
+        self.counts: dict[str, int] = {}
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def server_timing(self) -> str:
+        entries = []
+        for phase, seconds in self.phases.items():
+            entry = f"{phase};dur={seconds * 1000:.1f}"
+            if phase == "db":
+                entry += f';desc="{self.db_queries} queries"'
+            entries.append(entry)
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+def current_timing() -> RequestTiming | None:
+    return _current_timing.get()
+
+
+@contextlib.contextmanager
+def request_timing():
+    """Collect timings outside the middleware, e.g. in benchmark scripts."""
+    timing = RequestTiming()
+    token = _current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _current_timing.reset(token)
+
+
+def tracer() -> RequestTiming | None:
+    """The timing spans should record into, or None when tracing is off or no request is active."""
+    return _current_timing.get() if TRACE_SPANS else None
+
+
+class span:
+    """``with span(trace, "matching.score"):`` adds the block's duration when ``trace`` is set."""
+
+    __slots__ = ("trace", "name", "started")
+
+    def __init__(self, trace: RequestTiming | None, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        if self.trace is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc):
+        if self.trace is not None:
+            self.trace.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+@contextlib.contextmanager
+def timed(phase: str):
+    """Add the block's duration to the current request's phase; usable as a decorator."""
+    timing = _current_timing.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(phase, time.perf_counter() - started)
+
+
+def instrument_engine(engine):
+    """Count queries and their time against the request that issued them."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+        if _current_timing.get() is not None:
+            context._pot_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+        started = getattr(context, "_pot_query_started", None)
+        timing = _current_timing.get()
+        if started is None or timing is None:
+            return
+        timing.db_queries += 1
+        timing.add("db", time.perf_counter() - started)
+
+
+def _label_string(labels: dict | None) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels.items()
+    )
+    return ",".join(f'{name}="{value}"' for name, value in escaped)
+
+
+class MetricsRegistry:
+    """This worker's counters, gauges and histograms, flushed to a per-process snapshot file.
+
+    Each worker writes ``worker-<pid>.json`` under ``directory`` at most every
+    ``flush_seconds``; ``collect`` merges every snapshot so a scrape of any worker
+    reports the whole host.
+    """
+
+    def __init__(self, directory: Path = METRICS_DIR, flush_seconds: float = METRICS_FLUSH_SECONDS):
+        self.directory = Path(directory)
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[str, float]] = {}
+        self._gauges: dict[str, dict[str, float]] = {}
+        self._histograms: dict[str, dict] = {}
+        self._last_flush = 0.0
+
+    def inc(self, name: str, labels: dict | None = None, value: float = 1.0):
+        key = _label_string(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def gauge_add(self, name: str, value: float, labels: dict | None = None):
+        key = _label_string(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: dict | None = None, buckets: tuple = LATENCY_BUCKETS):
+        key = _label_string(labels)
+        with self._lock:
+            histogram = self._histograms.setdefault(name, {"buckets": list(buckets), "series": {}})
+            # Per-bucket counts (not cumulative), then the +Inf bucket, sum and count.
+            series = histogram["series"].setdefault(key, [0] * (len(buckets) + 1) + [0.0, 0])
+            index = next((i for i, bound in enumerate(histogram["buckets"]) if value <= bound), len(buckets))
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def record_request(self, method: str, route: str, status: int, seconds: float, size: int, timing: RequestTiming):
+        labels = {"method": method, "route": route}
+        self.inc("pot_http_requests_total", {**labels, "status": status})
+        self.observe("pot_http_request_duration_seconds", seconds, labels)
+        self.observe("pot_http_response_size_bytes", size, labels, SIZE_BUCKETS)
+        if timing.db_queries:
+            self.inc("pot_db_queries_total", labels, timing.db_queries)
+        for phase, phase_seconds in timing.phases.items():
+            if phase == "db":
+                self.inc("pot_db_query_seconds_total", labels, phase_seconds)
+            else:
+                self.inc("pot_request_phase_seconds_total", {"route": route, "phase": phase}, phase_seconds)
+        for item, value in timing.counts.items():
+            self.inc("pot_work_items_total", {"route": route, "item": item}, value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return json.loads(
+                json.dumps(
+                    {
+                        "pid": os.getpid(),
+                        "written_at": time.time(),
+                        "counters": self._counters,
+                        "gauges": self._gauges,
+                        "histograms": self._histograms,
+                    }
+                )
+            )
+
+    def flush(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_seconds:
+            return
+        self._last_flush = now
+        snapshot = self.snapshot()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".worker-", dir=self.directory)
+            with os.fdopen(fd, "w") as handle:
+                json.dump(snapshot, handle, separators=(",", ":"))
+            os.replace(tmp, self.directory / f"worker-{snapshot['pid']}.json")
+        except OSError:
+            # Metrics must never fail a request; the next flush retries.
+            pass
+
+    def collect(self) -> dict:
+        """Merge every worker's latest snapshot, this worker's taken fresh."""
+        self.flush(force=True)
+        snapshots = []
+        for path in sorted(self.directory.glob("worker-*.json")):
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            alive = pid_alive(snapshot.get("pid", 0))
+            if not alive and time.time() - snapshot.get("written_at", 0) > METRICS_STALE_SECONDS:
+                path.unlink(missing_ok=True)
+                continue
+            snapshot["alive"] = alive
+            snapshots.append(snapshot)
+        return merge_snapshots(snapshots)
+
+
+def pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+def merge_snapshots(snapshots: list[dict]) -> dict:
+    """Sum counters and histograms across workers; gauges only from workers still running."""
+    merged: dict = {"counters": {}, "gauges": {}, "histograms": {}}
+    for snapshot in snapshots:
+        for name, series in snapshot.get("counters", {}).items():
+            target = merged["counters"].setdefault(name, {})
+            for key, value in series.items():
+                target[key] = target.get(key, 0.0) + value
+        if snapshot.get("alive", True):
+            for name, series in snapshot.get("gauges", {}).items():
+                target = merged["gauges"].setdefault(name, {})
+                for key, value in series.items():
+                    target[key] = target.get(key, 0.0) + value
+        for name, histogram in snapshot.get("histograms", {}).items():
+            target = merged["histograms"].setdefault(name, {"buckets": histogram["buckets"], "series": {}})
+            if target["buckets"] != histogram["buckets"]:
+                # A worker running older bucket bounds; skip rather than misattribute counts.
+                continue
+            for key, values in histogram["series"].items():
+                current = target["series"].get(key)
+                target["series"][key] = values[:] if current is None else [a + b for a, b in zip(current, values)]
+    return merged
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _with_label(key: str, extra: str) -> str:
+    return f"{{{key},{extra}}}" if key else f"{{{extra}}}"
+
+
+def render_prometheus(merged: dict) -> str:
+    """Prometheus text exposition format (0.0.4)."""
+    lines = []
+
+    def header(name: str, kind: str):
+        help_text = METRIC_HELP.get(name, (kind, name))[1]
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for kind in ("counters", "gauges"):
+        for name, series in sorted(merged[kind].items()):
+            header(name, "counter" if kind == "counters" else "gauge")
+            for key, value in sorted(series.items()):
+                lines.append(f"{name}{{{key}}} {_number(value)}" if key else f"{name} {_number(value)}")
+    for name, histogram in sorted(merged["histograms"].items()):
+        header(name, "histogram")
+        bounds = histogram["buckets"]
+        for key, values in sorted(histogram["series"].items()):
+            cumulative = 0
+            for bound, count in zip([*bounds, "+Inf"], values[: len(bounds) + 1]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                bucket_label = f'le="{le}"'
+                lines.append(f"{name}_bucket{_with_label(key, bucket_label)} {cumulative}")
+            labels = f"{{{key}}}" if key else ""
+            lines.append(f"{name}_sum{labels} {_number(values[-2])}")
+            lines.append(f"{name}_count{labels} {int(values[-1])}")
+    return "\n".join(lines) + "\n"
+
+
+def _route_label(scope, root_path: str) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Mounted apps (static files) extend root_path; anything else did not match a route.
+    if scope.get("root_path", "") != root_path:
+        return scope["root_path"][len(root_path):]
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Times every HTTP request, adds a Server-Timing header and records it in the registry."""
+
+    def __init__(self, app, registry: MetricsRegistry | None = None):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        registry = self.registry or metrics
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        root_path = scope.get("root_path", "")
+        status = 500
+        size = 0
+
+        async def send_with_timing(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [*message.get("headers", []), (b"server-timing", timing.server_timing().encode())]
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        registry.gauge_add("pot_http_requests_in_flight", 1)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timing.reset(token)
+            registry.gauge_add("pot_http_requests_in_flight", -1)
+            registry.record_request(
+                scope["method"],
+                _route_label(scope, root_path),
+                status,
+                time.perf_counter() - timing.started,
+                size,
+                timing,
+            )
+            registry.flush()
+
+
+metrics = MetricsRegistry()
@@ -42,7 +42,8 @@ def build_profile(attendee: Attendee) -> ProfileSignals:
     family = _infer_role_family(attendee.role)
     base = ROLE_TAGS.get(family, set())
 
-    focus_tags = base | _tokenize(attendee.focus_text) | _tokenize(attendee.primary_goal)
+    signal_tags = set((attendee.signal_tags or "").split())
+    focus_tags = base | _tokenize(attendee.focus_text) | _tokenize(attendee.primary_goal) | signal_tags
     seek_tags = _tokenize(attendee.seek_text) | _tokenize(attendee.secondary_goals) | {
         attendee.primary_goal.lower()
     }
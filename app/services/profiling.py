@@ -0,0 +1,234 @@
+import contextlib
+import functools
+import inspect
+import json
+import os
+import re
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+
+from fastapi.routing import APIRoute
+
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(Path(tempfile.gettempdir()) / "pot-profiles")))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+# Requests slower than this are kept automatically; 0 turns the automatic mode off.
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+PROFILE_MAX_BYTES = int(os.getenv("PROFILE_MAX_BYTES", str(20 * 1024 * 1024)))
+MAX_STACK_DEPTH = 128
+PROFILE_ID = re.compile(r"^[0-9]{13}-[0-9a-f]{8}$")
+
+_active_session: ContextVar["ProfileSession | None"] = ContextVar("profile_session", default=None)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = "/".join(Path(code.co_filename).parts[-2:])
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+class ProfileSession:
+    """Stack samples for one request's endpoint, keyed by the thread and frame running it."""
+
+    def __init__(self, trigger: str, method: str, path: str):
+        self.id = f"{int(time.time() * 1000)}-{secrets.token_hex(4)}"
+        self.trigger = trigger
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.duration_ms = 0.0
+        self.samples = 0
+        self.stacks: Counter[str] = Counter()
+        # thread ident -> the endpoint frame that thread is executing for this request.
+        self._targets: dict[int, object] = {}
+
+    @contextlib.contextmanager
+    def target(self, frame):
+        ident = threading.get_ident()
+        self._targets[ident] = frame
+        try:
+            yield
+        finally:
+            self._targets.pop(ident, None)
+
+    def sample(self, frames: dict):
+        for ident, target in list(self._targets.items()):
+            frame = frames.get(ident)
+            labels = []
+            # The target is the profiling wrapper's frame, so stacks start at the endpoint itself.
+            while frame is not None and frame is not target and len(labels) < MAX_STACK_DEPTH:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if frame is not target:
+                # An async endpoint parked at an await; the loop thread is running something else.
+                labels = ["(suspended)"]
+            self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        """Collapsed-stack text, as read by flamegraph.pl and speedscope."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, interval_ms: float) -> dict:
+        return {
+            "id": self.id,
+            "trigger": self.trigger,
+            "method": self.method,
+            "path": self.path,
+            "duration_ms": round(self.duration_ms, 1),
+            "samples": self.samples,
+            "interval_ms": interval_ms,
+            "created_at": time.time(),
+        }
+
+
+class RequestProfiler:
+    """Samples the endpoints of requests being profiled and keeps a capped set of results on disk.
+
+    One daemon thread samples every ``interval_ms`` while any session is open and
+    exits when none are. Saved profiles are ``<id>.folded`` plus a ``<id>.json``
+    summary; the oldest are deleted once ``max_files`` or ``max_bytes`` is exceeded.
+    """
+
+    def __init__(
+        self,
+        directory: Path = PROFILE_DIR,
+        slow_ms: float = PROFILE_SLOW_MS,
+        interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS,
+        max_files: int = PROFILE_MAX_FILES,
+        max_bytes: int = PROFILE_MAX_BYTES,
+    ):
+        self.directory = Path(directory)
+        self.slow_ms = slow_ms
+        self.interval_ms = interval_ms
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sessions: set[ProfileSession] = set()
+        self._sampler: threading.Thread | None = None
+
+    def start(self, trigger: str, method: str, path: str) -> tuple[ProfileSession, object]:
+        session = ProfileSession(trigger, method, path)
+        with self._lock:
+            self._sessions.add(session)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+                self._sampler.start()
+        return session, _active_session.set(session)
+
+    def finish(self, session: ProfileSession):
+        """End sampling and fix the duration; later calls keep the first result."""
+        with self._lock:
+            if session not in self._sessions:
+                return
+            self._sessions.discard(session)
+        session.duration_ms = (time.perf_counter() - session.started) * 1000
+
+    def stop(self, session: ProfileSession, token):
+        _active_session.reset(token)
+        self.finish(session)
+
+    def _sample_loop(self):
+        interval = self.interval_ms / 1000
+        while True:
+            # Sampling under the lock means a stopped session never receives a late sample.
+            with self._lock:
+                if not self._sessions:
+                    self._sampler = None
+                    return
+                frames = sys._current_frames()
+                for session in self._sessions:
+                    session.sample(frames)
+                del frames
+            time.sleep(interval)
+
+    def should_keep(self, session: ProfileSession) -> bool:
+        if session.trigger == "on_demand":
+            return True
+        return self.slow_ms > 0 and session.duration_ms >= self.slow_ms
+
+    def save(self, session: ProfileSession) -> bool:
+        if not self.should_keep(session):
+            return False
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{session.id}.folded").write_text(session.folded())
+            (self.directory / f"{session.id}.json").write_text(json.dumps(session.summary(self.interval_ms)))
+            self._enforce_caps()
+        except OSError:
+            return False
+        return True
+
+    def _enforce_caps(self):
+        entries = []
+        for summary_path in self.directory.glob("*.json"):
+            profile_path = summary_path.with_suffix(".folded")
+            try:
+                size = summary_path.stat().st_size + profile_path.stat().st_size
+            except OSError:
+                size = 0
+            entries.append((summary_path.stem, size))
+        # Ids start with a millisecond timestamp, so name order is age order.
+        entries.sort()
+        total = sum(size for _name, size in entries)
+        while entries and (len(entries) > self.max_files or total > self.max_bytes):
+            name, size = entries.pop(0)
+            total -= size
+            for suffix in (".folded", ".json"):
+                (self.directory / f"{name}{suffix}").unlink(missing_ok=True)
+
+    def list_profiles(self) -> list[dict]:
+        profiles = []
+        for summary_path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                profiles.append(json.loads(summary_path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def profile_path(self, profile_id: str) -> Path | None:
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.folded"
+        return path if path.is_file() else None
+
+
+def _profiled(endpoint):
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def profiled_async(*args, **kwargs):
+            session = _active_session.get()
+            if session is None:
+                return await endpoint(*args, **kwargs)
+            with session.target(sys._getframe()):
+                return await endpoint(*args, **kwargs)
+
+        return profiled_async
+
+    @functools.wraps(endpoint)
+    def profiled(*args, **kwargs):
+        session = _active_session.get()
+        if session is None:
+            return endpoint(*args, **kwargs)
+        # Sync endpoints run on the threadpool; the copied context still carries the session.
+        with session.target(sys._getframe()):
+            return endpoint(*args, **kwargs)
+
+    return profiled
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute whose endpoint marks its thread and frame for an active profile session."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _profiled(endpoint), **kwargs)
+
+
+profiler = RequestProfiler()
@@ -0,0 +1,159 @@
+import itertools
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_SQLITE_PATH = Path(
+    os.getenv("RATE_LIMIT_SQLITE_PATH", str(Path(tempfile.gettempdir()) / "pot-rate-limits.db"))
+)
+RATE_LIMIT_STRIPES = int(os.getenv("RATE_LIMIT_STRIPES", "16"))
+# How long a check waits for another worker's write lock before failing open.
+RATE_LIMIT_BUSY_TIMEOUT_MS = int(os.getenv("RATE_LIMIT_BUSY_TIMEOUT_MS", "50"))
+SWEEP_EVERY_OPS = 512
+
+
+def sliding_window(
+    state: tuple[float, int, int], now: float, limit: int, period_seconds: int
+) -> tuple[bool, tuple[float, int, int]]:
+    """Sliding-window-counter step over (window_start, current, previous).
+
+    The previous fixed window's count is weighted by how much of it still overlaps
+    the trailing period, so each key needs three numbers instead of a timestamp log.
+    """
+    window_start, current, previous = state
+    window = (now // period_seconds) * period_seconds
+    if window != window_start:
+        previous = current if window - window_start == period_seconds else 0
+        current = 0
+        window_start = window
+    weight = 1.0 - (now - window) / period_seconds
+    allowed = previous * weight + current < limit
+    if allowed:
+        current += 1
+    return allowed, (window_start, current, previous)
+
+
+class _Stripe:
+    __slots__ = ("lock", "entries", "ops")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> (window_start, current, previous, period_seconds)
+        self.entries: dict[str, tuple[float, int, int, int]] = {}
+        self.ops = 0
+
+
+class InMemoryRateLimiter:
+    """Per-process sliding-window limiter with striped locks and idle-key eviction."""
+
+    def __init__(self, stripes: int = RATE_LIMIT_STRIPES):
+        self._stripes = [_Stripe() for _ in range(max(1, stripes))]
+
+    def allow(self, key: str, limit: int, period_seconds: int) -> bool:
+        stripe = self._stripes[hash(key) % len(self._stripes)]
+        now = time.time()
+        with stripe.lock:
+            window_start, current, previous, _period = stripe.entries.get(key, (0.0, 0, 0, period_seconds))
+            allowed, (window_start, current, previous) = sliding_window(
+                (window_start, current, previous), now, limit, period_seconds
+            )
+            stripe.entries[key] = (window_start, current, previous, period_seconds)
+            stripe.ops += 1
+            if stripe.ops % SWEEP_EVERY_OPS == 0:
+                self._sweep(stripe, now)
+        return allowed
+
+    @staticmethod
+    def _sweep(stripe: _Stripe, now: float):
+        # Two full periods without a hit means both counters would read as zero.
+        idle = [key for key, entry in stripe.entries.items() if now - entry[0] >= 2 * entry[3]]
+        for key in idle:
+            del stripe.entries[key]
+
+    def evict_idle(self):
+        now = time.time()
+        for stripe in self._stripes:
+            with stripe.lock:
+                self._sweep(stripe, now)
+
+    def __len__(self) -> int:
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+
+class SQLiteRateLimiter:
+    """Sliding-window limiter whose counters live in a SQLite file shared by every worker on a host.
+
+    Each check is one ``BEGIN IMMEDIATE`` read-modify-write, so concurrent workers see
+    the same counts; expired rows are swept periodically. Checks run on the request
+    path, so each thread keeps one connection and waits at most ``busy_timeout_ms``
+    for the write lock. A check that cannot use the file is counted by a per-process
+    in-memory limiter instead, so contention never switches limits off.
+    """
+
+    def __init__(self, path: Path = RATE_LIMIT_SQLITE_PATH, busy_timeout_ms: int = RATE_LIMIT_BUSY_TIMEOUT_MS):
+        self.path = Path(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._ops = itertools.count(1)
+        self._fallback = InMemoryRateLimiter()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS rate_limits ("
+                    "key TEXT PRIMARY KEY, window_start REAL NOT NULL, current INTEGER NOT NULL, "
+                    "previous INTEGER NOT NULL, expires_at REAL NOT NULL)"
+                )
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._local.conn = conn
+        return conn
+
+    def allow(self, key: str, limit: int, period_seconds: int) -> bool:
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT window_start, current, previous FROM rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+                allowed, (window_start, current, previous) = sliding_window(
+                    row or (0.0, 0, 0), now, limit, period_seconds
+                )
+                conn.execute(
+                    "INSERT INTO rate_limits (key, window_start, current, previous, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                    "window_start = excluded.window_start, current = excluded.current, "
+                    "previous = excluded.previous, expires_at = excluded.expires_at",
+                    (key, window_start, current, previous, window_start + 2 * period_seconds),
+                )
+                if next(self._ops) % SWEEP_EVERY_OPS == 0:
+                    conn.execute("DELETE FROM rate_limits WHERE expires_at < ?", (now,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            # A locked or broken file must neither take the app down nor lift the limit.
+            return self._fallback.allow(key, limit, period_seconds)
+        return allowed
+
+
+def build_rate_limiter(backend: str = RATE_LIMIT_BACKEND):
+    if backend == "sqlite":
+        return SQLiteRateLimiter(RATE_LIMIT_SQLITE_PATH)
+    if backend == "memory":
+        return InMemoryRateLimiter()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
@@ -1,4 +1,8 @@
+import threading
+from collections.abc import Callable
+
 from app.models import Attendee
+from app.services.metrics import span, timed, tracer
 
 
 MAX_SCENARIO_RESULTS = 120
@@ -30,7 +34,14 @@ def _is_lp_profile(attendee: Attendee) -> bool:
 def _has_tokens(attendee: Attendee, tokens: tuple[str, ...]) -> bool:
     secondary_goals = attendee.secondary_goals or ""
     blob = " ".join(
-        [attendee.focus_text, attendee.seek_text, attendee.offer_text, attendee.primary_goal, secondary_goals]
+        [
+            attendee.focus_text,
+            attendee.seek_text,
+            attendee.offer_text,
+            attendee.primary_goal,
+            secondary_goals,
+            attendee.signal_tags or "",
+        ]
     ).lower()
     return any(t in blob for t in tokens)
 
@@ -46,87 +57,140 @@ def _funding_chain_fit(founder: Attendee, gp: Attendee, lp: Attendee) -> bool:
     return founder_ready and _is_gp_investor(gp) and _is_lp_profile(lp)
 
 
+@timed("scenarios")
 def strategic_scenarios(attendees: list[Attendee], max_results: int = MAX_SCENARIO_RESULTS) -> list[dict]:
+    trace = tracer()
     scenarios: list[dict] = []
 
     # Scenario type 1: Compliance infrastructure fit for institutional bank.
-    ctos = [a for a in attendees if "cto" in a.role.lower()]
-    banks = [
-        a
-        for a in attendees
-        if "bank" in a.company.lower() or "digital assets" in a.role.lower()
-    ]
-    for cto in ctos:
-        pair_count = 0
-        if not _has_tokens(cto, ("l2", "zk", "compliance", "infrastructure")):
-            continue
-        for bank in banks:
-            if cto.id == bank.id:
-                continue
-            if _bank_compliance_fit(cto, bank):
-                scenarios.append(
-                    {
-                        "type": "pair_synergy",
-                        "title": "Compliance Infrastructure Fit",
-                        "participants": [cto.name, bank.name],
-                        "explanation": (
-                            f"{cto.name}'s compliance-focused infrastructure aligns with {bank.name}'s institutional custody/"
-                            "compliant deployment needs."
-                        ),
-                    }
-                )
-                pair_count += 1
-                if pair_count >= MAX_PAIR_MATCHES_PER_CTO:
-                    break
-                if len(scenarios) >= max_results:
-                    break
-        if len(scenarios) >= max_results:
-            break
-
-    # Scenario type 2: Funding chain Founder <- GP <- LP
-    founders = [a for a in attendees if _is_founder(a) and _has_tokens(a, ("investment", "investor", "fundraising", "series", "raise"))]
-    gps = [a for a in attendees if _is_gp_investor(a)]
-    lps = [a for a in attendees if _is_lp_profile(a)]
-    founder_pool = founders[:MAX_TRIAD_FOUNDERS]
-    gp_pool = gps[:MAX_TRIAD_GPS]
-    lp_pool = lps[:MAX_TRIAD_LPS]
-    for founder in founder_pool:
-        for gp in gp_pool:
-            if founder.id == gp.id:
+    pairs_checked = 0
+    with span(trace, "scenarios.pairs"):
+        ctos = [a for a in attendees if "cto" in a.role.lower()]
+        banks = [
+            a
+            for a in attendees
+            if "bank" in a.company.lower() or "digital assets" in a.role.lower()
+        ]
+        for cto in ctos:
+            pair_count = 0
+            if not _has_tokens(cto, ("l2", "zk", "compliance", "infrastructure")):
                 continue
-            for lp in lp_pool:
-                if lp.id in (founder.id, gp.id):
+            for bank in banks:
+                if cto.id == bank.id:
                     continue
-                if _funding_chain_fit(founder, gp, lp):
+                pairs_checked += 1
+                if _bank_compliance_fit(cto, bank):
                     scenarios.append(
                         {
-                            "type": "triad_synergy",
-                            "title": "Series Pathway Chain",
-                            "participants": [founder.name, gp.name, lp.name],
+                            "type": "pair_synergy",
+                            "title": "Compliance Infrastructure Fit",
+                            "participants": [cto.name, bank.name],
                             "explanation": (
-                                f"{gp.name}'s fund can evaluate {founder.name}'s round, with {lp.name} as a strong LP-side"
-                                " institutional context bridge."
+                                f"{cto.name}'s compliance-focused infrastructure aligns with {bank.name}'s institutional custody/"
+                                "compliant deployment needs."
                             ),
                         }
                     )
+                    pair_count += 1
+                    if pair_count >= MAX_PAIR_MATCHES_PER_CTO:
+                        break
+                    if len(scenarios) >= max_results:
+                        break
+            if len(scenarios) >= max_results:
+                break
+    pairs_found = len(scenarios)
+
+    # Scenario type 2: Funding chain Founder <- GP <- LP
+    triads_checked = 0
+    with span(trace, "scenarios.triads"):
+        founders = [a for a in attendees if _is_founder(a) and _has_tokens(a, ("investment", "investor", "fundraising", "series", "raise"))]
+        gps = [a for a in attendees if _is_gp_investor(a)]
+        lps = [a for a in attendees if _is_lp_profile(a)]
+        founder_pool = founders[:MAX_TRIAD_FOUNDERS]
+        gp_pool = gps[:MAX_TRIAD_GPS]
+        lp_pool = lps[:MAX_TRIAD_LPS]
+        for founder in founder_pool:
+            for gp in gp_pool:
+                if founder.id == gp.id:
+                    continue
+                for lp in lp_pool:
+                    if lp.id in (founder.id, gp.id):
+                        continue
+                    triads_checked += 1
+                    if _funding_chain_fit(founder, gp, lp):
+                        scenarios.append(
+                            {
+                                "type": "triad_synergy",
+                                "title": "Series Pathway Chain",
+                                "participants": [founder.name, gp.name, lp.name],
+                                "explanation": (
+                                    f"{gp.name}'s fund can evaluate {founder.name}'s round, with {lp.name} as a strong LP-side"
+                                    " institutional context bridge."
+                                ),
+                            }
+                        )
+                        break
+                if len(scenarios) >= max_results:
                     break
             if len(scenarios) >= max_results:
                 break
-        if len(scenarios) >= max_results:
-            break
 
     # Remove near-duplicates while preserving order.
-    deduped = []
-    seen = set()
-    for s in scenarios:
-        key = (s["type"], tuple(s["participants"]))
-        if key in seen:
-            continue
-        seen.add(key)
-        deduped.append(s)
+    with span(trace, "scenarios.dedupe"):
+        deduped = []
+        seen = set()
+        for s in scenarios:
+            key = (s["type"], tuple(s["participants"]))
+            if key in seen:
+                continue
+            seen.add(key)
+            deduped.append(s)
+    if trace is not None:
+        trace.count("scenarios.pairs_checked", pairs_checked)
+        trace.count("scenarios.pairs_found", pairs_found)
+        trace.count("scenarios.triads_checked", triads_checked)
+        trace.count("scenarios.triads_found", len(scenarios) - pairs_found)
     return deduped[:max_results]
 
 
+def scenarios_involving(name: str, scenarios: list[dict]) -> list[dict]:
+    return [s for s in scenarios if name in s["participants"]]
+
+
 def scenarios_for_attendee(attendee: Attendee, attendees: list[Attendee]) -> list[dict]:
-    all_scenarios = strategic_scenarios(attendees)
-    return [s for s in all_scenarios if attendee.name in s["participants"]]
+    return scenarios_involving(attendee.name, strategic_scenarios(attendees))
+
+
+class ScenarioCache:
+    """Event-wide scenarios, recomputed only when the event data version moves.
+
+    The version is read from the database on every call, so a write handled by
+    another worker still invalidates this worker's copy. Callers must not mutate
+    the returned list.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._scenarios: list[dict] = []
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: int, load_attendees: Callable[[], list[Attendee]]) -> list[dict]:
+        with self._lock:
+            if self._version == version:
+                self.hits += 1
+                return self._scenarios
+            self.misses += 1
+        # Computed outside the lock; concurrent misses for one version just do the work twice.
+        scenarios = strategic_scenarios(load_attendees())
+        with self._lock:
+            self._version, self._scenarios = version, scenarios
+        return scenarios
+
+    def clear(self):
+        with self._lock:
+            self._version, self._scenarios = None, []
+
+
+scenario_cache = ScenarioCache()
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import hashlib
 import hmac
@@ -7,7 +8,9 @@ import re
 import secrets
 import threading
 import time
-from collections import defaultdict, deque
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 
 AUTH_SECRET = os.getenv("AUTH_SECRET", "pot-dev-secret-change-me")
@@ -16,7 +19,15 @@ TOKEN_TTL_SECONDS = int(os.getenv("TOKEN_TTL_SECONDS", str(60 * 60 * 8)))
 CSRF_COOKIE = "csrf_token"
 AUTH_COOKIE = "auth_token"
 MAX_TOKEN_BYTES = 4096
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "1024"))
 MIN_PASSWORD_LENGTH = int(os.getenv("MIN_PASSWORD_LENGTH", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_POOL_QUEUE = int(os.getenv("PASSWORD_POOL_QUEUE", "64"))
+# "password" hashes bootstrap passcodes at creation; "invite" defers that work to first use.
+CREDENTIAL_PROVISIONING = os.getenv("CREDENTIAL_PROVISIONING", "password").lower()
+INVITE_TTL_SECONDS = int(os.getenv("INVITE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+INVITE_HASH_PREFIX = "invite$"
 
 
 def hash_password(password: str, salt: bytes | None = None) -> str:
@@ -28,6 +39,139 @@ def hash_password(password: str, salt: bytes | None = None) -> str:
     )
 
 
+def hash_passwords(passwords: list[str], processes: bool = False) -> list[str]:
+    """Hash a batch of passwords in input order, spread across cores.
+
+    pbkdf2_hmac releases the GIL while it runs, so the default thread pool keeps every core
+    busy without pickling. ``processes=True`` uses a process pool instead, for start-up work
+    that should not compete with the event loop; hosts without working semaphores (e.g.
+    serverless sandboxes) fall back to threads.
+    """
+    workers = min(PASSWORD_HASH_WORKERS, len(passwords))
+    if workers <= 1:
+        return [hash_password(password) for password in passwords]
+    if processes:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(passwords) // (workers * 4))
+                return list(pool.map(hash_password, passwords, chunksize=chunksize))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            pass
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash") as pool:
+        return list(pool.map(hash_password, passwords))
+
+
+class PasswordPoolBusy(RuntimeError):
+    pass
+
+
+class PasswordWorkPool:
+    """Size-limited executor for interactive password hashing and verification.
+
+    Login bursts queue here instead of occupying the shared request threadpool. At most
+    ``workers + max_queue`` jobs are admitted; beyond that ``submit`` raises
+    PasswordPoolBusy immediately so callers can shed load.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        self._work_ms_total = 0.0
+        self._work_ms_max = 0.0
+
+    def _run(self, submitted_at: float, fn, args: tuple):
+        started = time.perf_counter()
+        wait_ms = (started - submitted_at) * 1000
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_ms_total += wait_ms
+            self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+        try:
+            return fn(*args)
+        finally:
+            work_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._work_ms_total += work_ms
+                self._work_ms_max = max(self._work_ms_max, work_ms)
+            self._slots.release()
+
+    def submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordPoolBusy("password work queue is full")
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-auth")
+            self._queued += 1
+        try:
+            return self._executor.submit(self._run, time.perf_counter(), fn, args)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+
+    async def run(self, fn, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "queue_limit": self.max_queue,
+                "queue_depth": self._queued,
+                "in_flight": self._running,
+                "completed": completed,
+                "rejected": self._rejected,
+                "wait_ms_avg": round(self._wait_ms_total / completed, 2) if completed else 0.0,
+                "wait_ms_max": round(self._wait_ms_max, 2),
+                "hash_ms_avg": round(self._work_ms_total / completed, 2) if completed else 0.0,
+                "hash_ms_max": round(self._work_ms_max, 2),
+            }
+
+
+password_pool = PasswordWorkPool(PASSWORD_POOL_WORKERS, PASSWORD_POOL_QUEUE)
+
+
+def lazy_credentials_enabled() -> bool:
+    return CREDENTIAL_PROVISIONING == "invite"
+
+
+def new_invite_placeholder() -> str:
+    """Stored in place of a password hash until the attendee redeems an invite or first logs in."""
+    return INVITE_HASH_PREFIX + secrets.token_urlsafe(12)
+
+
+def is_invite_placeholder(encoded_hash: str) -> bool:
+    return (encoded_hash or "").startswith(INVITE_HASH_PREFIX)
+
+
+def provision_password_hashes(entries: list[tuple[str, bool]], processes: bool = False) -> list[str]:
+    """Return stored credentials for (password, is_bootstrap_default) pairs, in order.
+
+    In invite mode bootstrap defaults get a placeholder instead of a PBKDF2 hash;
+    explicitly chosen passwords are always hashed.
+    """
+    lazy = lazy_credentials_enabled()
+    to_hash = [password for password, is_default in entries if not (lazy and is_default)]
+    hashed = iter(hash_passwords(to_hash, processes=processes))
+    return [new_invite_placeholder() if lazy and is_default else next(hashed) for _password, is_default in entries]
+
+
 def verify_password(password: str, encoded_hash: str) -> bool:
     try:
         algo, iterations, salt_b64, digest_b64 = encoded_hash.split("$")
@@ -65,17 +209,26 @@ def sign_payload(payload: dict) -> str:
     return f"{payload_b64}.{sig}"
 
 
+def _verified_payload(token: str) -> dict | None:
+    if len(token.encode("utf-8")) > MAX_TOKEN_BYTES:
+        return None
+    payload_b64, sig = token.split(".")
+    expected = hmac.new(AUTH_SECRET.encode(), payload_b64.encode(), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(sig, expected):
+        return None
+    payload_json = base64.urlsafe_b64decode(payload_b64.encode()).decode()
+    payload = json.loads(payload_json)
+    if not isinstance(payload, dict):
+        return None
+    return payload
+
+
 def decode_payload(token: str) -> dict | None:
     try:
-        if len(token.encode("utf-8")) > MAX_TOKEN_BYTES:
-            return None
-        payload_b64, sig = token.split(".")
-        expected = hmac.new(AUTH_SECRET.encode(), payload_b64.encode(), hashlib.sha256).hexdigest()
-        if not hmac.compare_digest(sig, expected):
+        payload = _verified_payload(token)
+        if payload is None:
             return None
-        payload_json = base64.urlsafe_b64decode(payload_b64.encode()).decode()
-        payload = json.loads(payload_json)
-        if not isinstance(payload, dict):
+        if payload.get("kind", "session") != "session":
             return None
         role = payload.get("role")
         if role not in {"organizer", "attendee"}:
@@ -91,6 +244,77 @@ def decode_payload(token: str) -> dict | None:
         return None
 
 
+class VerifiedTokenCache:
+    """Bounded LRU of session tokens that already passed HMAC and payload checks.
+
+    Entries are re-checked against ``exp`` on every hit, so a cached token never
+    outlives its signature's validity.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def decode(self, token: str) -> dict | None:
+        now = int(time.time())
+        with self._lock:
+            payload = self._entries.get(token)
+            if payload is not None:
+                if payload["exp"] >= now:
+                    self._entries.move_to_end(token)
+                    return dict(payload)
+                del self._entries[token]
+        payload = decode_payload(token)
+        if payload is None or self.max_entries == 0:
+            return payload
+        with self._lock:
+            self._entries[token] = dict(payload)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+session_token_cache = VerifiedTokenCache(SESSION_CACHE_SIZE)
+
+
+def build_invite_token(attendee_id: int, placeholder: str) -> tuple[str, int]:
+    """Sign a one-time invite bound to the attendee's current placeholder credential."""
+    expires_at = int(time.time()) + INVITE_TTL_SECONDS
+    payload = {
+        "kind": "invite",
+        "attendee_id": attendee_id,
+        "nonce": placeholder[len(INVITE_HASH_PREFIX) :],
+        "exp": expires_at,
+    }
+    return sign_payload(payload), expires_at
+
+
+def decode_invite_token(token: str) -> dict | None:
+    try:
+        payload = _verified_payload(token)
+        if payload is None or payload.get("kind") != "invite":
+            return None
+        if not isinstance(payload.get("attendee_id"), int) or not isinstance(payload.get("nonce"), str):
+            return None
+        if payload.get("exp", 0) < int(time.time()):
+            return None
+        return payload
+    except Exception:
+        return None
+
+
+def invite_matches_credential(payload: dict, encoded_hash: str) -> bool:
+    """An invite is spent once the placeholder it was issued for has been replaced."""
+    if not is_invite_placeholder(encoded_hash):
+        return False
+    return hmac.compare_digest(INVITE_HASH_PREFIX + payload["nonce"], encoded_hash)
+
+
 def build_session_payload(user: dict) -> dict:
     now = int(time.time())
     session_id = secrets.token_urlsafe(16)
@@ -124,20 +348,3 @@ def verify_csrf_token(session_id: str, submitted: str, cookie_value: str) -> boo
         return False
     expected = hmac.new(AUTH_SECRET.encode(), f"{session_id}:{nonce}".encode(), hashlib.sha256).hexdigest()
     return hmac.compare_digest(sig, expected)
-
-
-class InMemoryRateLimiter:
-    def __init__(self):
-        self._events = defaultdict(deque)
-        self._lock = threading.Lock()
-
-    def allow(self, key: str, limit: int, period_seconds: int) -> bool:
-        with self._lock:
-            now = time.time()
-            dq = self._events[key]
-            while dq and dq[0] <= now - period_seconds:
-                dq.popleft()
-            if len(dq) >= limit:
-                return False
-            dq.append(now)
-            return True
@@ -0,0 +1,87 @@
+import re
+from collections import Counter
+
+from sqlalchemy import insert, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import Attendee, ExternalSignal
+from app.services.versions import bump_event_version
+
+MAX_SIGNAL_TAGS = 24
+MAX_ATTENDEE_SIGNAL_TAGS = 48
+
+_WORD = re.compile(r"[a-z][a-z0-9+-]{2,39}")
+STOPWORDS = {
+    "about", "across", "after", "all", "also", "and", "any", "are", "around", "been", "being", "but", "can",
+    "com", "contact", "cookie", "cookies", "copyright", "each", "for", "from", "get", "has", "have", "here",
+    "home", "how", "https", "into", "its", "just", "learn", "menu", "more", "most", "new", "not", "now",
+    "our", "out", "over", "page", "privacy", "read", "reserved", "rights", "see", "sign", "site", "than",
+    "that", "the", "their", "them", "then", "there", "these", "they", "this", "those", "through", "use",
+    "very", "was", "way", "website", "were", "what", "when", "where", "which", "while", "who", "why",
+    "will", "with", "www", "you", "your",
+}
+
+
+def summary_tags(summary: str, limit: int = MAX_SIGNAL_TAGS) -> list[str]:
+    """Most frequent distinct keywords of a summary, ties broken by first appearance."""
+    words = [word.strip("+-") for word in _WORD.findall(summary.lower())]
+    counts = Counter(word for word in words if len(word) >= 3 and word not in STOPWORDS)
+    # Counter preserves insertion order, and most_common() is a stable sort.
+    return [word for word, _count in counts.most_common(limit)]
+
+
+def _merged_tags(tag_strings: list[str]) -> str:
+    merged: dict[str, None] = {}
+    for tags in tag_strings:
+        for tag in tags.split():
+            merged.setdefault(tag)
+            if len(merged) >= MAX_ATTENDEE_SIGNAL_TAGS:
+                return " ".join(merged)
+    return " ".join(merged)
+
+
+def record_signals(db: Session, attendees: dict[int, Attendee], entries: list[tuple[int, str, str, str]]):
+    """Store (attendee_id, source, url, summary) signals and refresh each attendee's signal tags.
+
+    A new signal replaces the attendee's previous one from the same source, so
+    re-enriching swaps its keywords instead of piling more on; within ``entries``
+    the last one for an (attendee, source) pair wins. ``attendees`` maps ids to
+    loaded rows whose ``signal_tags`` get rewritten. The caller commits.
+    """
+    if not entries:
+        return
+    latest = {(attendee_id, source): (url, summary) for attendee_id, source, url, summary in entries}
+    keys = set(latest)
+    db.query(ExternalSignal).filter(tuple_(ExternalSignal.attendee_id, ExternalSignal.source).in_(keys)).delete(
+        synchronize_session=False
+    )
+    db.execute(
+        insert(ExternalSignal),
+        [
+            {
+                "attendee_id": attendee_id,
+                "source": source,
+                "source_url": url,
+                "extracted_summary": summary,
+                "tags": " ".join(summary_tags(summary)),
+            }
+            for (attendee_id, source), (url, summary) in latest.items()
+        ],
+    )
+
+    ids = {attendee_id for attendee_id, _source in keys}
+    tag_strings: dict[int, list[str]] = {attendee_id: [] for attendee_id in ids}
+    rows = (
+        db.query(ExternalSignal.attendee_id, ExternalSignal.tags)
+        .filter(ExternalSignal.attendee_id.in_(ids))
+        .order_by(ExternalSignal.id.desc())
+    )
+    for attendee_id, tags in rows:
+        tag_strings[attendee_id].append(tags or "")
+    for attendee_id, tags in tag_strings.items():
+        attendees[attendee_id].signal_tags = _merged_tags(tags)
+    bump_event_version(db)
+
+
+def record_signal(db: Session, attendee: Attendee, source: str, url: str, summary: str):
+    record_signals(db, {attendee.id: attendee}, [(attendee.id, source, url, summary)])
@@ -0,0 +1,162 @@
+import hashlib
+import hmac
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Attendee
+from app.services import security
+from app.services.bootstrap import seed_file_path, seed_demo_data_if_empty
+from app.services.matching import build_matches_for_attendee
+
+SNAPSHOT_FORMAT_VERSION = 1
+SEED_SNAPSHOT_PATH = Path(
+    os.getenv("SEED_SNAPSHOT_PATH", str(Path(__file__).resolve().parents[2] / "data" / "seed" / "matchmaking.snapshot.db"))
+)
+
+
+def _manifest_path(snapshot_path: Path) -> Path:
+    return snapshot_path.with_suffix(".json")
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def schema_fingerprint() -> str:
+    """Hash of every table, column type and index the models declare."""
+    shape = [
+        [
+            table.name,
+            [[column.name, str(column.type), bool(column.nullable)] for column in table.columns],
+            sorted(index.name for index in table.indexes),
+        ]
+        for table in Base.metadata.sorted_tables
+    ]
+    return hashlib.sha256(json.dumps(shape, separators=(",", ":")).encode()).hexdigest()
+
+
+def snapshot_fingerprint(organizer_email: str, organizer_password: str, attendee_bootstrap_password: str) -> dict:
+    """Everything a snapshot's contents depend on; any difference makes the snapshot stale.
+
+    Credentials are keyed with AUTH_SECRET so the manifest never reveals them.
+    """
+    credentials = json.dumps(
+        [
+            organizer_email,
+            organizer_password,
+            attendee_bootstrap_password,
+            security.PASSWORD_ITERATIONS,
+            security.CREDENTIAL_PROVISIONING,
+        ]
+    )
+    return {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "schema": schema_fingerprint(),
+        "seed_sha256": _sha256_file(seed_file_path()),
+        "credentials": hmac.new(security.AUTH_SECRET.encode(), credentials.encode(), hashlib.sha256).hexdigest(),
+    }
+
+
+def build_snapshot(
+    snapshot_path: Path,
+    organizer_email: str,
+    organizer_password: str,
+    attendee_bootstrap_password: str,
+) -> dict:
+    """Write a seeded SQLite file (schema, attendees, hashed logins, matches) plus its manifest."""
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, raw_path = tempfile.mkstemp(prefix=".snapshot-", suffix=".db", dir=snapshot_path.parent)
+    os.close(fd)
+    tmp_path = Path(raw_path)
+    timings: dict[str, float] = {}
+    build_engine = create_engine(f"sqlite:///{tmp_path}")
+    try:
+        Base.metadata.create_all(bind=build_engine)
+        db = sessionmaker(autocommit=False, autoflush=False, bind=build_engine, expire_on_commit=False)()
+        try:
+            seed_demo_data_if_empty(
+                db, organizer_email, organizer_password, attendee_bootstrap_password, timings=timings
+            )
+            start = time.perf_counter()
+            for (attendee_id,) in db.query(Attendee.id).order_by(Attendee.id.asc()).all():
+                build_matches_for_attendee(db, attendee_id, top_n=5)
+            timings["build_matches"] = round((time.perf_counter() - start) * 1000, 2)
+        finally:
+            db.close()
+        build_engine.dispose()
+
+        manifest = {
+            **snapshot_fingerprint(organizer_email, organizer_password, attendee_bootstrap_password),
+            "db_sha256": _sha256_file(tmp_path),
+            "built_at": int(time.time()),
+            "timings_ms": timings,
+        }
+        os.replace(tmp_path, snapshot_path)
+    except BaseException:
+        build_engine.dispose()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    manifest_tmp = _manifest_path(snapshot_path).with_suffix(".json.tmp")
+    manifest_tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(manifest_tmp, _manifest_path(snapshot_path))
+    return manifest
+
+
+def restore_snapshot(
+    database_url: str,
+    snapshot_path: Path,
+    organizer_email: str,
+    organizer_password: str,
+    attendee_bootstrap_password: str,
+) -> str:
+    """Copy a current snapshot into place when the SQLite database file does not exist yet.
+
+    Returns "restored" or a short reason the snapshot was not used.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+        return "skipped: not a sqlite file"
+    target = Path(url.database)
+    if target.exists():
+        return "skipped: database exists"
+    manifest_path = _manifest_path(snapshot_path)
+    if not snapshot_path.exists() or not manifest_path.exists():
+        return "skipped: no snapshot"
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except ValueError:
+        return "skipped: unreadable manifest"
+
+    expected = snapshot_fingerprint(organizer_email, organizer_password, attendee_bootstrap_password)
+    stale = sorted(key for key, value in expected.items() if manifest.get(key) != value)
+    if stale:
+        return "skipped: stale " + ",".join(stale)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, raw_path = tempfile.mkstemp(prefix=".restore-", suffix=".db", dir=target.parent)
+    os.close(fd)
+    tmp_path = Path(raw_path)
+    try:
+        shutil.copyfile(snapshot_path, tmp_path)
+        if _sha256_file(tmp_path) != manifest.get("db_sha256"):
+            return "skipped: checksum mismatch"
+        # link() refuses to overwrite, so a worker that lost the race leaves the winner's copy alone.
+        os.link(tmp_path, target)
+    except FileExistsError:
+        return "skipped: database exists"
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return "restored"
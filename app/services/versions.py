@@ -0,0 +1,50 @@
+import secrets
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.models import AppCounter, Feedback, MatchResult
+
+EVENT_VERSION_KEY = "event_data_version"
+
+
+def bump_event_version(db: Session):
+    """Advance the event-wide data version inside the caller's transaction.
+
+    Call it alongside any write that changes what matching or scenarios read
+    (attendee rows or their signal tags) so it commits with that write.
+    """
+    db.execute(update(AppCounter).where(AppCounter.name == EVENT_VERSION_KEY).values(value=AppCounter.value + 1))
+
+
+def ensure_event_counter(db: Session):
+    """Create the event data version counter if it is missing; the caller commits.
+
+    A random start keeps a recreated database from reusing versions that
+    in-process caches and client ETags already associate with other data.
+    """
+    if db.get(AppCounter, EVENT_VERSION_KEY) is None:
+        db.add(AppCounter(name=EVENT_VERSION_KEY, value=secrets.randbelow(2**30)))
+        db.flush()
+
+
+def event_version(db: Session) -> int:
+    # Read-only: the counter is created at startup and when seeding, never on a GET.
+    return db.query(AppCounter.value).filter(AppCounter.name == EVENT_VERSION_KEY).scalar() or 0
+
+
+def match_version(db: Session, attendee_id: int) -> list[int]:
+    """Version of an attendee's stored matches and of the feedback that scores them.
+
+    Match and feedback ids only grow (matches use AUTOINCREMENT), so the maxima
+    change whenever matches are rebuilt or new feedback arrives.
+    """
+    latest_match = db.query(func.max(MatchResult.id)).filter(MatchResult.attendee_id == attendee_id).scalar()
+    latest_feedback = db.query(func.max(Feedback.id)).filter(Feedback.attendee_id == attendee_id).scalar()
+    return [event_version(db), latest_match or 0, latest_feedback or 0]
+
+
+def feedback_version(db: Session) -> list[int]:
+    # The count catches deletions, which do not move the maximum id.
+    count, latest = db.query(func.count(Feedback.id), func.max(Feedback.id)).one()
+    return [count or 0, latest or 0]
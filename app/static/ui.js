@@ -98,3 +98,116 @@
   window.setTimeout(syncLayoutState, 150);
   syncLayoutState();
 })();
+
+(() => {
+  const panel = document.querySelector("[data-import-job]");
+  if (!panel) {
+    return;
+  }
+  const statusEl = panel.querySelector("[data-import-status]");
+  const jobId = panel.getAttribute("data-import-job");
+
+  const render = (job) => {
+    const percent = Math.round((job.progress || 0) * 100);
+    let text = `Import job #${job.id} ${job.status}: ${job.rows_processed} rows (${percent}%), created=${job.created}, failed=${job.failed}, ${job.rows_per_second} rows/s`;
+    if (job.error) {
+      text += ` | ${job.error}`;
+    }
+    if (job.errors && job.errors.length) {
+      text += ` | sample errors: ${job.errors.join("; ")}`;
+    }
+    statusEl.textContent = text;
+  };
+
+  const poll = async () => {
+    try {
+      const resp = await fetch(`/organizer/imports/${jobId}`, { credentials: "same-origin" });
+      if (!resp.ok) {
+        return;
+      }
+      const job = await resp.json();
+      render(job);
+      if (job.status === "queued" || job.status === "running") {
+        window.setTimeout(poll, 1500);
+      }
+    } catch (_err) {
+      window.setTimeout(poll, 5000);
+    }
+  };
+
+  poll();
+})();
+
+(() => {
+  const slots = Array.from(document.querySelectorAll("[data-fragment]"));
+  if (!slots.length) {
+    return;
+  }
+
+  const showError = (slot) => {
+    const link = document.createElement("a");
+    link.href = window.location.pathname;
+    link.textContent = "Reload";
+    const message = document.createElement("p");
+    message.className = "small";
+    message.append("This section could not be loaded. ", link);
+    slot.replaceChildren(message);
+  };
+
+  const load = async (slot) => {
+    try {
+      const resp = await fetch(slot.getAttribute("data-fragment"), { credentials: "same-origin" });
+      if (!resp.ok) {
+        throw new Error(`HTTP ${resp.status}`);
+      }
+      slot.innerHTML = await resp.text();
+      slot.setAttribute("data-fragment-loaded", "");
+    } catch (_err) {
+      // A failed refresh keeps the section that is already on screen.
+      if (!slot.hasAttribute("data-fragment-loaded")) {
+        showError(slot);
+      }
+    }
+  };
+
+  // Each section is requested on its own, so a slow one never holds back the others.
+  slots.forEach((slot) => {
+    slot.addEventListener("fragment:refresh", () => load(slot));
+    if (!slot.hasAttribute("data-fragment-loaded")) {
+      load(slot);
+    }
+  });
+})();
+
+(() => {
+  const notice = document.querySelector("[data-event-stream]");
+  if (!notice || !window.EventSource) {
+    return;
+  }
+  const messages = {
+    intro_created: "You have a new intro request.",
+    intro_accepted: "One of your intro requests was accepted.",
+    intro_declined: "One of your intro requests was declined.",
+    matches_updated: "Your recommended matches changed.",
+  };
+  const pending = new Set();
+
+  const show = (type) => {
+    const sections = document.querySelectorAll(`[data-fragment-events~="${type}"]`);
+    if (sections.length) {
+      sections.forEach((section) => section.dispatchEvent(new CustomEvent("fragment:refresh")));
+      return;
+    }
+    pending.add(messages[type]);
+    const link = document.createElement("a");
+    link.href = window.location.pathname;
+    link.textContent = "Refresh";
+    notice.replaceChildren(`${Array.from(pending).join(" ")} `, link);
+    notice.hidden = false;
+  };
+
+  // EventSource reconnects on its own using the server's retry hint.
+  const source = new EventSource(notice.getAttribute("data-event-stream"), { withCredentials: true });
+  Object.keys(messages).forEach((type) => source.addEventListener(type, () => show(type)));
+  window.addEventListener("pagehide", () => source.close());
+})();
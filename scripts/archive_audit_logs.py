@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.database import Base, SessionLocal, engine, ensure_schema_compat
+from app.services.audit import AUDIT_ARCHIVE_DIR, AUDIT_RETENTION_DAYS, archive_audit_logs, write_audit_log
+
+SYSTEM_ACTOR = {"role": "system", "label": "audit-retention"}
+
+
+def run_archive():
+    Base.metadata.create_all(bind=engine)
+    ensure_schema_compat()
+    db = SessionLocal()
+    try:
+        result = archive_audit_logs(db, retention_days=AUDIT_RETENTION_DAYS, archive_dir=AUDIT_ARCHIVE_DIR)
+        write_audit_log(
+            db,
+            SYSTEM_ACTOR,
+            "archive_audit_logs",
+            "audit_log",
+            "",
+            "success",
+            {"archived": result["archived"], "files": len(result["files"]), "cutoff": result["cutoff"]},
+        )
+        print(
+            f"Archived {result['archived']} audit rows older than {result['cutoff']} "
+            f"into {len(result['files'])} file(s) under {AUDIT_ARCHIVE_DIR}."
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run_archive()
@@ -14,6 +14,7 @@ if str(ROOT) not in sys.path:
 from app.database import Base
 from app.models import Attendee
 from app.services.matching import build_matches_for_attendee
+from app.services.metrics import request_timing
 
 
 ROLES = [
@@ -71,16 +72,24 @@ def run_benchmark():
         seed_attendees(db, 2500)
         ids = [row.id for row in db.query(Attendee.id).limit(30).all()]
         durations = []
-        for attendee_id in ids:
-            start = time.perf_counter()
-            build_matches_for_attendee(db, attendee_id, top_n=5)
-            durations.append((time.perf_counter() - start) * 1000)
+        with request_timing() as timing:
+            for attendee_id in ids:
+                start = time.perf_counter()
+                build_matches_for_attendee(db, attendee_id, top_n=5)
+                durations.append((time.perf_counter() - start) * 1000)
 
         p50 = statistics.median(durations)
         p95 = sorted(durations)[max(0, int(len(durations) * 0.95) - 1)]
         avg = statistics.mean(durations)
         print(f"Benchmark with 2500 attendees over {len(durations)} runs")
         print(f"avg={avg:.2f}ms p50={p50:.2f}ms p95={p95:.2f}ms")
+        print("Per-run phase averages (ms):")
+        for phase, seconds in timing.phases.items():
+            if phase.startswith("matching."):
+                print(f"  {phase:<20} {seconds * 1000 / len(durations):8.2f}")
+        print("Per-run candidate counts:")
+        for item, value in timing.counts.items():
+            print(f"  {item:<32} {value // len(durations)}")
     finally:
         db.close()
 
@@ -0,0 +1,99 @@
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.main import ModelJSONResponse
+from app.schemas import MatchesView, MatchView, ScenariosView, ScenarioView
+from app.services.scenarios import MAX_SCENARIO_RESULTS
+
+RUNS = 200
+
+
+def scenario_rows(count: int = MAX_SCENARIO_RESULTS) -> list[dict]:
+    explanation = (
+        "Attendee {i}'s compliance-focused infrastructure aligns with the institutional custody and "
+        "compliant deployment needs of a regulated bank, with a shared roadmap for tokenised settlement."
+    )
+    return [
+        {
+            "type": "triad_synergy" if i % 3 else "pair_synergy",
+            "title": "Series Pathway Chain" if i % 3 else "Compliance Infrastructure Fit",
+            "participants": [f"Attendee {i}", f"Attendee {i + 1}", f"Attendee {i + 2}"][: 3 if i % 3 else 2],
+            "explanation": explanation.format(i=i),
+        }
+        for i in range(count)
+    ]
+
+
+def match_rows(count: int = 5) -> list[dict]:
+    return [
+        {
+            "match_id": 1000 + i,
+            "candidate_id": 10 + i,
+            "candidate_name": f"Candidate {i}",
+            "candidate_role": "Managing Partner",
+            "candidate_company": "Crypto VC",
+            "score": 82.5 - i,
+            "exploration_flag": i == count - 1,
+            "reasons": [
+                "Your primary goal (Investment) aligns with their current focus.",
+                "You bring complementary value: Founder & CEO and Managing Partner.",
+                "You both have overlapping declared availability windows.",
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def _time(render) -> list[float]:
+    durations = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        render()
+        durations.append((time.perf_counter() - start) * 1_000_000)
+    return durations
+
+
+def _report(label: str, baseline: list[float], fast: list[float], size: int):
+    base_p50, fast_p50 = statistics.median(baseline), statistics.median(fast)
+    print(
+        f"{label:<10} {size:>7}B  dict+jsonable_encoder p50={base_p50:8.1f}us  "
+        f"model_dump_json p50={fast_p50:8.1f}us  speedup={base_p50 / fast_p50:4.1f}x"
+    )
+
+
+def run_benchmark():
+    scenarios = scenario_rows()
+    matches = match_rows()
+
+    def current_scenarios():
+        return JSONResponse(jsonable_encoder({"scenarios": scenarios})).body
+
+    def fast_scenarios():
+        view = ScenariosView.model_construct(scenarios=[ScenarioView.model_construct(**row) for row in scenarios])
+        return ModelJSONResponse(view).body
+
+    def current_matches():
+        return JSONResponse(jsonable_encoder({"attendee_id": 1, "matches": matches})).body
+
+    def fast_matches():
+        view = MatchesView.model_construct(
+            attendee_id=1, matches=[MatchView.model_construct(**row) for row in matches]
+        )
+        return ModelJSONResponse(view).body
+
+    print(f"Serialisation benchmark, median of {RUNS} runs (response object construction included)")
+    _report("scenarios", _time(current_scenarios), _time(fast_scenarios), len(fast_scenarios()))
+    _report("matches", _time(current_matches), _time(fast_matches), len(fast_matches()))
+
+
+if __name__ == "__main__":
+    run_benchmark()
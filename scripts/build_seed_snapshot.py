@@ -0,0 +1,23 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.snapshot import SEED_SNAPSHOT_PATH, build_snapshot
+
+ORGANIZER_EMAIL = os.getenv("ORGANIZER_EMAIL", "organizer@pot.local")
+ORGANIZER_PASSWORD = os.getenv("ORGANIZER_PASSWORD", "organizer123")
+ATTENDEE_BOOTSTRAP_PASSWORD = os.getenv("ATTENDEE_BOOTSTRAP_PASSWORD", "attendee123")
+
+
+def main():
+    manifest = build_snapshot(SEED_SNAPSHOT_PATH, ORGANIZER_EMAIL, ORGANIZER_PASSWORD, ATTENDEE_BOOTSTRAP_PASSWORD)
+    print(f"Wrote {SEED_SNAPSHOT_PATH} (sha256 {manifest['db_sha256'][:12]}).")
+    print("Timings (ms): " + ", ".join(f"{stage}={ms}" for stage, ms in manifest["timings_ms"].items()))
+
+
+if __name__ == "__main__":
+    main()
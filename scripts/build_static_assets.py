@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services.assets import STATIC_DIR, build_assets
+
+
+def main():
+    manifest = build_assets(STATIC_DIR)
+    print(f"Wrote {len(manifest)} hashed assets to {STATIC_DIR / 'dist'}.")
+    for name, entry in sorted(manifest.items()):
+        print(f"  {name} -> {entry['path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-import json
 import os
 import sys
 from pathlib import Path
@@ -10,7 +9,7 @@ if str(ROOT) not in sys.path:
 from app.database import SessionLocal
 from app.models import AppUser, Attendee, Base
 from app.database import engine
-from app.services.security import hash_password
+from app.services.bootstrap import seed_demo_data_if_empty
 
 ORGANIZER_EMAIL = os.getenv("ORGANIZER_EMAIL", "organizer@pot.local")
 ORGANIZER_PASSWORD = os.getenv("ORGANIZER_PASSWORD", "organizer123")
@@ -22,42 +21,15 @@ def seed():
     Base.metadata.create_all(bind=engine)
     db = SessionLocal()
     try:
-        db.query(AppUser).delete()
-        db.query(Attendee).delete()
-        db.commit()
-
-        source = Path("data/seed/attendees.json")
-        rows = json.loads(source.read_text())
-        for row in rows:
-            db.add(Attendee(**row))
-        db.commit()
-
-        attendees = db.query(Attendee).order_by(Attendee.id.asc()).all()
-        db.add(
-            AppUser(
-                email=ORGANIZER_EMAIL,
-                role="organizer",
-                password_hash=hash_password(ORGANIZER_PASSWORD),
-                failed_attempts=0,
-                locked_until=0,
-            )
-        )
-        for attendee in attendees:
-            db.add(
-                AppUser(
-                    email=f"attendee-{attendee.id}@pot.local",
-                    role="attendee",
-                    attendee_id=attendee.id,
-                    password_hash=hash_password(f"{ATTENDEE_BOOTSTRAP_PASSWORD}-{attendee.id}"),
-                    failed_attempts=0,
-                    locked_until=0,
-                )
-            )
-        db.commit()
+        timings: dict[str, float] = {}
+        seed_demo_data_if_empty(db, ORGANIZER_EMAIL, ORGANIZER_PASSWORD, ATTENDEE_BOOTSTRAP_PASSWORD, timings=timings)
+        attendee_count = db.query(Attendee).count()
+        user_count = db.query(AppUser).count()
         print(
-            f"Seeded {len(rows)} attendees and {len(attendees) + 1} users "
+            f"Seeded {attendee_count} attendees and {user_count} users "
             "(organizer + per-attendee login credentials)."
         )
+        print("Timings (ms): " + ", ".join(f"{stage}={ms}" for stage, ms in timings.items()))
     finally:
         db.close()
 
@@ -0,0 +1,70 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base
+from app.models import AuditLog
+from app.services.audit import AuditFilters, archive_audit_logs, audit_log_page, iter_audit_logs
+
+
+def _db() -> Session:
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return TestingSessionLocal()
+
+
+def _seed_logs(db: Session, count: int, created_at: datetime | None = None):
+    for i in range(count):
+        db.add(
+            AuditLog(
+                actor_role="organizer" if i % 2 == 0 else "attendee",
+                action="login" if i % 3 == 0 else "submit_feedback",
+                status="success",
+                created_at=created_at or datetime(2026, 6, 1, 12, 0, 0),
+            )
+        )
+    db.commit()
+
+
+def test_audit_keyset_pages_walk_filtered_rows_without_gaps():
+    db = _db()
+    _seed_logs(db, 30)
+    filters = AuditFilters(actor_role="organizer")
+    expected = [row.id for row in db.query(AuditLog).filter(AuditLog.actor_role == "organizer").order_by(AuditLog.id.desc())]
+
+    seen = []
+    before = 0
+    while True:
+        rows, cursors = audit_log_page(db, filters, before_id=before, limit=4)
+        seen.extend(row.id for row in rows)
+        if not cursors["older"]:
+            break
+        before = cursors["older"]
+    assert seen == expected
+
+    rows, cursors = audit_log_page(db, filters, after_id=expected[-1], limit=4)
+    assert [row.id for row in rows] == expected[-5:-1]
+    assert cursors["newer"] is not None
+
+
+def test_archive_moves_expired_rows_to_compressed_files(tmp_path):
+    db = _db()
+    now = datetime(2026, 10, 1)
+    _seed_logs(db, 7, created_at=now - timedelta(days=120))
+    _seed_logs(db, 3, created_at=now - timedelta(days=5))
+
+    result = archive_audit_logs(db, retention_days=90, archive_dir=tmp_path, batch_size=3, now=now)
+    assert result["archived"] == 7
+    assert len(result["files"]) == 3
+    assert db.query(AuditLog).count() == 3
+
+    archived_ids = []
+    for name in result["files"]:
+        with gzip.open(tmp_path / name, "rt", encoding="utf-8") as fh:
+            archived_ids.extend(json.loads(line)["id"] for line in fh)
+    assert archived_ids == list(range(1, 8))
+    assert [row.id for row in iter_audit_logs(db, AuditFilters())] == [8, 9, 10]
@@ -1,10 +1,14 @@
-from urllib.parse import unquote_plus
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
 
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.database import SessionLocal
-from app.models import AppUser, Attendee, ExternalSignal
+from app.models import AppUser, Attendee, AuditLog, ExternalSignal
+from app.services import security
 from scripts.seed_data import seed
 
 
@@ -24,6 +28,18 @@ def _login_organizer(client: TestClient):
     assert resp.status_code == 303
 
 
+def _wait_for_import(client: TestClient, response) -> dict:
+    assert response.status_code == 303
+    job_id = parse_qs(urlparse(response.headers["location"]).query)["import_job"][0]
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        job = client.get(f"/organizer/imports/{job_id}").json()
+        if job["status"] not in {"queued", "running"}:
+            return job
+        time.sleep(0.05)
+    raise AssertionError("import job did not finish")
+
+
 def test_attendee_uses_per_attendee_passcode_pattern():
     seed()
     client = TestClient(app)
@@ -113,7 +129,10 @@ def test_linkedin_opt_in_enrichment_is_persisted(monkeypatch):
     client = TestClient(app)
     _login_organizer(client)
 
-    monkeypatch.setattr("app.main.extract_linkedin_summary", lambda _url: "LinkedIn summary with investment thesis")
+    async def fake_linkedin_summary(_url):
+        return "LinkedIn summary with investment thesis"
+
+    monkeypatch.setattr("app.main.extract_linkedin_summary", fake_linkedin_summary)
 
     csrf = client.cookies.get("csrf_token")
     resp = client.post(
@@ -144,7 +163,7 @@ def test_linkedin_opt_in_enrichment_is_persisted(monkeypatch):
         assert attendee is not None
         assert attendee.linkedin_opt_in is True
         assert attendee.linkedin_url == "https://www.linkedin.com/in/test-profile"
-        assert "LinkedIn summary with investment thesis" in attendee.focus_text
+        assert attendee.signal_tags.split() == ["linkedin", "summary", "investment", "thesis"]
 
         signal = (
             db.query(ExternalSignal)
@@ -163,7 +182,10 @@ def test_organizer_delete_attendee_requires_confirmation_and_cleans_related_rows
     seed()
     client = TestClient(app)
     _login_organizer(client)
-    monkeypatch.setattr("app.main.extract_linkedin_summary", lambda _url: "LinkedIn summary used for delete test")
+    async def fake_linkedin_summary(_url):
+        return "LinkedIn summary used for delete test"
+
+    monkeypatch.setattr("app.main.extract_linkedin_summary", fake_linkedin_summary)
 
     csrf = client.cookies.get("csrf_token")
     created = client.post(
@@ -256,10 +278,10 @@ def test_bulk_import_csv_creates_multiple_attendees():
         files={"upload_file": ("attendees.csv", csv_payload, "text/csv")},
         follow_redirects=False,
     )
-    assert response.status_code == 303
-    decoded_location = unquote_plus(response.headers["location"])
-    assert "created=2" in decoded_location
-    assert "failed=0" in decoded_location
+    job = _wait_for_import(client, response)
+    assert job["status"] == "completed"
+    assert job["created"] == 2
+    assert job["failed"] == 0
 
     db = SessionLocal()
     try:
@@ -290,11 +312,10 @@ def test_bulk_import_partial_failure_reports_row_errors():
         files={"upload_file": ("attendees.csv", csv_payload, "text/csv")},
         follow_redirects=False,
     )
-    assert response.status_code == 303
-    decoded_location = unquote_plus(response.headers["location"])
-    assert "created=1" in decoded_location
-    assert "failed=1" in decoded_location
-    assert "row 3: name is required" in decoded_location
+    job = _wait_for_import(client, response)
+    assert job["created"] == 1
+    assert job["failed"] == 1
+    assert "row 3: name is required" in job["errors"]
 
     db = SessionLocal()
     try:
@@ -302,3 +323,416 @@ def test_bulk_import_partial_failure_reports_row_errors():
         assert db.query(Attendee).filter(Attendee.company == "BadCo").first() is None
     finally:
         db.close()
+
+
+def test_audit_log_filters_and_ndjson_export():
+    seed()
+    client = TestClient(app)
+    _login_organizer(client)
+
+    page = client.get("/organizer/audit", params={"action": "login", "status": "success"})
+    assert page.status_code == 200
+    assert "Export NDJSON" in page.text
+
+    export = client.get("/organizer/audit/export.ndjson", params={"action": "login"})
+    assert export.status_code == 200
+    assert export.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in export.text.splitlines()]
+    assert lines
+    assert all(line["action"] == "login" for line in lines)
+
+    bad = client.get("/organizer/audit", params={"since": "not-a-date"})
+    assert bad.status_code == 400
+
+
+def test_bulk_import_rejects_duplicate_logins_and_records_stage_timings():
+    seed()
+    client = TestClient(app)
+    _login_organizer(client)
+
+    csv_payload = (
+        "name,role,company,primary_goal,login_email,temp_password\n"
+        "Dup One,Founder & CEO,DupCo,Investment,dup@example.com,TempPass123!\n"
+        "Dup Two,CTO,DupCo,Partnerships,dup@example.com,TempPass123!\n"
+        "Plain Three,CTO,PlainCo,Partnerships,,\n"
+    )
+    csrf = client.cookies.get("csrf_token")
+    response = client.post(
+        "/organizer/attendees/import",
+        data={"csrf_token": csrf},
+        files={"upload_file": ("attendees.csv", csv_payload, "text/csv")},
+        follow_redirects=False,
+    )
+    job = _wait_for_import(client, response)
+    assert job["created"] == 2
+    assert "row 3: login_email dup@example.com is already in use" in job["errors"]
+
+    db = SessionLocal()
+    try:
+        plain = db.query(Attendee).filter(Attendee.name == "Plain Three").first()
+        user = db.query(AppUser).filter(AppUser.attendee_id == plain.id).first()
+        assert user.email == f"attendee-{plain.id}@pot.local"
+        log = (
+            db.query(AuditLog)
+            .filter(AuditLog.action == "bulk_import_attendees")
+            .order_by(AuditLog.id.desc())
+            .first()
+        )
+        assert json.loads(log.details)["job_id"] == job["id"]
+        timings = json.loads(log.details)["timings_ms"]
+        assert {"parse", "validate", "insert_attendees", "hash_passwords", "insert_users"} <= set(timings)
+    finally:
+        db.close()
+
+
+def test_bulk_import_streams_json_object_payload():
+    seed()
+    client = TestClient(app)
+    _login_organizer(client)
+
+    rows = [
+        {"name": f"Json User {idx}", "role": "CTO", "company": "JsonCo", "primary_goal": "Partnerships", "seed_confidence": 0.5}
+        for idx in range(1, 4)
+    ]
+    payload = json.dumps({"source": {"nested": [1, 2]}, "attendees": rows}, indent=2)
+    csrf = client.cookies.get("csrf_token")
+    response = client.post(
+        "/organizer/attendees/import",
+        data={"csrf_token": csrf},
+        files={"upload_file": ("attendees.json", payload, "application/json")},
+        follow_redirects=False,
+    )
+    job = _wait_for_import(client, response)
+    assert job["status"] == "completed"
+    assert job["created"] == 3
+    assert job["progress"] == 1.0
+
+
+def test_invite_provisioning_defers_hashing_and_redeems_once(monkeypatch):
+    monkeypatch.setattr("app.services.security.CREDENTIAL_PROVISIONING", "invite")
+    seed()
+    db = SessionLocal()
+    try:
+        hashes = [row.password_hash for row in db.query(AppUser).filter(AppUser.role == "attendee")]
+        organizer = db.query(AppUser).filter(AppUser.role == "organizer").first()
+        assert hashes and all(h.startswith("invite$") for h in hashes)
+        assert organizer.password_hash.startswith("pbkdf2_sha256$")
+    finally:
+        db.close()
+
+    client = TestClient(app)
+    _login_organizer(client)
+    assert client.get("/organizer/attendees/2/invite").status_code == 405
+    assert client.post("/organizer/attendees/2/invite").status_code == 403
+    csrf_headers = {"x-csrf-token": client.cookies.get("csrf_token")}
+    invite = client.post("/organizer/attendees/2/invite", headers=csrf_headers)
+    assert invite.status_code == 200
+    invite_url = invite.json()["invite_url"]
+
+    guest = TestClient(app)
+    assert guest.get(invite_url).status_code == 200
+    csrf = guest.cookies.get("csrf_token")
+    weak = guest.post(invite_url, data={"csrf_token": csrf, "password": "short", "confirm_password": "short"})
+    assert "Password must" in weak.text
+    strong = "Summit-Access-2026!"
+    redeemed = guest.post(
+        invite_url,
+        data={"csrf_token": csrf, "password": strong, "confirm_password": strong},
+        follow_redirects=False,
+    )
+    assert redeemed.status_code == 303
+    assert redeemed.headers["location"] == "/attendees/2"
+
+    replay = TestClient(app)
+    assert replay.get(invite_url).status_code == 410
+    assert client.post("/organizer/attendees/2/invite", headers=csrf_headers).status_code == 409
+
+    # Attendees without an invite can still use the bootstrap passcode; it is hashed on first use.
+    replay.get("/login")
+    login = replay.post(
+        "/login",
+        data={"role": "attendee", "csrf_token": replay.cookies.get("csrf_token"), "attendee_id": 3, "passcode": "attendee123-3"},
+        follow_redirects=False,
+    )
+    assert login.status_code == 303
+    db = SessionLocal()
+    try:
+        assert db.query(AppUser).filter(AppUser.attendee_id == 3).one().password_hash.startswith("pbkdf2_sha256$")
+    finally:
+        db.close()
+
+
+def test_login_sheds_load_with_503_when_password_pool_is_full(monkeypatch):
+    seed()
+    full_pool = security.PasswordWorkPool(workers=1, max_queue=0)
+    release = threading.Event()
+    full_pool.submit(release.wait, 5)
+    monkeypatch.setattr("app.main.password_pool", full_pool)
+
+    client = TestClient(app)
+    client.get("/login")
+    try:
+        response = client.post(
+            "/login",
+            data={
+                "role": "organizer",
+                "csrf_token": client.cookies.get("csrf_token"),
+                "email": "organizer@pot.local",
+                "password": "organizer123",
+            },
+        )
+    finally:
+        release.set()
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert full_pool.stats()["rejected"] == 1
+
+
+def test_login_limit_holds_while_the_shared_limiter_file_is_locked(tmp_path, monkeypatch):
+    import sqlite3
+
+    from app.services.rate_limit import SQLiteRateLimiter
+
+    path = tmp_path / "limits.db"
+    limiter = SQLiteRateLimiter(path)
+    assert limiter.allow("warmup", 1, 60)
+    monkeypatch.setattr("app.main.rate_limiter", limiter)
+    client = TestClient(app)
+
+    # Another process hogging the write lock must not switch the brute-force limit off.
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        statuses = [client.post("/login", data={"role": "organizer"}).status_code for _ in range(21)]
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+    assert statuses[:20] == [403] * 20
+    assert statuses[20] == 429
+
+
+def test_poll_endpoints_answer_304_from_data_versions_without_recomputing(monkeypatch):
+    seed()
+    client = TestClient(app)
+    _login_organizer(client)
+    csrf = {"x-csrf-token": client.cookies.get("csrf_token")}
+
+    first = client.get("/v1/matches/2")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert first.headers["x-content-type-options"] == "nosniff"
+    scenarios_etag = client.get("/v1/scenarios").headers["etag"]
+    metrics_etag = client.get("/v1/organizer/metrics").headers["etag"]
+
+    def fail_rebuild(*args, **kwargs):
+        raise AssertionError("recomputed for an unchanged version")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("app.main.build_matches_for_attendee", fail_rebuild)
+        patch.setattr("app.main.strategic_scenarios", fail_rebuild)
+        cached = client.get("/v1/matches/2", headers={"if-none-match": etag})
+        assert cached.status_code == 304 and cached.headers["etag"] == etag and not cached.content
+        assert client.get("/v1/scenarios", headers={"if-none-match": scenarios_etag}).status_code == 304
+    assert client.get("/v1/organizer/metrics", headers={"if-none-match": metrics_etag}).status_code == 304
+
+    # Tags are keyed to the caller: another user's ETag never validates.
+    attendee = TestClient(app)
+    attendee.get("/login")
+    attendee.post(
+        "/login",
+        data={
+            "role": "attendee",
+            "csrf_token": attendee.cookies.get("csrf_token"),
+            "attendee_id": 2,
+            "passcode": "attendee123-2",
+        },
+    )
+    organizer_etag = client.get("/v1/matches/2").headers["etag"]
+    assert attendee.get("/v1/matches/2", headers={"if-none-match": organizer_etag}).status_code == 200
+
+    created = client.post(
+        "/v1/attendees",
+        json={"name": "Version Bump", "role": "CTO", "company": "Chain Co", "primary_goal": "Infrastructure"},
+        headers=csrf,
+    )
+    assert created.status_code == 200
+    assert client.get("/v1/scenarios", headers={"if-none-match": scenarios_etag}).status_code == 200
+    refreshed = client.get("/v1/matches/2", headers={"if-none-match": organizer_etag})
+    assert refreshed.status_code == 200
+
+    feedback = client.post(
+        "/v1/feedback",
+        json={
+            "attendee_id": 2,
+            "match_id": refreshed.json()["matches"][0]["match_id"],
+            "rating": 5,
+            "outcome": "met",
+            "comment": "",
+        },
+        headers=csrf,
+    )
+    assert feedback.status_code == 200
+    assert client.get("/v1/organizer/metrics", headers={"if-none-match": metrics_etag}).status_code == 200
+    # New feedback moves the match version, so this rebuilds the matches the feedback points at.
+    rebuilt = client.get("/v1/matches/2", headers={"if-none-match": refreshed.headers["etag"]})
+    assert rebuilt.status_code == 200
+
+
+def test_attendee_event_stream_pushes_intro_updates_and_caps_connections(monkeypatch):
+    import asyncio
+
+    import app.main as main_module
+    from app.services.events import event_broker
+
+    seed()
+    monkeypatch.setattr(main_module, "EVENT_STREAM_HEARTBEAT_SECONDS", 0.05)
+    client = TestClient(app)
+    _login_organizer(client)
+    cookie = "; ".join(f"{name}={value}" for name, value in client.cookies.items())
+
+    # TestClient buffers whole responses, so the endless stream is driven as a raw ASGI call.
+    async def open_stream(until: bytes) -> tuple[dict, bytes]:
+        disconnected = asyncio.Event()
+        received = asyncio.Event()
+        messages = []
+
+        async def receive():
+            if not messages:
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+            if until in b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body"):
+                received.set()
+
+        path = "/v1/attendees/3/events"
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        task = asyncio.create_task(app(scope, receive, send))
+        if until:
+            while event_broker.stats()["connections"] == 0 and not task.done():
+                await asyncio.sleep(0.01)
+            await asyncio.to_thread(event_broker.publish, 3, "intro_created", {"intro_id": 9, "requester_id": 1})
+            await asyncio.wait_for(received.wait(), 5)
+        disconnected.set()
+        await asyncio.wait_for(task, 5)
+        body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+        return messages[0], body
+
+    start, body = asyncio.run(open_stream(b"event: intro_created"))
+    assert start["status"] == 200
+    assert dict(start["headers"])[b"content-type"].startswith(b"text/event-stream")
+    assert body.startswith(b"retry: ")
+    assert b'data: {"intro_id":9,"requester_id":1}' in body
+    assert event_broker.stats()["connections"] == 0
+
+    monkeypatch.setattr(event_broker, "max_connections", 0)
+    start, _body = asyncio.run(open_stream(b""))
+    assert start["status"] == 503
+    assert dict(start["headers"])[b"retry-after"] == b"30"
+
+
+def test_ranking_writes_publish_matches_updated_and_match_reads_do_not(monkeypatch):
+    import asyncio
+
+    from app.services.events import EventBroker, event_broker
+
+    async def fan_out():
+        broker = EventBroker()
+        first, second = broker.subscribe(1), broker.subscribe(2)
+        broker.publish_all("matches_updated", {"reason": "signals"})
+        await asyncio.sleep(0)
+        return [subscription.queue.get_nowait()["event"] for subscription in (first, second)]
+
+    assert asyncio.run(fan_out()) == ["matches_updated", "matches_updated"]
+
+    seed()
+    published = []
+    monkeypatch.setattr(event_broker, "publish", lambda *args: published.append(args))
+    monkeypatch.setattr(event_broker, "publish_all", lambda *args: published.append(args))
+    client = TestClient(app)
+    _login_organizer(client)
+    csrf = {"x-csrf-token": client.cookies.get("csrf_token")}
+
+    assert client.get("/attendees/2/fragments/matches").status_code == 200
+    matches = client.get("/v1/matches/2").json()["matches"]
+    assert published == []
+
+    created = client.post(
+        "/v1/attendees",
+        json={"name": "Pool Change", "role": "CTO", "company": "Chain Co", "primary_goal": "Infrastructure"},
+        headers=csrf,
+    )
+    assert created.status_code == 200
+    assert published == [("matches_updated", {"reason": "attendee_added"})]
+
+    feedback = client.post(
+        "/v1/feedback",
+        json={"attendee_id": 2, "match_id": matches[0]["match_id"], "rating": 4, "outcome": "met", "comment": ""},
+        headers=csrf,
+    )
+    assert feedback.status_code == 200
+    assert published[-1] == (2, "matches_updated", {"reason": "feedback"})
+
+
+def test_attendee_page_is_a_shell_with_independently_cached_fragments(monkeypatch):
+    from app.services.scenarios import scenario_cache
+
+    seed()
+    client = TestClient(app)
+    client.get("/login")
+    client.post(
+        "/login",
+        data={
+            "role": "attendee",
+            "csrf_token": client.cookies.get("csrf_token"),
+            "attendee_id": 2,
+            "passcode": "attendee123-2",
+        },
+    )
+
+    def fail_compute(*args, **kwargs):
+        raise AssertionError("the shell computed a section")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("app.main.build_matches_for_attendee", fail_compute)
+        patch.setattr("app.main.event_scenarios", fail_compute)
+        shell = client.get("/attendees/2")
+    assert shell.status_code == 200
+    for section in ("matches", "intros", "scenarios"):
+        assert f'data-fragment="/attendees/2/fragments/{section}"' in shell.text
+
+    matches = client.get("/attendees/2/fragments/matches")
+    assert matches.status_code == 200 and "Request Intro" in matches.text
+    assert "<html" not in matches.text
+    assert client.get("/attendees/2/fragments/intros").status_code == 200
+
+    scenario_cache.clear()
+    first = client.get("/attendees/2/fragments/scenarios")
+    again = client.get("/attendees/2/fragments/scenarios")
+    assert first.text == again.text
+    assert scenario_cache.misses >= 1 and scenario_cache.hits >= 1
+
+    with monkeypatch.context() as patch:
+        patch.setattr("app.main.build_matches_for_attendee", fail_compute)
+        cached = client.get("/attendees/2/fragments/matches", headers={"if-none-match": matches.headers["etag"]})
+    assert cached.status_code == 304
+
+    inline = client.get("/attendees/2?inline=1")
+    assert "Request Intro" in inline.text and "Loading matches" not in inline.text
+    assert client.get("/attendees/3/fragments/matches").status_code == 403
+    assert client.get("/attendees/2/fragments/audit").status_code == 404
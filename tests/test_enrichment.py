@@ -0,0 +1,415 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal
+from app.main import app
+from app.models import Attendee, EnrichmentCacheEntry, EnrichmentJob, ExternalSignal
+from app.services import enrichment_jobs, external_enrichment
+from app.services.enrichment_cache import EnrichmentCache
+from app.services.profile import build_profile
+from app.services.signals import MAX_SIGNAL_TAGS, record_signal, record_signals, summary_tags
+from app.services.external_enrichment import (
+    EnrichmentClient,
+    ResolutionCache,
+    _PinnedNetworkBackend,
+    extract_company_summary,
+    fetch_company_summary,
+)
+from scripts.seed_data import seed
+
+
+def _html_response(body: str) -> httpx.Response:
+    return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, text=body)
+
+
+def test_company_summary_reuses_shared_client_and_validates_each_redirect_hop(monkeypatch):
+    validated = []
+
+    def fake_validate(url):
+        validated.append(url)
+        return urlparse(url)
+
+    monkeypatch.setattr(external_enrichment, "_validate_public_https_url", fake_validate)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/old":
+            return httpx.Response(301, headers={"location": "https://example.com/about"})
+        return _html_response("<html><head><title>Example Labs</title></head><body>Custody rails</body></html>")
+
+    async def run():
+        client = EnrichmentClient(transport=httpx.MockTransport(handler), max_per_host=2)
+        try:
+            first = await extract_company_summary(client, "https://example.com/old")
+            second = await extract_company_summary(client, "https://example.com/about")
+        finally:
+            await client.aclose()
+        return client, first, second
+
+    client, first, second = asyncio.run(run())
+    assert first == second
+    assert "Example Labs" in first and "Custody rails" in first
+    # The redirect target is checked before it is fetched, and each URL is checked only once per fetch.
+    assert validated == ["https://example.com/old", "https://example.com/about", "https://example.com/about"]
+    # Per-host slots only exist while a fetch holds or waits for one.
+    assert client._host_slots == {}
+
+
+def test_summary_parser_streams_and_stops_once_it_has_enough(monkeypatch):
+    monkeypatch.setattr(external_enrichment, "_validate_public_https_url", urlparse)
+    sent = []
+
+    async def page():
+        head = (
+            "<html><head><title>Stream &amp; Co</title>"
+            '<meta name="description" content="Settlement  infra">'
+            '<meta property="og:description" content="Rails for funds">'
+            "<style>body { color: red }</style><script>var secret = 1;</script></head><body>"
+        )
+        for part in [head] + ["<p>" + "custody " * 40 + "</p>"] * 200:
+            sent.append(part)
+            yield part.encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, content=page())
+
+    async def run():
+        client = EnrichmentClient(transport=httpx.MockTransport(handler))
+        try:
+            return await extract_company_summary(client, "https://stream.example/")
+        finally:
+            await client.aclose()
+
+    summary = asyncio.run(run())
+    title, meta, og, body = summary.split(" | ")
+    assert (title, meta, og) == ("Stream & Co", "Settlement infra", "Rails for funds")
+    assert body.startswith("custody custody") and len(body) <= 800
+    assert "secret" not in summary and "color" not in summary
+    assert len(sent) < 10
+
+
+def test_resolution_cache_validates_once_and_pins_connections(monkeypatch):
+    answers = {"public.example": "93.184.216.34", "rebind.example": "10.0.0.5"}
+    lookups: list[str] = []
+
+    def fake_getaddrinfo(host, port, proto=0):
+        lookups.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, proto, "", (answers[host], port))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    resolver = ResolutionCache(ttl_seconds=60, max_entries=2)
+    assert resolver.resolve("public.example", 443) == ("93.184.216.34",)
+    assert resolver.resolve("PUBLIC.example", 443) == ("93.184.216.34",)
+    assert lookups == ["public.example"]
+
+    for _ in range(2):
+        try:
+            resolver.resolve("rebind.example", 443)
+            raise AssertionError("private address accepted")
+        except ValueError as exc:
+            assert "non-public" in str(exc)
+    # Rejected answers are never cached, so each attempt re-resolves.
+    assert lookups.count("rebind.example") == 2
+
+    resolver.resolve("public.example", 8443)
+    answers["third.example"] = "1.1.1.1"
+    resolver.resolve("third.example", 443)
+    assert resolver.lookup("public.example", 443) is None
+    assert len(resolver._entries) == 2
+
+    connected = []
+    backend = _PinnedNetworkBackend(resolver)
+
+    async def fake_connect(host, port, **kwargs):
+        connected.append((host, port))
+        return object()
+
+    monkeypatch.setattr(backend._backend, "connect_tcp", fake_connect)
+    answers["third.example"] = "10.9.9.9"
+    asyncio.run(backend.connect_tcp("third.example", 443))
+    # The socket goes to the address validated earlier, not to a fresh (rebound) answer.
+    assert connected == [("1.1.1.1", 443)]
+
+
+def test_enrichment_cache_serves_fresh_entries_and_revalidates_stale_ones(monkeypatch):
+    seed()
+    monkeypatch.setattr(external_enrichment, "_validate_public_https_url", urlparse)
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.headers.get("if-none-match", ""))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/html", "etag": '"v1"'},
+            text="<html><head><title>Cached Labs</title></head></html>",
+        )
+
+    async def run():
+        client = EnrichmentClient(transport=httpx.MockTransport(handler))
+
+        async def fetch(url, etag, last_modified):
+            return await fetch_company_summary(client, url, etag, last_modified)
+
+        try:
+            # A zero TTL stores entries that are already stale, so the second lookup revalidates.
+            stale = EnrichmentCache(ttl_seconds=0)
+            summaries = [await stale.summary("https://cached.example/", fetch) for _ in range(2)]
+            fresh = EnrichmentCache(ttl_seconds=3600)
+            summaries += [await fresh.summary("https://cached.example/", fetch) for _ in range(2)]
+        finally:
+            await client.aclose()
+        return fresh.stats, stale.stats, summaries
+
+    fresh_stats, stale_stats, summaries = asyncio.run(run())
+    assert all("Cached Labs" in summary for summary in summaries)
+    assert stale_stats == {"hits": 0, "revalidated": 1, "misses": 1}
+    assert fresh_stats == {"hits": 1, "revalidated": 1, "misses": 0}
+    assert requests == ["", '"v1"', '"v1"']
+
+
+def test_enrichment_cache_stores_only_the_validators_of_the_latest_body_and_prunes_old_rows(monkeypatch):
+    seed()
+    monkeypatch.setattr(external_enrichment, "_validate_public_https_url", urlparse)
+    versions = iter([{"etag": '"v1"'}, {}])
+    sent: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.headers.get("if-none-match", ""))
+        headers = {"content-type": "text/html", **next(versions)}
+        return httpx.Response(200, headers=headers, text="<html><head><title>Changed Labs</title></head></html>")
+
+    db = SessionLocal()
+    try:
+        db.add(EnrichmentCacheEntry(url="https://old.example/", summary="old", expires_at=1.0))
+        db.commit()
+    finally:
+        db.close()
+
+    async def run():
+        client = EnrichmentClient(transport=httpx.MockTransport(handler))
+
+        async def fetch(url, etag, last_modified):
+            return await fetch_company_summary(client, url, etag, last_modified)
+
+        try:
+            cache = EnrichmentCache(ttl_seconds=0)
+            for _ in range(2):
+                await cache.summary("https://changed.example/", fetch)
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    assert sent == ["", '"v1"']
+    db = SessionLocal()
+    try:
+        # The second 200 sent no ETag, so "v1" must not be kept to validate its body.
+        assert db.get(EnrichmentCacheEntry, "https://changed.example/").etag == ""
+        assert db.get(EnrichmentCacheEntry, "https://old.example/") is None
+    finally:
+        db.close()
+
+
+def test_batch_enrichment_retries_transient_errors_and_writes_signals(monkeypatch):
+    seed()
+    attempts: dict[str, int] = {}
+
+    async def fake_company_summary(url, cache=None):
+        attempts[url] = attempts.get(url, 0) + 1
+        await asyncio.sleep(0)
+        if url.endswith("/flaky") and attempts[url] == 1:
+            raise httpx.ConnectError("connection reset")
+        if url.endswith("/private"):
+            raise ValueError("Target resolves to non-public network")
+        return f"Summary for {url}"
+
+    monkeypatch.setattr("app.main.extract_company_summary", fake_company_summary)
+    monkeypatch.setattr(enrichment_jobs, "ENRICH_RETRY_BASE_SECONDS", 0)
+    monkeypatch.setattr(enrichment_jobs, "ENRICH_WRITE_BATCH_SIZE", 2)
+
+    items = [{"attendee_id": i, "url": f"https://company-{i}.example/about"} for i in range(1, 5)]
+    items += [
+        {"attendee_id": 5, "url": "https://flaky.example/flaky"},
+        {"attendee_id": 6, "url": "https://internal.example/private"},
+        {"attendee_id": 1, "url": "https://company-1.example/about"},
+    ]
+    with TestClient(app) as client:
+        client.get("/login")
+        client.post(
+            "/login",
+            data={
+                "role": "organizer",
+                "csrf_token": client.cookies.get("csrf_token"),
+                "email": "organizer@pot.local",
+                "password": "organizer123",
+            },
+        )
+        headers = {"x-csrf-token": client.cookies.get("csrf_token")}
+        rejected = client.post(
+            "/v1/enrich/batch",
+            json={"items": [{"attendee_id": 1, "url": "https://www.linkedin.com/in/someone"}]},
+            headers=headers,
+        )
+        assert rejected.status_code == 400
+
+        started = client.post("/v1/enrich/batch", json={"items": items}, headers=headers)
+        assert started.status_code == 200
+        assert started.json()["total"] == 6
+        deadline = time.time() + 10
+        while True:
+            job = client.get(started.json()["status_url"]).json()
+            if job["status"] not in {"queued", "running"} or time.time() > deadline:
+                break
+            time.sleep(0.02)
+
+    assert job["status"] == "completed"
+    assert (job["succeeded"], job["failed"], job["retries"]) == (5, 1, 1)
+    assert job["progress"] == 1.0
+    assert "non-public network" in job["errors"][0]
+    db = SessionLocal()
+    try:
+        assert db.query(ExternalSignal).filter(ExternalSignal.source == "company_website").count() == 5
+    finally:
+        db.close()
+
+
+def test_concurrent_batch_jobs_share_one_fetch_limit_and_a_bounded_worker_pool(monkeypatch):
+    seed()
+    monkeypatch.setattr(enrichment_jobs, "ENRICH_BATCH_CONCURRENCY", 3)
+    monkeypatch.setattr(enrichment_jobs, "ENRICH_WRITE_BATCH_SIZE", 10)
+    in_flight = [0, 0]
+
+    async def fetch(url):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await asyncio.sleep(0.001)
+        in_flight[0] -= 1
+        return f"Summary for {url}"
+
+    async def run():
+        db = SessionLocal()
+        try:
+            jobs = [enrichment_jobs.create_enrichment_job(db, 20, "test") for _ in range(2)]
+        finally:
+            db.close()
+        items = [(attendee_id, f"https://co-{attendee_id}-{n}.example/") for n in range(4) for attendee_id in range(1, 6)]
+        baseline = len(asyncio.all_tasks())
+        runs = [asyncio.create_task(enrichment_jobs.run_enrichment_job(job.id, items, fetch)) for job in jobs]
+        await asyncio.sleep(0.005)
+        # Two job tasks plus at most ENRICH_BATCH_CONCURRENCY workers each, not one task per item.
+        assert len(asyncio.all_tasks()) - baseline <= 2 + 2 * 3
+        await asyncio.gather(*runs)
+        return [job.id for job in jobs]
+
+    job_ids = asyncio.run(run())
+    assert in_flight[1] == 3
+    db = SessionLocal()
+    try:
+        for job_id in job_ids:
+            job = db.get(EnrichmentJob, job_id)
+            assert (job.status, job.succeeded, job.failed) == ("completed", 20, 0)
+    finally:
+        db.close()
+
+
+def test_batch_job_finishes_when_a_worker_raises_outside_its_retry_loop(monkeypatch):
+    seed()
+
+    async def fetch(url):
+        if "broken" in url:
+            raise ValueError("bad page")
+        return f"Summary for {url}"
+
+    def broken_classifier(exc):
+        raise RuntimeError("retry classifier failed")
+
+    monkeypatch.setattr(enrichment_jobs, "_is_retryable", broken_classifier)
+
+    async def run():
+        db = SessionLocal()
+        try:
+            job = enrichment_jobs.create_enrichment_job(db, 3, "test")
+        finally:
+            db.close()
+        items = [(1, "https://ok-1.example/"), (2, "https://broken.example/"), (3, "https://ok-3.example/")]
+        await asyncio.wait_for(enrichment_jobs.run_enrichment_job(job.id, items, fetch), 5)
+        return job.id
+
+    job_id = asyncio.run(run())
+    db = SessionLocal()
+    try:
+        job = enrichment_jobs.enrichment_job_to_dict(db.get(EnrichmentJob, job_id))
+    finally:
+        db.close()
+    assert (job["status"], job["succeeded"], job["failed"]) == ("completed", 2, 1)
+    assert "retry classifier failed" in job["errors"][0]
+
+
+def test_startup_recovery_fails_enrichment_jobs_whose_worker_is_gone():
+    seed()
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    db = SessionLocal()
+    try:
+        dead = EnrichmentJob(status="running", total=4, worker_pid=exited.pid)
+        live = EnrichmentJob(status="running", total=4, worker_pid=os.getppid())
+        done = EnrichmentJob(status="completed", total=4, worker_pid=exited.pid)
+        db.add_all([dead, live, done])
+        db.commit()
+
+        assert enrichment_jobs.recover_enrichment_jobs(db) == 1
+        assert (dead.status, live.status, done.status) == ("failed", "running", "completed")
+        assert "restart" in dead.error and dead.finished_at > 0
+    finally:
+        db.close()
+
+
+def test_reenrichment_replaces_previous_signal_tags_instead_of_growing_focus_text():
+    seed()
+    db = SessionLocal()
+    try:
+        attendee = db.get(Attendee, 1)
+        focus_before = attendee.focus_text
+        assert summary_tags("Custody custody and the CUSTODY rails | Rails for tokenization") == [
+            "custody",
+            "rails",
+            "tokenization",
+        ]
+        assert len(summary_tags(" ".join(f"word{i}" for i in range(100)))) == MAX_SIGNAL_TAGS
+
+        record_signal(db, attendee, "company_website", "https://a.example/", "Custody rails for custody banks")
+        record_signal(db, attendee, "linkedin_profile", "https://www.linkedin.com/in/a", "Stablecoin policy")
+        db.commit()
+        assert {"custody", "stablecoin"} <= build_profile(attendee).focus_tags
+
+        record_signal(db, attendee, "company_website", "https://a.example/", "Zero knowledge proving")
+        db.commit()
+        rows = db.query(ExternalSignal).filter(ExternalSignal.attendee_id == 1).all()
+        assert sorted(row.source for row in rows) == ["company_website", "linkedin_profile"]
+        assert attendee.signal_tags.split() == ["zero", "knowledge", "proving", "stablecoin", "policy"]
+        assert "custody" not in attendee.signal_tags
+        assert attendee.focus_text == focus_before
+
+        # Two URLs for one attendee and source in a single batch keep only the last one.
+        record_signals(
+            db,
+            {1: attendee},
+            [
+                (1, "company_website", "https://b.example/", "Payments orchestration"),
+                (1, "company_website", "https://c.example/", "Carbon accounting"),
+            ],
+        )
+        db.commit()
+        rows = db.query(ExternalSignal).filter(ExternalSignal.attendee_id == 1, ExternalSignal.source == "company_website")
+        assert [row.source_url for row in rows] == ["https://c.example/"]
+        assert attendee.signal_tags.split() == ["carbon", "accounting", "stablecoin", "policy"]
+    finally:
+        db.close()
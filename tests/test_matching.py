@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.database import Base
@@ -92,3 +92,67 @@ def test_feedback_affects_future_score():
     else:
         # With strict quality thresholding, weakly-rated matches can drop out entirely.
         assert True
+
+
+def test_match_build_records_phase_spans_and_candidate_counts(monkeypatch):
+    from app.services import metrics
+    from app.services.metrics import request_timing
+
+    db = _db()
+    requester = Attendee(name="Investor", role="Managing Partner", company="Fund", primary_goal="Investment")
+    db.add(requester)
+    db.add_all(
+        [Attendee(name=f"Founder {i}", role="CEO & Founder", company="Startup", primary_goal="Investment") for i in range(4)]
+    )
+    db.add(Attendee(name="Other", role="CTO", company="Co", primary_goal="Investment", language="French"))
+    db.commit()
+
+    with request_timing() as timing:
+        build_matches_for_attendee(db, requester.id, top_n=5)
+    for phase in ("profiles", "feedback", "score", "reasons", "store"):
+        assert f"matching.{phase}" in timing.phases
+    assert timing.counts["matching.candidates_scanned"] == 6
+    assert timing.counts["matching.candidates_pruned"] == 2
+    assert timing.counts["matching.candidates_passed"] == 4
+    assert "matching.score;dur=" in timing.server_timing()
+
+    monkeypatch.setattr(metrics, "TRACE_SPANS", False)
+    with request_timing() as disabled:
+        build_matches_for_attendee(db, requester.id, top_n=5)
+    assert not disabled.counts and not any(phase.startswith("matching.") for phase in disabled.phases)
+
+
+def test_rebuild_keeps_feedback_linked_under_foreign_keys():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", lambda conn, _record: conn.execute("PRAGMA foreign_keys=ON"))
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    requester = Attendee(
+        name="Investor", role="Managing Partner", company="Fund", primary_goal="Investment", language="English"
+    )
+    founders = [
+        Attendee(
+            name=f"Founder {i}",
+            role="CEO & Founder",
+            company=f"Startup {i}",
+            primary_goal="Investment",
+            language="English",
+            focus_text="investment institutional tokenization",
+        )
+        for i in range(4)
+    ]
+    db.add_all([requester, *founders])
+    db.commit()
+
+    first = build_matches_for_attendee(db, requester.id, top_n=3)
+    liked_id = first[0].candidate_id
+    for match, rating in ((first[0], 5), (first[1], 1)):
+        db.add(Feedback(match_id=match.id, attendee_id=requester.id, candidate_id=match.candidate_id, rating=rating))
+    db.commit()
+
+    second = build_matches_for_attendee(db, requester.id, top_n=3)
+    current = {m.candidate_id: m.id for m in second}
+    for row in db.query(Feedback).all():
+        # Each rating points at the candidate's new match, or at nothing once they drop out.
+        assert row.match_id == current.get(row.candidate_id)
+    assert db.query(Feedback).filter(Feedback.candidate_id == liked_id).one().match_id is not None
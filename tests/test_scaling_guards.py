@@ -1,5 +1,29 @@
-from app.models import Attendee
+import io
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import AppUser, Attendee, ImportJob, MatchResult
+from app.main import ModelJSONResponse, app, validate_import_row
+from app.services import assets, attendee_import, import_jobs, rate_limit, security
+from app.services.metrics import MetricsRegistry
+from app.services.profiling import RequestProfiler
+from app.services.bootstrap import seed_demo_data_if_empty
+from app.services.directory import adjust_attendee_total, attendee_directory_page, attendee_total
+from app.services.rate_limit import sliding_window
 from app.services.scenarios import MAX_SCENARIO_RESULTS, strategic_scenarios
+from app.services.snapshot import build_snapshot, restore_snapshot
 
 
 def test_strategic_scenarios_is_bounded_for_large_inputs():
@@ -74,3 +98,474 @@ def test_strategic_scenarios_is_bounded_for_large_inputs():
 
     scenarios = strategic_scenarios(attendees)
     assert len(scenarios) <= MAX_SCENARIO_RESULTS
+
+
+def test_directory_keyset_pages_and_cached_total_track_writes():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    for idx in range(23):
+        db.add(Attendee(name=f"Name {idx % 7}", role="CTO", company="Co", primary_goal="Investment"))
+    db.commit()
+    assert attendee_total(db) == 23
+
+    expected = [row.id for row in db.query(Attendee).order_by(Attendee.name, Attendee.id)]
+    seen = []
+    after = None
+    while True:
+        rows, cursors = attendee_directory_page(db, after=after, limit=5)
+        seen.extend(row.id for row in rows)
+        if not cursors["next"]:
+            break
+        after = cursors["next"]
+    assert seen == expected
+
+    rows, cursors = attendee_directory_page(db, before=after, limit=5)
+    assert [row.id for row in rows] == expected[14:19]
+    rows, _ = attendee_directory_page(db, start=cursors["current"], limit=5)
+    assert [row.id for row in rows] == expected[14:19]
+
+    db.add(Attendee(name="Late", role="CTO", company="Co", primary_goal="Investment"))
+    adjust_attendee_total(db, 1)
+    db.commit()
+    assert attendee_total(db) == 24
+
+
+def test_json_import_rows_are_parsed_incrementally_across_chunk_boundaries(monkeypatch):
+    monkeypatch.setattr(import_jobs, "JSON_READ_CHUNK_CHARS", 7)
+    rows = [{"name": f"User {idx}", "seed_confidence": 0.123456789, "tags": ["a", "b"]} for idx in range(40)]
+    payload = json.dumps({"meta": {"count": 12345}, "attendees": rows})
+
+    parsed = list(import_jobs.iter_json_rows(io.StringIO(payload)))
+    assert parsed == rows
+    assert list(import_jobs.iter_json_rows(io.StringIO(json.dumps([1234567890])))) == [1234567890]
+
+
+def test_import_login_conflict_fails_only_the_conflicting_rows(monkeypatch):
+    monkeypatch.setattr(attendee_import, "IMPORT_INSERT_BATCH_SIZE", 3)
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    db.add(Attendee(name="Existing", role="CTO", company="Co", primary_goal="Investment"))
+    db.commit()
+    # A stray login already owns the address the next attendee's fallback would get.
+    db.add(AppUser(email="attendee-2@pot.local", role="organizer", password_hash="x"))
+    db.commit()
+    hash_batches = []
+
+    def hash_outside_transactions(entries):
+        # Hashing inside a chunk's transaction would hold the SQLite write lock across it.
+        assert not db.in_transaction()
+        hash_batches.append(len(entries))
+        return [f"hash-{password}" for password, _is_default in entries]
+
+    monkeypatch.setattr(attendee_import, "provision_password_hashes", hash_outside_transactions)
+
+    base = {"role": "CTO", "company": "Co", "primary_goal": "Investment"}
+    rows = [{**base, "name": f"Row {idx}"} for idx in range(5)]
+    rows.append({**base, "name": "Reserved", "login_email": "attendee-99@pot.local", "temp_password": "TempPass123!"})
+    report = attendee_import.run_attendee_import(db, enumerate(rows, start=2), validate_import_row, "boot")
+
+    assert report.created == 5
+    assert report.sample_errors == ["row 7: login_email attendee-99@pot.local is reserved for generated logins"]
+    # The taken id is skipped rather than failing the rows that would have reused it.
+    assert db.get(Attendee, 2) is None
+    users = {user.attendee_id: user.email for user in db.query(AppUser).filter(AppUser.attendee_id.isnot(None))}
+    assert users == {attendee_id: f"attendee-{attendee_id}@pot.local" for attendee_id in range(3, 8)}
+    assert attendee_total(db) == 6
+    assert db.query(AppUser).filter(AppUser.attendee_id == 3).one().password_hash == "hash-boot-3"
+    assert sum(hash_batches) > 0
+
+    # A chosen login taken after validation (a concurrent create) fails only that row.
+    taken = {**base, "name": "Taken", "login_email": "taken@example.com", "temp_password": "TempPass123!"}
+    valid = [(2, validate_import_row({**base, "name": "Fine"})), (3, validate_import_row(taken))]
+    db.add(AppUser(email="taken@example.com", role="attendee", password_hash="x"))
+    db.commit()
+    report = attendee_import.ImportReport()
+    attendee_import.insert_import_rows(db, valid, "boot", report)
+    assert (report.created, report.sample_errors) == (
+        1,
+        ["row 3: login_email taken@example.com is already in use, row not imported"],
+    )
+    assert db.query(Attendee).filter(Attendee.name == "Taken").count() == 0
+
+
+def test_startup_fails_orphaned_import_jobs_and_removes_unowned_spools(tmp_path, monkeypatch):
+    monkeypatch.setattr(import_jobs, "IMPORT_SPOOL_DIR", tmp_path)
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+
+    old = time.time() - 2 * import_jobs.ORPHAN_SPOOL_SECONDS
+    spools = {name: tmp_path / f"import-{name}.csv" for name in ("dead", "live", "stray", "uploading")}
+    for name, path in spools.items():
+        path.write_text("name\n")
+        if name != "uploading":
+            os.utime(path, (old, old))
+    dead = ImportJob(status="running", worker_pid=exited.pid, spool_path=str(spools["dead"]))
+    live = ImportJob(status="queued", worker_pid=os.getppid(), spool_path=str(spools["live"]))
+    done = ImportJob(status="completed", worker_pid=exited.pid)
+    db.add_all([dead, live, done])
+    db.commit()
+
+    assert import_jobs.recover_import_jobs(db) == {"failed_jobs": 1, "removed_spools": 2}
+    assert (dead.status, live.status, done.status) == ("failed", "queued", "completed")
+    assert "restart" in dead.error
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["import-live.csv", "import-uploading.csv"]
+
+
+def test_bootstrap_backfills_only_missing_logins(monkeypatch):
+    monkeypatch.setattr(security, "PASSWORD_ITERATIONS", 1000)
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    timings: dict[str, float] = {}
+    assert seed_demo_data_if_empty(db, "org@pot.local", "organizer-pass", "boot", timings=timings) is True
+    attendee_count = db.query(Attendee).count()
+    assert db.query(AppUser).count() == attendee_count + 1
+    assert {"insert_attendees", "find_missing_users", "hash_passwords", "insert_users"} <= set(timings)
+
+    db.query(AppUser).filter(AppUser.attendee_id.in_([1, 2])).delete(synchronize_session=False)
+    db.commit()
+    assert seed_demo_data_if_empty(db, "org@pot.local", "organizer-pass", "boot") is False
+    restored = db.query(AppUser).filter(AppUser.attendee_id == 2).one()
+    assert security.verify_password("boot-2", restored.password_hash)
+    assert db.query(AppUser).count() == attendee_count + 1
+
+
+def test_app_import_is_side_effect_free_and_startup_reports_phases(tmp_path):
+    script = (
+        "import sys, app.main as m\n"
+        "assert 'app.services.external_enrichment' not in sys.modules\n"
+        "assert m._startup_report is None\n"
+        "report = m.run_startup()\n"
+        "assert m.run_startup() is report\n"
+        "print(sorted(report['phases_ms']), report['import_ms'] > 0)\n"
+    )
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'startup.db'}", "SEED_ON_STARTUP": "false"}
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=Path(__file__).resolve().parents[1], env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    phases = (
+        "['create_tables', 'event_counter', 'recover_enrichment_jobs', 'recover_import_jobs', "
+        "'schema_compat', 'security_check']"
+    )
+    assert result.stdout.strip() == f"{phases} True"
+
+
+def test_seed_snapshot_restores_only_when_current(tmp_path, monkeypatch):
+    monkeypatch.setattr(security, "PASSWORD_ITERATIONS", 1000)
+    snapshot_path = tmp_path / "seed" / "snapshot.db"
+    manifest = build_snapshot(snapshot_path, "organizer@pot.local", "organizer123", "attendee123")
+    assert manifest["timings_ms"]["build_matches"] >= 0
+
+    stale_url = f"sqlite:///{tmp_path / 'stale.db'}"
+    assert restore_snapshot(stale_url, snapshot_path, "organizer@pot.local", "changed", "attendee123") == (
+        "skipped: stale credentials"
+    )
+
+    database_url = f"sqlite:///{tmp_path / 'app.db'}"
+    assert restore_snapshot(database_url, snapshot_path, "organizer@pot.local", "organizer123", "attendee123") == "restored"
+    assert restore_snapshot(database_url, snapshot_path, "organizer@pot.local", "organizer123", "attendee123") == (
+        "skipped: database exists"
+    )
+    db = sessionmaker(bind=create_engine(database_url))()
+    try:
+        assert db.query(Attendee).count() > 0
+        assert db.query(MatchResult).count() > 0
+        assert db.query(AppUser).count() == db.query(Attendee).count() + 1
+    finally:
+        db.close()
+
+
+def test_password_pool_rejects_when_queue_is_full_and_reports_metrics():
+    pool = security.PasswordWorkPool(workers=1, max_queue=1)
+    release = threading.Event()
+    first = pool.submit(release.wait, 5)
+    second = pool.submit(lambda: "queued")
+    try:
+        pool.submit(lambda: "rejected")
+        raise AssertionError("expected PasswordPoolBusy")
+    except security.PasswordPoolBusy:
+        pass
+    assert pool.stats()["queue_depth"] == 1
+    release.set()
+    assert first.result(timeout=5) is True
+    assert second.result(timeout=5) == "queued"
+
+    stats = pool.stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["queue_depth"] == 0 and stats["in_flight"] == 0
+    assert stats["wait_ms_max"] > 0
+    assert pool.submit(lambda: "admitted again").result(timeout=5) == "admitted again"
+
+
+def test_verified_token_cache_skips_reverification_and_honours_expiry(monkeypatch):
+    calls = []
+    real_verify = security._verified_payload
+    monkeypatch.setattr(security, "_verified_payload", lambda token: calls.append(token) or real_verify(token))
+    cache = security.VerifiedTokenCache(max_entries=2)
+    tokens = [
+        security.sign_payload(security.build_session_payload({"role": "attendee", "attendee_id": i, "label": "A"}))
+        for i in range(3)
+    ]
+
+    assert cache.decode(tokens[0])["attendee_id"] == 0
+    assert cache.decode(tokens[0])["attendee_id"] == 0
+    assert len(calls) == 1
+
+    cache.decode(tokens[1])
+    cache.decode(tokens[2])
+    assert len(cache) == 2
+    cache.decode(tokens[0])
+    assert len(calls) == 4
+
+    expired = security.sign_payload({**security.decode_payload(tokens[1]), "exp": int(time.time()) - 1})
+    assert cache.decode(expired) is None
+    # A cached entry past its exp is dropped and the token goes through full verification again.
+    cache._entries[tokens[2]]["exp"] = int(time.time()) - 1
+    before = len(calls)
+    assert cache.decode(tokens[2])["attendee_id"] == 2
+    assert len(calls) == before + 1
+
+
+def test_sliding_window_limiters_bound_memory_and_share_state_across_workers(tmp_path, monkeypatch):
+    assert sliding_window((0.0, 0, 0), 130.0, 10, 60)[1] == (120.0, 1, 0)
+    # Halfway into the window, half of the previous window's 10 hits still count.
+    assert sliding_window((60.0, 10, 0), 150.0, 10, 60) == (True, (120.0, 1, 10))
+    assert sliding_window((120.0, 5, 10), 150.0, 10, 60)[0] is False
+
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: clock[0])
+    limiter = rate_limit.InMemoryRateLimiter(stripes=4)
+    assert [limiter.allow("login:1.2.3.4", 3, 60) for _ in range(4)] == [True, True, True, False]
+    for i in range(50):
+        limiter.allow(f"login:10.0.0.{i}", 3, 60)
+    assert len(limiter) == 51
+    clock[0] += 121
+    limiter.evict_idle()
+    assert len(limiter) == 0
+
+    # Two limiter instances on one file behave like two uvicorn workers on one host.
+    worker_a = rate_limit.SQLiteRateLimiter(tmp_path / "limits.db")
+    worker_b = rate_limit.SQLiteRateLimiter(tmp_path / "limits.db")
+    results = [worker.allow("login:5.6.7.8", 4, 60) for worker in (worker_a, worker_b) * 3]
+    assert results == [True, True, True, True, False, False]
+
+    # A worker stuck holding the write lock delays a check by the busy timeout, then the
+    # check falls back to an in-process window that still enforces the limit.
+    blocker = sqlite3.connect(tmp_path / "limits.db", isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.perf_counter()
+        assert [worker_a.allow("login:9.9.9.9", 3, 60) for _ in range(5)] == [True, True, True, False, False]
+        assert time.perf_counter() - started < 2.0
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+    assert worker_a.allow("login:5.6.7.8", 4, 60) is False
+
+
+def test_hashed_static_assets_are_precompressed_and_immutable(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    shutil.copytree(assets.STATIC_DIR, static_dir, ignore=shutil.ignore_patterns("dist"))
+    manifest = assets.build_assets(static_dir)
+    hashed_css = manifest["styles.css"]["path"]
+    assert hashed_css.startswith("dist/styles.")
+    assert (static_dir / (hashed_css + ".gz")).exists() and (static_dir / (hashed_css + ".br")).exists()
+
+    monkeypatch.setattr(assets, "STATIC_DIR", static_dir)
+    assets._asset_paths.cache_clear()
+    try:
+        assert assets.asset_url("styles.css") == f"/static/{hashed_css}"
+        (static_dir / "ui.js").write_text("// edited after the build\n")
+        assets._asset_paths.cache_clear()
+        # A source edited after the build falls back to its plain URL instead of a stale hash.
+        assert assets.asset_url("ui.js") == "/static/ui.js"
+    finally:
+        assets._asset_paths.cache_clear()
+
+    from starlette.applications import Starlette
+    from starlette.routing import Mount
+
+    static_client = TestClient(Starlette(routes=[Mount("/static", assets.AssetStaticFiles(directory=static_dir))]))
+    compressed = static_client.get(f"/static/{hashed_css}", headers={"accept-encoding": "gzip"})
+    assert compressed.status_code == 200
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["content-type"].startswith("text/css")
+    assert compressed.headers["cache-control"] == assets.IMMUTABLE_CACHE_CONTROL
+    assert compressed.text == (static_dir / "styles.css").read_text()
+    identity = static_client.get(f"/static/{hashed_css}", headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+    assert assets.accepted_encodings("gzip;q=0.5, BR ; q=1, deflate;q=bad") == {"gzip": 0.5, "br": 1.0, "deflate": 0.0}
+    # q=0 refuses a coding, so a substring match is not enough to pick its variant.
+    picks = {
+        "br;q=0, gzip": "gzip",
+        "gzip;q=0": None,
+        "gzip;q=1, br;q=0.2": "gzip",
+        "gzip, br": "br",
+        "*": "br",
+        "*;q=0, gzip": "gzip",
+    }
+    for header, expected in picks.items():
+        response = static_client.get(f"/static/{hashed_css}", headers={"accept-encoding": header})
+        assert response.headers.get("content-encoding") == expected, header
+
+    client = TestClient(app)
+    assert client.get("/static/styles.css").headers["cache-control"] == "no-cache"
+    assert client.get("/login").headers["cache-control"] == "no-store"
+
+
+def test_model_json_response_matches_the_jsonable_encoder_body():
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from app.schemas import ScenariosView, ScenarioView
+
+    rows = [
+        {"type": "pair_synergy", "title": "Fit", "participants": ["Zoë", "Ana"], "explanation": 'Says "hi" \u2014 ok'},
+    ]
+    fast = ModelJSONResponse(ScenariosView.model_construct(scenarios=[ScenarioView.model_construct(**r) for r in rows]))
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.body == JSONResponse(jsonable_encoder({"scenarios": rows})).body
+
+
+def test_metrics_middleware_reports_server_timing_and_merges_workers(tmp_path, monkeypatch):
+    from app.services import metrics as metrics_module
+    from scripts.seed_data import seed
+
+    seed()
+    registry = MetricsRegistry(tmp_path / "metrics", flush_seconds=0)
+    monkeypatch.setattr(metrics_module, "metrics", registry)
+    monkeypatch.setattr("app.main.metrics", registry)
+    client = TestClient(app)
+    assert client.get("/metrics").status_code == 401
+
+    client.get("/login")
+    client.post(
+        "/login",
+        data={
+            "role": "organizer",
+            "csrf_token": client.cookies.get("csrf_token"),
+            "email": "organizer@pot.local",
+            "password": "organizer123",
+        },
+    )
+    fragment = client.get("/attendees/2/fragments/matches")
+    timing = fragment.headers["server-timing"]
+    for phase in ("db;dur=", "matching;dur=", "render;dur=", "total;dur="):
+        assert phase in timing
+
+    # Another worker on the host that has since exited: its counters stay, its gauges do not.
+    other = MetricsRegistry(tmp_path / "metrics")
+    fragment_route = "/attendees/{attendee_id}/fragments/{section}"
+    other.inc("pot_http_requests_total", {"method": "GET", "route": fragment_route, "status": 200}, 4)
+    other.gauge_add("pot_http_requests_in_flight", 7)
+    snapshot = other.snapshot()
+    snapshot["pid"] = 2**22 + 1
+    (tmp_path / "metrics" / f"worker-{snapshot['pid']}.json").write_text(json.dumps(snapshot))
+
+    body = client.get("/metrics").text
+    route = f'method="GET",route="{fragment_route}"'
+    assert f'pot_http_requests_total{{{route},status="200"}} 5' in body
+    assert f'pot_http_request_duration_seconds_bucket{{{route},le="+Inf"}} 1' in body
+    assert f"pot_db_queries_total{{{route}}}" in body
+    assert f'pot_request_phase_seconds_total{{route="{fragment_route}",phase="matching"}}' in body
+    assert "pot_http_requests_in_flight 1" in body
+
+    attendee = TestClient(app)
+    attendee.get("/login")
+    attendee.post(
+        "/login",
+        data={
+            "role": "attendee",
+            "csrf_token": attendee.cookies.get("csrf_token"),
+            "attendee_id": 2,
+            "passcode": "attendee123-2",
+        },
+    )
+    assert attendee.get("/metrics").status_code == 403
+    monkeypatch.setattr("app.main.METRICS_SCRAPE_TOKEN", "scrape-secret")
+    assert TestClient(app).get("/metrics", headers={"authorization": "Bearer scrape-secret"}).status_code == 200
+
+
+def test_request_profiles_are_organizer_only_rate_limited_and_capped(tmp_path, monkeypatch):
+    from scripts.seed_data import seed
+
+    seed()
+    profiler = RequestProfiler(tmp_path / "profiles", slow_ms=0, interval_ms=1, max_files=2)
+    monkeypatch.setattr("app.main.profiler", profiler)
+    monkeypatch.setattr("app.main.PROFILE_REQUESTS_PER_MINUTE", 2)
+
+    # With slow mode off, requests that do not ask for a profile never open a session.
+    def fail_start(*args):
+        raise AssertionError("profiled a request that did not ask for it")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(profiler, "start", fail_start)
+        assert TestClient(app).get("/health").status_code == 200
+
+    attendee = TestClient(app)
+    attendee.get("/login")
+    attendee.post(
+        "/login",
+        data={
+            "role": "attendee",
+            "csrf_token": attendee.cookies.get("csrf_token"),
+            "attendee_id": 2,
+            "passcode": "attendee123-2",
+        },
+    )
+    assert "x-profile-id" not in attendee.get("/attendees/2/fragments/matches?_profile=1").headers
+    assert attendee.get("/organizer/profiles").status_code == 403
+
+    organizer = TestClient(app)
+    organizer.get("/login")
+    organizer.post(
+        "/login",
+        data={
+            "role": "organizer",
+            "csrf_token": organizer.cookies.get("csrf_token"),
+            "email": "organizer@pot.local",
+            "password": "organizer123",
+        },
+    )
+    import app.main as main_module
+
+    build_matches = main_module.build_matches_for_attendee
+
+    def slow_build(*args, **kwargs):
+        # Long enough for the 1 ms sampler to land inside the endpoint.
+        time.sleep(0.05)
+        return build_matches(*args, **kwargs)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(main_module, "build_matches_for_attendee", slow_build)
+        profiled = organizer.get("/attendees/2/fragments/matches?_profile=1")
+    profile_id = profiled.headers["x-profile-id"]
+    assert "x-profile-id" in organizer.get("/v1/scenarios", headers={"x-profile": "1"}).headers
+    assert organizer.get("/v1/scenarios?_profile=1").status_code == 429
+
+    download = organizer.get(f"/organizer/profiles/{profile_id}")
+    assert download.status_code == 200
+    stacks = [line.rsplit(" ", 1) for line in download.text.splitlines()]
+    assert stacks and all(stack.startswith("attendee_fragment (app/main.py:") for stack, _count in stacks)
+    listed = organizer.get("/organizer/profiles").json()["profiles"]
+    summary = next(entry for entry in listed if entry["id"] == profile_id)
+    assert summary["samples"] == sum(int(count) for _stack, count in stacks) > 0
+    assert organizer.get("/organizer/profiles/not-a-profile").status_code == 404
+
+    # Slow mode keeps every request over the threshold, within the file cap.
+    profiler.slow_ms = 0.001
+    for _ in range(3):
+        organizer.get("/attendees/2/fragments/intros")
+    listed = organizer.get("/organizer/profiles").json()["profiles"]
+    assert len(listed) == 2
+    assert all(entry["trigger"] == "slow" for entry in listed)
+    assert len(list((tmp_path / "profiles").glob("*.folded"))) == 2
@@ -65,3 +65,36 @@ def test_strategic_scenarios_surface_pair_and_triad():
         set(["Marcus Weber", "Aisha Patel", "Sarah Chen"]).issubset(set(s["participants"]))
         for s in triad_hits
     )
+
+
+def test_scenario_phases_are_traced_inside_a_request_timing():
+    from app.services.metrics import request_timing
+
+    attendees = [
+        Attendee(
+            id=1,
+            name="Protocol CTO",
+            role="CTO",
+            company="Layer 2 Protocol",
+            primary_goal="Partnerships",
+            focus_text="zk compliance",
+            seek_text="bank partners",
+            offer_text="infrastructure",
+        ),
+        Attendee(
+            id=2,
+            name="Bank Lead",
+            role="Head of Digital Assets",
+            company="European Bank",
+            primary_goal="Partnerships",
+            focus_text="institutional custody",
+            seek_text="compliant rails",
+            offer_text="distribution",
+        ),
+    ]
+    with request_timing() as timing:
+        scenarios = strategic_scenarios(attendees)
+    assert {"scenarios.pairs", "scenarios.triads", "scenarios.dedupe"} <= set(timing.phases)
+    assert timing.counts["scenarios.pairs_checked"] == 1
+    assert timing.counts["scenarios.pairs_found"] == len(scenarios) == 1
+    assert timing.counts["scenarios.triads_found"] == 0